@@ -1,6 +1,8 @@
 # src/adaos/adapters/db/__init__.py
 from .sqlite_store import SQLite, SQLiteKV
+from .cached_kv import CachedKV
 from .sqlite_skill_registry import SqliteSkillRegistry
 from .sqlite_scenario_registry import SqliteScenarioRegistry
+from .sqlite_skill_index import SqliteSkillIndex
 
-__all__ = ["SQLite", "SQLiteKV", "SqliteSkillRegistry", "SqliteScenarioRegistry"]
+__all__ = ["SQLite", "SQLiteKV", "CachedKV", "SqliteSkillRegistry", "SqliteScenarioRegistry", "SqliteSkillIndex"]
@@ -0,0 +1,249 @@
+# src/adaos/adapters/db/cached_kv.py
+# LRU-кэш чтения поверх любого KV (write-through)
+from __future__ import annotations
+import copy, json, threading, time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional
+from adaos.ports import KV
+
+_ABSENT = object()  # ключа нет в хранилище (кэшируем и промахи)
+
+
+def _namespace(key: str) -> str:
+    """Namespace ключа — первый сегмент до ':' или '/' ('secrets:index:x' -> 'secrets', 'skills/a/b' -> 'skills')."""
+    for i, ch in enumerate(key):
+        if ch in ":/":
+            return key[:i]
+    return key
+
+
+def _as_stored(value: Any) -> Any:
+    # хранилище держит JSON: кэш должен отдавать то же, что вернёт чтение из базы
+    # (ключи dict -> str, tuple -> list), иначе результат зависит от того, «тёплый» ли кэш
+    return json.loads(json.dumps(value, ensure_ascii=False))
+
+
+def _copy(value: Any) -> Any:
+    # вызывающий код может мутировать полученный dict/list — кэш от этого не должен меняться
+    return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+
+class CachedKV(KV):
+    """
+    Ограниченный по размеру LRU-кэш перед KV. Запись идёт сразу во внутреннее хранилище
+    (write-through) и обновляет кэш; учитывается TTL ключей. Счётчики hit/miss ведутся
+    по namespace (см. ``_namespace``), namespace из ``bypass`` не кэшируются вовсе.
+
+    Чужие записи: ``change_token`` (по умолчанию ``inner.sql.foreign_writes`` у SQLiteKV) опрашивается
+    не чаще раза в ``probe_interval`` секунд; если его значение изменилось — базу писал другой
+    процесс (например, ``adaos secret set`` из CLI при запущенном API), и кэш сбрасывается целиком.
+    Записи этого процесса из любых потоков (write-behind, sweeper, инструменты в to_thread)
+    сбросом не считаются. Чужая запись видна не позже чем через ``probe_interval``.
+    Прочие атрибуты (sql, ns, sweep, close, ...) проксируются.
+    """
+
+    def __init__(
+        self,
+        inner: KV,
+        *,
+        max_entries: int = 4096,
+        bypass: Iterable[str] = (),
+        change_token: Optional[Callable[[], Any]] = None,
+        probe_interval: float = 0.25,
+    ):
+        self.inner = inner
+        self.max_entries = max(int(max_entries), 1)
+        self.bypass = frozenset(bypass)
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, tuple[Any, Optional[float]]]" = OrderedDict()
+        self._version = 0  # растёт на каждой записи: промах не кладёт в кэш устаревшее значение
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self.evictions = 0
+        self.external_resets = 0
+        if change_token is None:
+            probe = getattr(getattr(inner, "sql", None), "foreign_writes", None)
+            change_token = probe if callable(probe) else None
+        self._change_token = change_token
+        self.probe_interval = max(float(probe_interval), 0.0)
+        self._token: Any = _ABSENT
+        self._next_probe = 0.0  # time.monotonic() следующей пробы
+        get_entries = getattr(inner, "get_entries", None)
+        self._get_entries = get_entries if callable(get_entries) else self._entries_without_ttl
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    # ---------- служебное ----------
+
+    def _entries_without_ttl(self, keys: Iterable[str]) -> Dict[str, tuple[Any, Optional[float]]]:
+        return {k: (v, None) for k, v in self.inner.get_many(keys).items()}
+
+    def _sync(self) -> None:
+        """Сбросить кэш, если с прошлой пробы базу писал другой процесс (проба — не чаще probe_interval)."""
+        probe = self._change_token
+        if probe is None:
+            return
+        now = time.monotonic()
+        if now < self._next_probe:
+            return
+        self._next_probe = now + self.probe_interval
+        token = probe()
+        if token != self._token:
+            first, self._token = self._token is _ABSENT, token
+            self.invalidate()
+            if not first:
+                self.external_resets += 1
+
+    def _count(self, ns: str, field: str, n: int = 1) -> None:
+        bucket = self._stats.get(ns)
+        if bucket is None:
+            bucket = self._stats[ns] = {"hits": 0, "misses": 0}
+        bucket[field] += n
+
+    def _lookup(self, key: str, now: float) -> Optional[tuple[Any, Optional[float]]]:
+        """Запись кэша (значение может быть _ABSENT) или None при промахе. Под self._lock."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at = entry[1]
+        if expires_at is not None and expires_at <= now:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, value: Any, expires_at: Optional[float]) -> None:
+        """Положить в кэш с вытеснением LRU. Под self._lock."""
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def _fill(self, version: int, entries: Mapping[str, tuple[Any, Optional[float]]], asked: Iterable[str]) -> None:
+        with self._lock:
+            if version != self._version:
+                return  # пока читали, кто-то писал — не рискуем закэшировать старое
+            for key in asked:
+                value, expires_at = entries.get(key, (_ABSENT, None))
+                self._store(key, _copy(value), expires_at)
+
+    def _written(self, keys: Iterable[str], value_of: Optional[Mapping[str, Any]], expires_at: Optional[float]) -> None:
+        with self._lock:
+            self._version += 1
+            for key in keys:
+                if _namespace(key) in self.bypass:
+                    continue
+                if value_of is None:
+                    self._data.pop(key, None)
+                else:
+                    self._store(key, _as_stored(value_of[key]), expires_at)
+
+    # ---------- KV ----------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        ns = _namespace(key)
+        if ns in self.bypass:
+            return self.inner.get(key, default)
+        self._sync()
+        with self._lock:
+            entry = self._lookup(key, time.time())
+            self._count(ns, "misses" if entry is None else "hits")
+            version = self._version
+        if entry is not None:
+            value = entry[0]
+            return default if value is _ABSENT else _copy(value)
+        entries = self._get_entries([key])
+        self._fill(version, entries, [key])
+        return entries[key][0] if key in entries else default
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        missing: List[str] = []
+        passthrough: List[str] = []
+        self._sync()
+        with self._lock:
+            now = time.time()
+            for key in dict.fromkeys(keys):
+                ns = _namespace(key)
+                if ns in self.bypass:
+                    passthrough.append(key)
+                    continue
+                entry = self._lookup(key, now)
+                self._count(ns, "misses" if entry is None else "hits")
+                if entry is None:
+                    missing.append(key)
+                elif entry[0] is not _ABSENT:
+                    out[key] = _copy(entry[0])
+            version = self._version
+        if missing:
+            entries = self._get_entries(missing)
+            self._fill(version, entries, missing)
+            out.update((k, v) for k, (v, _) in entries.items())
+        if passthrough:
+            out.update(self.inner.get_many(passthrough))
+        return out
+
+    def set(self, key: str, value: Any, *, ttl: Optional[float] = None) -> None:
+        self._sync()
+        if ttl is None:
+            self.inner.set(key, value)
+        else:
+            self.inner.set(key, value, ttl=ttl)
+        self._written([key], {key: value}, None if ttl is None else time.time() + ttl)
+
+    def set_many(self, items: Mapping[str, Any], *, ttl: Optional[float] = None) -> None:
+        self._sync()
+        if ttl is None:
+            self.inner.set_many(items)
+        else:
+            self.inner.set_many(items, ttl=ttl)
+        self._written(items.keys(), items, None if ttl is None else time.time() + ttl)
+
+    def delete(self, key: str) -> None:
+        self.inner.delete(key)
+        self._written([key], None, None)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        self.inner.delete_many(keys)
+        self._written(keys, None, None)
+
+    def list(self, prefix: str = "", *, limit: Optional[int] = None, cursor: Optional[str] = None) -> list[str]:
+        if limit is None and cursor is None:
+            return self.inner.list(prefix)
+        return self.inner.list(prefix, limit=limit, cursor=cursor)
+
+    def iter_keys(self, prefix: str = "", *, batch: int = 500) -> Iterator[str]:
+        return self.inner.iter_keys(prefix, batch=batch)
+
+    def flush(self) -> int:
+        return self.inner.flush()
+
+    # ---------- управление кэшем ----------
+
+    def invalidate(self, prefix: str = "") -> int:
+        """Выбросить из кэша ключи с префиксом (по умолчанию — все). Возвращает число выброшенных."""
+        with self._lock:
+            self._version += 1
+            if not prefix:
+                n = len(self._data)
+                self._data.clear()
+                return n
+            doomed = [k for k in self._data if k.startswith(prefix)]
+            for k in doomed:
+                del self._data[k]
+            return len(doomed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Размер кэша, вытеснения и hit/miss по namespace."""
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "evictions": self.evictions,
+                "external_resets": self.external_resets,
+                "namespaces": {ns: dict(c) for ns, c in self._stats.items()},
+            }
@@ -0,0 +1,198 @@
+# src/adaos/adapters/db/sqlite_skill_index.py
+# индекс каталогов навыков (имя -> каталог, хэш манифеста, handler) поверх SQLite
+from __future__ import annotations
+import hashlib, json, os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from adaos.ports import SQL
+
+MANIFEST_NAMES = ("skill.yaml", "manifest.yaml", "adaos.skill.yaml")
+_HANDLER = os.path.join("handlers", "main.py")
+_SKIP_DIRS = {"__pycache__", "node_modules"}
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS skill_index (
+        root TEXT NOT NULL,
+        rel TEXT NOT NULL,
+        name TEXT NOT NULL,
+        manifest TEXT,
+        manifest_hash TEXT,
+        manifest_mtime_ns INTEGER,
+        handler TEXT,
+        PRIMARY KEY (root, rel)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS skill_index_name ON skill_index(root, name)",
+    # снимок каталогов дерева: при неизменном mtime каталог не перечитывается
+    """
+    CREATE TABLE IF NOT EXISTS skill_index_dirs (
+        root TEXT NOT NULL,
+        rel TEXT NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        listing TEXT NOT NULL,
+        PRIMARY KEY (root, rel)
+    )
+    """,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SkillIndexEntry:
+    name: str
+    path: Path
+    manifest: Optional[Path]
+    manifest_hash: Optional[str]
+    handler: Optional[Path]
+
+
+def _hash_file(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class SqliteSkillIndex:
+    """
+    Персистентный индекс навыков в каталоге ``skills_root``. Навык — каталог с манифестом
+    или с ``handlers/main.py``; внутрь навыков обход не спускается.
+
+    refresh() обновляет индекс инкрементально: каталог с прежним mtime не перечитывается
+    (берётся сохранённый список подкаталогов), манифест перехэшируется только при смене mtime.
+    find() — поиск по имени через индекс с проверкой, что найденные каталоги ещё существуют.
+    """
+
+    def __init__(self, sql: SQL, skills_root: Path | str):
+        self.sql = sql
+        self.root = Path(skills_root)
+        self._key = str(self.root.resolve())
+        with self.sql.connect() as con:
+            for stmt in _SCHEMA:
+                con.execute(stmt)
+
+    # ---------- обновление ----------
+
+    def refresh(self) -> Dict[str, int]:
+        """Привести индекс к состоянию диска. Возвращает счётчики: dirs/scanned/skills/hashed."""
+        with self.sql.connect() as con:
+            old_dirs: Dict[str, Tuple[int, str]] = {
+                rel: (mtime, listing) for rel, mtime, listing in con.execute("SELECT rel, mtime_ns, listing FROM skill_index_dirs WHERE root=?", (self._key,))
+            }
+            old_rows = con.execute(
+                "SELECT root, rel, name, manifest, manifest_hash, manifest_mtime_ns, handler FROM skill_index WHERE root=?", (self._key,)
+            ).fetchall()
+        old_skills = {row[1]: (row[4], row[5]) for row in old_rows}
+
+        dirs: Dict[str, Tuple[int, str]] = {}
+        skills: List[Tuple[Any, ...]] = []
+        scanned = hashed = 0
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            path = os.path.join(self._key, rel) if rel else self._key
+            mtime = _mtime_ns(path)
+            if mtime is None:
+                continue
+            prev = old_dirs.get(rel)
+            if prev is not None and prev[0] == mtime:
+                listing = prev[1]
+            else:
+                listing = self._scan(path)
+                scanned += 1
+            dirs[rel] = (mtime, listing)
+            info = json.loads(listing)
+
+            manifest = info["manifest"]
+            handler = os.path.join(path, _HANDLER) if "handlers" in info["dirs"] else None
+            if handler is not None and not os.path.isfile(handler):
+                handler = None
+            if rel and (manifest or handler):
+                manifest_path = os.path.join(path, manifest) if manifest else None
+                m_mtime = _mtime_ns(manifest_path) if manifest_path else None
+                m_hash, prev_mtime = old_skills.get(rel, (None, None))
+                if manifest_path and (m_hash is None or prev_mtime != m_mtime):
+                    m_hash = _hash_file(manifest_path)
+                    hashed += 1
+                skills.append((self._key, rel, os.path.basename(rel), manifest_path, m_hash if manifest_path else None, m_mtime, handler))
+                continue  # внутрь навыка не спускаемся
+            stack.extend(os.path.join(rel, d) if rel else d for d in info["dirs"])
+
+        stats = {"dirs": len(dirs), "scanned": scanned, "skills": len(skills), "hashed": hashed}
+        if dirs == old_dirs and set(skills) == set(old_rows):
+            return stats  # на диске ничего не поменялось — не переписываем индекс
+        with self.sql.connect() as con:
+            con.execute("DELETE FROM skill_index_dirs WHERE root=?", (self._key,))
+            con.executemany(
+                "INSERT INTO skill_index_dirs(root, rel, mtime_ns, listing) VALUES (?, ?, ?, ?)",
+                [(self._key, rel, mtime, listing) for rel, (mtime, listing) in dirs.items()],
+            )
+            con.execute("DELETE FROM skill_index WHERE root=?", (self._key,))
+            con.executemany(
+                "INSERT INTO skill_index(root, rel, name, manifest, manifest_hash, manifest_mtime_ns, handler) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                skills,
+            )
+        return stats
+
+    @staticmethod
+    def _scan(path: str) -> str:
+        subdirs: List[str] = []
+        manifest: Optional[str] = None
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    name = entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if not name.startswith(".") and name not in _SKIP_DIRS:
+                            subdirs.append(name)
+                    elif name in MANIFEST_NAMES and (manifest is None or MANIFEST_NAMES.index(name) < MANIFEST_NAMES.index(manifest)):
+                        manifest = name
+        except OSError:
+            pass
+        return json.dumps({"dirs": sorted(subdirs), "manifest": manifest})
+
+    # ---------- чтение ----------
+
+    def _rows(self, where: str = "", params: Tuple[Any, ...] = ()) -> List[SkillIndexEntry]:
+        with self.sql.connect() as con:
+            rows = con.execute(
+                f"SELECT name, rel, manifest, manifest_hash, handler FROM skill_index WHERE root=?{where} ORDER BY rel",
+                (self._key, *params),
+            ).fetchall()
+        return [
+            SkillIndexEntry(
+                name=name,
+                path=Path(self._key, rel),
+                manifest=Path(manifest) if manifest else None,
+                manifest_hash=manifest_hash,
+                handler=Path(handler) if handler else None,
+            )
+            for name, rel, manifest, manifest_hash, handler in rows
+        ]
+
+    def find(self, name: str) -> List[SkillIndexEntry]:
+        """Навыки с манифестом и именем каталога ``name``; при промахе/устаревании — refresh и повтор."""
+        found = self._rows(" AND name=? AND manifest IS NOT NULL", (name,))
+        if found and all(e.manifest is not None and e.manifest.is_file() for e in found):
+            return found
+        self.refresh()
+        return self._rows(" AND name=? AND manifest IS NOT NULL", (name,))
+
+    def entries(self, *, refresh: bool = True) -> List[SkillIndexEntry]:
+        """Все проиндексированные навыки (по умолчанию после инкрементального refresh)."""
+        if refresh:
+            self.refresh()
+        return self._rows()
+
+    def handlers(self, *, refresh: bool = True) -> List[Path]:
+        """Пути ``handlers/main.py`` всех навыков."""
+        return [e.handler for e in self.entries(refresh=refresh) if e.handler is not None]
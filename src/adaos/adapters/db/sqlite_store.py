@@ -1,34 +1,305 @@
 # src\adaos\adapters\db\sqlite_store.py
 # соединение SQLite (SQLite) + простое KV (SQLiteKV)
 from __future__ import annotations
-import sqlite3, json
+import atexit, logging, os, sqlite3, json, threading, time, weakref
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Optional, Final
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Final, Set
 from adaos.ports import KV, SQL
 from adaos.ports.paths import PathProvider
 
 _DB_FILE = "adaos.db"
 
+# прагмы соединения: WAL + synchronous=NORMAL — fsync только на checkpoint, без потери целостности
+DEFAULT_PRAGMAS: Mapping[str, Any] = {
+    "foreign_keys": "ON",
+    "synchronous": "NORMAL",
+    "cache_size": -16000,  # KiB (≈16 МБ страничного кэша)
+    "mmap_size": 64 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+}
+_STATEMENT_CACHE = 256  # подготовленные запросы, которые sqlite3 держит на соединение
+
+# ревизия данных kv: растёт на каждой транзакции записи (SQLite.write), общая для всех процессов
+_REV_TABLE = "CREATE TABLE IF NOT EXISTS kv_rev (id INTEGER PRIMARY KEY CHECK (id = 0), rev INTEGER NOT NULL)"
+_REV_BUMP = "UPDATE kv_rev SET rev = rev + 1 WHERE id = 0"
+_REV_GET = "SELECT rev FROM kv_rev WHERE id = 0"
+
 
 class SQLite(SQL):
-    def __init__(self, paths: PathProvider):
+    """
+    Пул соединений: одно долгоживущее соединение на поток (все корутины одного лупа делят
+    соединение своего потока — синхронные вызовы внутри корутины не прерываются).
+    connect() по-прежнему используется как ``with sql.connect() as con:`` — контекст
+    коммитит/откатывает транзакцию, но соединение не закрывает.
+
+    Записи в kv идут через ``write()``: транзакция поднимает ревизию ``kv_rev``, и свои ревизии
+    запоминаются. ``foreign_writes()`` по ним отличает записи других процессов (или других
+    экземпляров SQLite на тот же файл) от записей этого — из любого его потока.
+    """
+
+    def __init__(self, paths: PathProvider, *, pragmas: Optional[Mapping[str, Any]] = None):
         self._db_path: Final[Path] = Path(paths.state_dir()) / _DB_FILE
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._conns: Dict[int, sqlite3.Connection] = {}  # ident потока -> соединение
+        self._pid = os.getpid()
+        self._rev_lock = threading.Lock()
+        self._probe: Optional[sqlite3.Connection] = None  # отдельное соединение для foreign_writes()
+        self._own_revs: Optional[Set[int]] = None  # None — пока никто не спрашивал о чужих записях
+        self._rev_seen = 0
+        self._foreign = 0
         # ленивое создание файла
         with sqlite3.connect(self._db_path) as con:
             con.execute("PRAGMA journal_mode=WAL")
+            con.execute(_REV_TABLE)
+            con.execute("INSERT OR IGNORE INTO kv_rev(id, rev) VALUES (0, 0)")
 
     def connect(self) -> sqlite3.Connection:
-        con = sqlite3.connect(self._db_path)
-        con.execute("PRAGMA foreign_keys=ON")
+        con = getattr(self._local, "con", None)
+        if con is not None and self._pid == os.getpid():
+            return con
+        return self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            # после fork соединения родителя использовать нельзя
+            self._pid = os.getpid()
+            self._conns.clear()
+        con = sqlite3.connect(self._db_path, check_same_thread=False, cached_statements=_STATEMENT_CACHE)
+        for name, value in self._pragmas.items():
+            con.execute(f"PRAGMA {name}={value}")
+        self._local.con = con
+        with self._lock:
+            alive = {t.ident for t in threading.enumerate()}
+            for ident in [i for i in self._conns if i not in alive]:
+                self._close_quietly(self._conns.pop(ident))
+            self._conns[threading.get_ident()] = con
         return con
 
+    @staticmethod
+    def _close_quietly(con: sqlite3.Connection) -> None:
+        try:
+            con.close()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Закрыть все соединения пула (при завершении процесса/пересборке контекста)."""
+        with self._lock:
+            conns, self._conns = list(self._conns.values()), {}
+        with self._rev_lock:
+            if self._probe is not None:
+                conns.append(self._probe)
+                self._probe, self._own_revs = None, None
+        for con in conns:
+            self._close_quietly(con)
+        self._local = threading.local()
+
+    def pool_size(self) -> int:
+        return len(self._conns)
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """Транзакция записи в kv (как ``with connect() as con``) + своя ревизия ``kv_rev``."""
+        with self.connect() as con:
+            yield con
+            con.execute(_REV_BUMP)
+            rev = con.execute(_REV_GET).fetchone()[0]
+        # помечаем после коммита: проба, успевшая увидеть ревизию раньше, лишь лишний раз сбросит кэш
+        with self._rev_lock:
+            if self._own_revs is not None:
+                self._own_revs.add(rev)
+
+    def foreign_writes(self) -> int:
+        """
+        Монотонный счётчик транзакций kv, закоммиченных не этим экземпляром (другой процесс —
+        например, ``adaos secret set`` из CLI при запущенном API). Одно чтение ``kv_rev``
+        на отдельном соединении; первый вызов задаёт точку отсчёта.
+        """
+        with self._rev_lock:
+            if self._probe is None or self._pid != os.getpid():
+                self._probe = sqlite3.connect(self._db_path, check_same_thread=False)
+                self._probe.execute(f"PRAGMA busy_timeout={int(self._pragmas.get('busy_timeout', 5000))}")
+                self._own_revs = None
+            row = self._probe.execute(_REV_GET).fetchone()
+            rev = row[0] if row else 0
+            if self._own_revs is None:
+                self._own_revs, self._rev_seen = set(), rev
+            elif rev > self._rev_seen:
+                own = self._own_revs
+                mine = sum(1 for r in own if self._rev_seen < r <= rev)
+                self._foreign += rev - self._rev_seen - mine
+                self._own_revs = {r for r in own if r > rev}
+                self._rev_seen = rev
+            return self._foreign
+
+
+_UPSERT = "INSERT INTO kv(ns,k,v,expires_at) VALUES(?,?,?,?) ON CONFLICT(ns,k) DO UPDATE SET v=excluded.v, expires_at=excluded.expires_at"
+_DELETE = "DELETE FROM kv WHERE ns=? AND k=?"
+_ALIVE = "(expires_at IS NULL OR expires_at > ?)"
+_CHUNK = 500  # предел параметров в одном IN (...)
+
+_DELETED = object()  # маркер удаления в буфере write-behind
+_MISS = object()
+
+_log = logging.getLogger("adaos.kv")
+
+# живые KV с write-behind — дописываем их буферы при выходе процесса
+_WRITE_BEHIND: "weakref.WeakSet[SQLiteKV]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all_at_exit() -> None:
+    for kv in list(_WRITE_BEHIND):
+        try:
+            kv.close()
+        except Exception:
+            pass
+
+
+def _decode(raw: Any) -> Any:
+    try:
+        return json.loads(raw)
+    except Exception:
+        return raw
+
+
+def _prefix_upper(prefix: str) -> Optional[str]:
+    """Наименьшая строка больше всех ключей с префиксом ``prefix`` (None — без верхней границы)."""
+    chars = [*prefix]
+    while chars:
+        code = ord(chars.pop())
+        if code < 0x10FFFF:
+            code += 1
+            if 0xD800 <= code <= 0xDFFF:  # суррогаты в UTF-8 не кодируются
+                code = 0xE000
+            return "".join(chars) + chr(code)
+    return None
+
+
+def _key_range(prefix: str, cursor: Optional[str]) -> tuple[str, list[Any]]:
+    """
+    Условие диапазона по ключу вместо ``LIKE 'prefix%'``: обслуживается индексом (ns, k)
+    и не спотыкается о ``%``/``_`` в ключах. ``cursor`` — последний уже выданный ключ.
+    """
+    conds: List[str] = []
+    params: List[Any] = []
+    if cursor is not None and cursor >= prefix:
+        conds.append("k > ?")
+        params.append(cursor)
+    elif prefix:
+        conds.append("k >= ?")
+        params.append(prefix)
+    upper = _prefix_upper(prefix)
+    if upper is not None:
+        conds.append("k < ?")
+        params.append(upper)
+    return "".join(f" AND {c}" for c in conds), params
+
+
+def _expires_at(ttl: Optional[float]) -> Optional[float]:
+    if ttl is None:
+        return None
+    if ttl <= 0:
+        raise ValueError("ttl must be positive")
+    return time.time() + ttl
+
+
+def sweep_expired(sql: SQL, *, batch: int = 500, max_batches: Optional[int] = None, now: Optional[float] = None) -> int:
+    """
+    Удалить просроченные ключи (всех namespace) пачками по ``batch`` строк — каждая пачка
+    в своей короткой транзакции, чтобы не держать блокировку записи. Возвращает число удалённых.
+    """
+    now = time.time() if now is None else now
+    total = batch_no = 0
+    while max_batches is None or batch_no < max_batches:
+        with sql.connect() as con:
+            cur = con.execute(
+                "DELETE FROM kv WHERE rowid IN (SELECT rowid FROM kv WHERE expires_at <= ? LIMIT ?)",
+                (now, batch),
+            )
+            deleted = cur.rowcount
+        total += deleted
+        batch_no += 1
+        if deleted < batch:
+            break
+    return total
+
+
+class _ExpirySweeper:
+    """Фоновый поток (один на базу), периодически вызывающий sweep_expired."""
+
+    def __init__(self, sql: SQL, interval_s: float, batch: int) -> None:
+        self._sql = weakref.ref(sql)
+        self.interval_s = interval_s
+        self.batch = batch
+        self.swept = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="adaos-kv-sweeper", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            sql = self._sql()
+            if sql is None:
+                return  # база больше никому не нужна
+            try:
+                self.swept += sweep_expired(sql, batch=self.batch)
+            except Exception:
+                _log.exception("kv.sweep.error")
+            del sql
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+_SWEEPERS: "weakref.WeakKeyDictionary[SQL, _ExpirySweeper]" = weakref.WeakKeyDictionary()
+_SWEEPERS_LOCK = threading.Lock()
+
 
 class SQLiteKV(KV):
-    def __init__(self, sql: SQLite, namespace: str = "kv"):
+    """
+    KV поверх таблицы ``kv``. Пакетные операции (get_many/set_many/delete_many) выполняются
+    одной транзакцией. В режиме write-behind записи копятся в буфере (повторные записи одного
+    ключа схлопываются) и сбрасываются одной транзакцией раз в ``flush_interval_ms`` или по
+    достижении ``flush_ops`` операций; чтения видят буфер. flush()/close() — явный сброс
+    (close() вызывается и при выходе процесса).
+
+    TTL: ``set(..., ttl=секунды)`` пишет ``expires_at``; get/list/get_many просроченное не видят,
+    а удаляет его фоновый sweeper (поднимается при первой записи с TTL).
+    """
+
+    def __init__(
+        self,
+        sql: SQLite,
+        namespace: str = "kv",
+        *,
+        write_behind: bool = False,
+        flush_interval_ms: int = 50,
+        flush_ops: int = 256,
+        sweep_interval_s: float = 60.0,
+        sweep_batch: int = 500,
+    ):
         self.sql = sql
         self.ns = namespace
+        self.write_behind = write_behind
+        self._interval = max(flush_interval_ms, 1) / 1000.0
+        self._flush_ops = max(flush_ops, 1)
+        self._sweep_interval_s = sweep_interval_s
+        self._sweep_batch = sweep_batch
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[str, Any] = {}  # ключ -> (JSON-строка, expires_at) | _DELETED
+        self._inflight: Dict[str, Any] = {}  # вынуто из буфера, но ещё не закоммичено
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
         self._ensure()
+        if write_behind:
+            _WRITE_BEHIND.add(self)
 
     def _ensure(self) -> None:
         with self.sql.connect() as con:
@@ -38,38 +309,219 @@ class SQLiteKV(KV):
                     ns TEXT NOT NULL,
                     k  TEXT NOT NULL,
                     v  BLOB,
+                    expires_at REAL,
                     PRIMARY KEY (ns, k)
                 )
             """
             )
+            # миграция баз, созданных до появления TTL
+            cols = {row[1] for row in con.execute("PRAGMA table_info(kv)")}
+            if "expires_at" not in cols:
+                con.execute("ALTER TABLE kv ADD COLUMN expires_at REAL")
+            con.execute("CREATE INDEX IF NOT EXISTS kv_expires_at ON kv(expires_at) WHERE expires_at IS NOT NULL")
+
+    def _ensure_sweeper(self) -> None:
+        if self.sql in _SWEEPERS:
+            return
+        with _SWEEPERS_LOCK:
+            if self.sql not in _SWEEPERS:
+                _SWEEPERS[self.sql] = _ExpirySweeper(self.sql, self._sweep_interval_s, self._sweep_batch)
+
+    def sweep(self, *, max_batches: Optional[int] = None) -> int:
+        """Синхронно удалить просроченные ключи (то же, что делает фоновый sweeper)."""
+        return sweep_expired(self.sql, batch=self._sweep_batch, max_batches=max_batches)
+
+    # ---------- буфер write-behind ----------
+
+    def _buffered(self, key: str) -> Any:
+        with self._lock:
+            hit = self._pending.get(key, _MISS)
+            if hit is _MISS:
+                hit = self._inflight.get(key, _MISS)
+        if hit is not _MISS and hit is not _DELETED and hit[1] is not None and hit[1] <= time.time():
+            return _DELETED  # просрочено, пока лежало в буфере
+        return hit
+
+    def _buffer(self, items: Dict[str, Any]) -> None:
+        with self._lock:
+            self._pending.update(items)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run_flusher, name=f"adaos-kv-flush:{self.ns}", daemon=True)
+                self._thread.start()
+            if len(self._pending) >= self._flush_ops:
+                self._wake.set()
+
+    def _run_flusher(self) -> None:
+        while True:
+            self._wake.wait(self._interval)
+            self._wake.clear()
+            try:
+                flushed = self.flush()
+            except Exception:
+                _log.exception("kv.flush.error", extra={"extra": {"ns": self.ns}})
+                flushed = 1
+            if not flushed:
+                # простаиваем — поток завершается и будет поднят следующей записью
+                with self._lock:
+                    if not self._pending:
+                        self._thread = None
+                        return
+
+    def flush(self) -> int:
+        """Записать буфер write-behind одной транзакцией. Возвращает число сброшенных ключей."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._inflight = pending
+            if not pending:
+                return 0
+            upserts = [(self.ns, k, v[0], v[1]) for k, v in pending.items() if v is not _DELETED]
+            deletes = [(self.ns, k) for k, v in pending.items() if v is _DELETED]
+            try:
+                with self.sql.write() as con:
+                    if upserts:
+                        con.executemany(_UPSERT, upserts)
+                    if deletes:
+                        con.executemany(_DELETE, deletes)
+            except Exception:
+                # вернуть несохранённое, не перетирая более свежие записи
+                with self._lock:
+                    for k, v in pending.items():
+                        self._pending.setdefault(k, v)
+                raise
+            finally:
+                with self._lock:
+                    self._inflight = {}
+            return len(pending)
+
+    def close(self) -> None:
+        """Сбросить буфер (durability при остановке)."""
+        self.flush()
+
+    # ---------- одиночные операции ----------
 
     def get(self, key: str, default: Any = None) -> Any:
+        if self.write_behind:
+            hit = self._buffered(key)
+            if hit is _DELETED:
+                return default
+            if hit is not _MISS:
+                return _decode(hit[0])
         with self.sql.connect() as con:
-            cur = con.execute("SELECT v FROM kv WHERE ns=? AND k=?", (self.ns, key))
+            cur = con.execute(f"SELECT v FROM kv WHERE ns=? AND k=? AND {_ALIVE}", (self.ns, key, time.time()))
             row = cur.fetchone()
             if not row:
                 return default
-            try:
-                return json.loads(row[0])
-            except Exception:
-                return row[0]
+            return _decode(row[0])
 
-    def set(self, key: str, value: Any) -> None:
+    def set(self, key: str, value: Any, *, ttl: Optional[float] = None) -> None:
+        """Записать значение; ``ttl`` (секунды) — срок жизни ключа, None — бессрочно."""
         data = json.dumps(value, ensure_ascii=False)
-        with self.sql.connect() as con:
-            con.execute(
-                "INSERT INTO kv(ns,k,v) VALUES(?,?,?) ON CONFLICT(ns,k) DO UPDATE SET v=excluded.v",
-                (self.ns, key, data),
-            )
-            con.commit()
+        expires_at = _expires_at(ttl)
+        if expires_at is not None:
+            self._ensure_sweeper()
+        if self.write_behind:
+            self._buffer({key: (data, expires_at)})
+            return
+        with self.sql.write() as con:
+            con.execute(_UPSERT, (self.ns, key, data, expires_at))
 
     def delete(self, key: str) -> None:
-        with self.sql.connect() as con:
-            con.execute("DELETE FROM kv WHERE ns=? AND k=?", (self.ns, key))
-            con.commit()
+        if self.write_behind:
+            self._buffer({key: _DELETED})
+            return
+        with self.sql.write() as con:
+            con.execute(_DELETE, (self.ns, key))
 
-    def list(self, prefix: str = "") -> list[str]:
-        pattern = f"{prefix}%" if prefix else "%"
+    def list(self, prefix: str = "", *, limit: Optional[int] = None, cursor: Optional[str] = None) -> list[str]:
+        """
+        Ключи с префиксом ``prefix`` в порядке возрастания. ``limit`` ограничивает страницу,
+        ``cursor`` — последний ключ предыдущей страницы (выдача продолжается строго после него).
+        """
+        if limit is not None and limit <= 0:
+            return []
+        now = time.time()
+        removed: set[str] = set()
+        added: set[str] = set()
+        if self.write_behind:
+            with self._lock:
+                overlay = {**self._inflight, **self._pending}
+            for k, v in overlay.items():
+                if not k.startswith(prefix) or (cursor is not None and k <= cursor):
+                    continue
+                if v is _DELETED or (v[1] is not None and v[1] <= now):
+                    removed.add(k)
+                else:
+                    added.add(k)
+        where, params = _key_range(prefix, cursor)
+        query = f"SELECT k FROM kv WHERE ns=?{where} AND {_ALIVE} ORDER BY k"
+        if limit is not None:
+            # с запасом на ключи, удалённые в буфере, — страница всё равно будет полной
+            query += f" LIMIT {int(limit) + len(removed)}"
         with self.sql.connect() as con:
-            cur = con.execute("SELECT k FROM kv WHERE ns=? AND k LIKE ?", (self.ns, pattern))
-            return [row[0] for row in cur.fetchall()]
+            keys = [row[0] for row in con.execute(query, (self.ns, *params, now))]
+        if removed or added:
+            keys = sorted((set(keys) - removed) | added)
+        return keys if limit is None else keys[:limit]
+
+    def iter_keys(self, prefix: str = "", *, batch: int = 500) -> Iterator[str]:
+        """Потоково перебрать ключи с префиксом страницами по ``batch`` (без удержания соединения)."""
+        cursor: Optional[str] = None
+        while True:
+            page = self.list(prefix, limit=batch, cursor=cursor)
+            yield from page
+            if len(page) < batch:
+                return
+            cursor = page[-1]
+
+    # ---------- пакетные операции ----------
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Значения для существующих ключей (отсутствующие в результат не попадают)."""
+        return {k: v for k, (v, _) in self.get_entries(keys).items()}
+
+    def get_entries(self, keys: Iterable[str]) -> Dict[str, tuple[Any, Optional[float]]]:
+        """Как get_many, но с ``expires_at`` каждого ключа: {key: (value, expires_at | None)}."""
+        out: Dict[str, tuple[Any, Optional[float]]] = {}
+        missing: List[str] = []
+        for key in dict.fromkeys(keys):
+            hit = self._buffered(key) if self.write_behind else _MISS
+            if hit is _MISS:
+                missing.append(key)
+            elif hit is not _DELETED:
+                out[key] = (_decode(hit[0]), hit[1])
+        if missing:
+            now = time.time()
+            with self.sql.connect() as con:
+                for i in range(0, len(missing), _CHUNK):
+                    chunk = missing[i : i + _CHUNK]
+                    marks = ",".join("?" * len(chunk))
+                    query = f"SELECT k, v, expires_at FROM kv WHERE ns=? AND k IN ({marks}) AND {_ALIVE}"
+                    for k, v, exp in con.execute(query, (self.ns, *chunk, now)):
+                        out[k] = (_decode(v), exp)
+        return out
+
+    def set_many(self, items: Mapping[str, Any], *, ttl: Optional[float] = None) -> None:
+        """Записать несколько ключей одной транзакцией (``ttl`` — общий для всех)."""
+        expires_at = _expires_at(ttl)
+        data = {k: (json.dumps(v, ensure_ascii=False), expires_at) for k, v in items.items()}
+        if not data:
+            return
+        if expires_at is not None:
+            self._ensure_sweeper()
+        if self.write_behind:
+            self._buffer(data)
+            return
+        with self.sql.write() as con:
+            con.executemany(_UPSERT, [(self.ns, k, v, exp) for k, (v, exp) in data.items()])
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """Удалить несколько ключей одной транзакцией."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return
+        if self.write_behind:
+            self._buffer({k: _DELETED for k in keys})
+            return
+        with self.sql.write() as con:
+            con.executemany(_DELETE, [(self.ns, k) for k in keys])
@@ -9,7 +9,7 @@ from pathlib import Path
 
 from adaos.apps.api.auth import require_token
 from adaos.services.node_config import load_config
-from adaos.services.observe import _log_path, BROADCAST, pass_filters
+from adaos.services.observe import _ensure_writer, _write_local, event_log, flush_local, BROADCAST, sse_frame
 import adaos.sdk.bus as bus
 
 router = APIRouter(tags=["observe"], dependencies=[Depends(require_token)])
@@ -27,83 +27,67 @@ async def observe_ingest(batch: IngestBatch):
     if conf.role != "hub":
         raise HTTPException(status_code=403, detail="only hub accepts logs")
 
-    logf = _log_path()
     ingested = 0
-    with logf.open("a", encoding="utf-8") as f:
-        for e in batch.events:
-            # гарантируем наличие node_id (берём из батча — доверяем member)
-            e.setdefault("node_id", batch.node_id)
-            f.write(json.dumps(e, ensure_ascii=False) + "\n")
-            ingested += 1
-    # Публикуем полученные события (чтобы зрители SSE видели ленту)
+    _ensure_writer()
+    lines: List[str] = []
     for e in batch.events:
-        await BROADCAST.publish(e)
+        # гарантируем наличие node_id (берём из батча — доверяем member)
+        e.setdefault("node_id", batch.node_id)
+        line = json.dumps(e, ensure_ascii=False)
+        _write_local(e, line)  # в буфер events.log, на диск — фоновым писателем
+        lines.append(line)
+        ingested += 1
+    # Публикуем полученные события (чтобы зрители SSE видели ленту)
+    for e, line in zip(batch.events, lines):
+        await BROADCAST.publish(e, line)
     return {"ok": True, "ingested": ingested}
 
 
 @router.get("/tail", dependencies=[Depends(require_token)])
-async def observe_tail(lines: int = 200, topic_prefix: str | None = None, node_id: str | None = None):
-    """Последние N строк, можно фильтровать по topic_prefix и node_id (hub/member)."""
-    logf = _log_path()
-    if not logf.exists():
-        return {"ok": True, "lines": []}
-    # грубый tail без mmap
-    with logf.open("rb") as f:
-        f.seek(0, 2)
-        size = f.tell()
-        block = 4096
-        data = b""
-        while size > 0 and data.count(b"\n") <= lines:
-            step = min(block, size)
-            size -= step
-            f.seek(size)
-            data = f.read(step) + data
-        out = [line.decode("utf-8", errors="ignore") for line in data.splitlines()[-lines:]]
-    if not (topic_prefix or node_id):
-        return {"ok": True, "lines": out}
-    # фильтрация по JSON‑полям
-    filtered: List[str] = []
-    for ln in out:
-        try:
-            obj = json.loads(ln)
-            if pass_filters(obj, topic_prefix, node_id, None):
-                filtered.append(ln)
-        except Exception:
-            pass
-    return {"ok": True, "lines": filtered}
+async def observe_tail(lines: int = 200, topic_prefix: str | None = None, node_id: str | None = None, since: float | None = None):
+    """Последние N подходящих строк (topic_prefix, node_id, since) — по индексу журнала, включая сжатые сегменты."""
+    await flush_local()
+    log = await asyncio.to_thread(event_log)
+    out = await asyncio.to_thread(log.tail, lines, topic_prefix=topic_prefix, node_id=node_id, since=since)
+    return {"ok": True, "lines": out}
+
+
+async def _replay(topic_prefix: str | None, node_id: str | None, since: float | None, replay_lines: int | None, until: float) -> AsyncIterator[bytes]:
+    """История из журнала: с since — всё начиная с него, иначе последние replay_lines строк."""
+    await flush_local()
+    log = await asyncio.to_thread(event_log)
+    if since:
+        # поблочно: чтение блока — в потоке, память — один блок
+        blocks = log.blocks(since=since, until=until, topic_prefix=topic_prefix, node_id=node_id)
+        while (chunk := await asyncio.to_thread(next, blocks, None)) is not None:
+            for ln in chunk:
+                yield sse_frame(ln)
+    elif replay_lines:
+        for ln in await asyncio.to_thread(log.tail, int(replay_lines), topic_prefix=topic_prefix, node_id=node_id, until=until):
+            yield sse_frame(ln)
 
 
 async def _sse_iter(topic_prefix: str | None, node_id: str | None, since: float | None, replay_lines: int | None = 5) -> AsyncIterator[bytes]:
     """
-    Итератор для SSE. Не держим старую историю (кроме опционального since для фильтра).
+    Итератор для SSE: сначала история из журнала (since или replay_lines), затем живые события.
+    Фильтры применяет BROADCAST при публикации — в очередь попадают только готовые кадры этого клиента.
     """
-    q = BROADCAST.subscribe(topic_prefix=topic_prefix, node_id=node_id, since_ts=since)
-    # шлём комментарий раз в 15с, чтобы соединение не засыпало
-    heartbeat_at = time.time()
-    if replay_lines and not since:
-        # прочитаем хвост и отправим их как "исторические"
-        from adaos.services.observe import _log_path
-
-        try:
-            with _log_path().open("r", encoding="utf-8") as f:
-                tail = f.readlines()[-int(replay_lines) :]
-            for ln in tail:
-                try:
-                    obj = json.loads(ln)
-                    if pass_filters(obj, topic_prefix, node_id, None):
-                        data = json.dumps(obj, ensure_ascii=False).encode("utf-8")
-                        yield b"event: adaos\n" + b"data: " + data + b"\n\n"
-                except Exception:
-                    pass
-        except Exception:
-            pass
+    sub = BROADCAST.subscribe(topic_prefix=topic_prefix, node_id=node_id, since_ts=since)
+    # всё, что опубликовано после подписки, придёт из очереди — история только до этого момента
+    subscribed_at = time.time()
+    q = sub.queue
     try:
+        # шлём комментарий раз в 15с, чтобы соединение не засыпало
+        heartbeat_at = time.time()
+        if since or replay_lines:
+            try:
+                async for frame in _replay(topic_prefix, node_id, since, replay_lines, subscribed_at):
+                    yield frame
+            except Exception:
+                pass
         while True:
             try:
-                evt = await asyncio.wait_for(q.get(), timeout=5.0)  # type: ignore[name-defined]
-                if pass_filters(evt, topic_prefix, node_id, since):
-                    data = json.dumps(evt, ensure_ascii=False).encode("utf-8")
-                    yield b"event: adaos\n" + b"data: " + data + b"\n\n"
+                yield await asyncio.wait_for(q.get(), timeout=5.0)
             except asyncio.TimeoutError:  # type: ignore[name-defined]
                 pass
 
@@ -114,6 +98,8 @@ async def _sse_iter(topic_prefix: str | None, node_id: str | None, since: float
     except (asyncio.CancelledError, GeneratorExit):
         # клиент закрыл соединение — выходим тихо
         return
+    finally:
+        BROADCAST.unsubscribe(sub)
 
 
 @router.get("/stream", dependencies=[Depends(require_token)])
@@ -128,6 +114,7 @@ async def observe_stream(
     Примеры:
       /api/observe/stream?topic_prefix=net.subnet.
       /api/observe/stream?node_id=<uuid>
+      /api/observe/stream?since=<unix ts>   — сначала история из журнала с этого момента
     """
     headers = {
         "Cache-Control": "no-cache",
@@ -138,6 +125,12 @@ async def observe_stream(
     return StreamingResponse(_sse_iter(topic_prefix, node_id, since, replay_lines), media_type="text/event-stream", headers=headers)
 
 
+@router.get("/subscribers", dependencies=[Depends(require_token)])
+async def observe_subscribers():
+    """Открытые SSE-потоки: фильтр, глубина очереди, доставлено и сброшено (при переполнении)."""
+    return {"ok": True, "subscribers": BROADCAST.stats()}
+
+
 @router.post("/test", dependencies=[Depends(require_token)])
 async def observe_test(kind: str = "ping", note: str | None = None, topic: str | None = None):
     """
@@ -1,5 +1,6 @@
 # src/adaos/api/server.py
 from fastapi import FastAPI, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
@@ -13,6 +14,8 @@ from adaos.adapters.audio.tts.native_tts import NativeTTS
 from adaos.apps.bootstrap import bootstrap_app
 from adaos.services.bootstrap import run_boot_sequence, shutdown, is_ready
 from adaos.services.observe import start_observer, stop_observer
+from adaos.services.agent_context import get_ctx
+from adaos.services.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, LoopLagSampler, render_prometheus
 
 bootstrap_app()
 
@@ -36,11 +39,21 @@ async def lifespan(app: FastAPI):
     await start_observer()
     await run_boot_sequence(app)
 
+    # 5) замер задержки event loop (adaos_event_loop_lag_seconds)
+    lag_sampler = None
+    interval = getattr(get_ctx().settings, "loop_lag_interval", 0.5)
+    if interval > 0:
+        lag_sampler = LoopLagSampler(interval=interval)
+        lag_sampler.start()
+
     try:
         yield
     finally:
+        if lag_sampler is not None:
+            await lag_sampler.stop()
         await stop_observer()
         await shutdown()
+        tool_bridge.shutdown_tool_executor()
 
 
 # пересоздаём приложение с lifespan
@@ -89,6 +102,12 @@ async def status():
     }
 
 
+@app.get("/api/metrics", dependencies=[Depends(require_token)], response_class=PlainTextResponse)
+async def metrics():
+    """Метрики процесса в текстовом формате Prometheus."""
+    return PlainTextResponse(render_prometheus(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.post("/api/say", response_model=SayResponse, dependencies=[Depends(require_token)])
 async def say(payload: SayRequest):
     t0 = time.perf_counter()
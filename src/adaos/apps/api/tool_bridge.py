@@ -2,16 +2,133 @@
 from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from pydantic import BaseModel, Field
 import importlib.util
-from typing import Any, Dict
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from adaos.apps.api.auth import require_token
-from adaos.sdk.decorators import resolve_tool
+from adaos.sdk.decorators import tools_meta, tools_registry
+from adaos.services.runtime.tool_executor import ToolExecutor
 from adaos.services.observe import attach_http_trace_headers
+from adaos.services.metrics import REGISTRY as METRICS
 from adaos.services.agent_context import get_ctx, AgentContext
 
 
 router = APIRouter()
 
+# метка tool — только у найденных инструментов, чтобы произвольные имена из запросов не плодили серии
+_CALL_SECONDS = METRICS.histogram("adaos_tool_call_seconds", "Latency of /tools/call including queueing in the executor, by tool", ("tool",))
+_CALLS = METRICS.counter("adaos_tool_calls_total", "Tool calls through /tools/call, by tool and status (ok | bad_args | error)", ("tool", "status"))
+
+
+@dataclass(slots=True)
+class ToolEntry:
+    fn: Callable[..., Any]
+    meta: Dict[str, Any]
+
+    @property
+    def input_schema(self) -> Optional[dict]:
+        return self.meta.get("input_schema")
+
+
+@dataclass(slots=True)
+class DispatchTable:
+    """Инструменты одной версии навыка: модуль handlers/main.py и public_name -> ToolEntry."""
+
+    skill: str
+    sig: Tuple[int, int]  # (mtime_ns, size) handlers/main.py
+    module: ModuleType
+    tools: Dict[str, ToolEntry]
+
+
+# путь handlers/main.py -> таблица; перестраивается при смене файла
+_TABLES: Dict[Path, DispatchTable] = {}
+_TABLES_LOCK = threading.Lock()
+
+
+def _import_tools(skill_name: str, handler_file: Path, sig: Tuple[int, int]) -> DispatchTable:
+    mod_name = f"adaos_skill_{skill_name}_handlers_main"
+    spec = importlib.util.spec_from_file_location(mod_name, handler_file)
+    if spec is None or spec.loader is None:
+        raise HTTPException(status_code=500, detail="failed to load skill module")
+
+    module = importlib.util.module_from_spec(spec)
+    previous = tools_registry.pop(mod_name, None)  # инструменты прежней версии не должны пережить перезагрузку
+    try:
+        spec.loader.exec_module(module)
+    except Exception as e:
+        if previous is not None:
+            tools_registry.setdefault(mod_name, previous)
+        raise HTTPException(status_code=500, detail=f"failed to import skill '{skill_name}': {type(e).__name__}: {e}")
+
+    tools: Dict[str, ToolEntry] = {}
+    for public_name, fn in (tools_registry.get(mod_name) or {}).items():
+        meta = tools_meta.get(f"{mod_name}.{getattr(fn, '__name__', public_name)}") or {}
+        tools[public_name] = ToolEntry(fn=fn, meta=meta)
+    return DispatchTable(skill=skill_name, sig=sig, module=module, tools=tools)
+
+
+def dispatch_table(skill_name: str, handler_file: Path) -> DispatchTable:
+    """Таблица инструментов навыка: импорт только при первом вызове или изменении handlers/main.py."""
+    try:
+        st = os.stat(handler_file)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"skill '{skill_name}' is not installed (handlers/main.py missing)") from None
+    sig = (st.st_mtime_ns, st.st_size)
+    table = _TABLES.get(handler_file)
+    if table is not None and table.sig == sig:
+        return table
+    with _TABLES_LOCK:
+        table = _TABLES.get(handler_file)
+        if table is None or table.sig != sig:
+            table = _TABLES[handler_file] = _import_tools(skill_name, handler_file, sig)
+    return table
+
+
+_EXECUTOR: Optional[ToolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def tool_executor(ctx: AgentContext) -> ToolExecutor:
+    """Общий исполнитель инструментов моста (пулы по размерам из Settings)."""
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                settings = ctx.settings
+                _EXECUTOR = ToolExecutor(
+                    thread_workers=getattr(settings, "tool_thread_workers", 8),
+                    process_workers=getattr(settings, "tool_process_workers", 2),
+                    process_initializer=_init_tool_process,
+                    process_initargs=(settings,),
+                )
+    return _EXECUTOR
+
+
+def _init_tool_process(settings: Any) -> None:
+    """Инициализатор воркера пула процессов: свой AgentContext с настройками родителя (SDK, KV, пути)."""
+    from adaos.apps.bootstrap import init_ctx
+
+    init_ctx(settings)
+
+
+def shutdown_tool_executor() -> None:
+    global _EXECUTOR
+    executor, _EXECUTOR = _EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def invalidate_dispatch_tables(skill_name: Optional[str] = None) -> None:
+    """Сбросить таблицы (все или одного навыка) — следующий вызов переимпортирует модуль."""
+    with _TABLES_LOCK:
+        for key in [k for k, t in _TABLES.items() if skill_name is None or t.skill == skill_name]:
+            del _TABLES[key]
+
 
 class ToolCall(BaseModel):
     """
@@ -51,39 +168,38 @@ async def call_tool(body: ToolCall, request: Request, response: Response, ctx: A
         # это защита от сторонних перезаписей контекста
         raise HTTPException(status_code=404, detail=f"skill '{skill_name}' is not the current skill (current: '{current.name}')")
 
-    # 5) Грузим модуль обработчика навыка
-    handler_file = current.path / "handlers" / "main.py"
-    if not handler_file.exists():
-        raise HTTPException(status_code=404, detail=f"skill '{skill_name}' is not installed (handlers/main.py missing)")
-
-    mod_name = f"adaos_skill_{skill_name}_handlers_main"
-    spec = importlib.util.spec_from_file_location(mod_name, handler_file)
-    if spec is None or spec.loader is None:
-        raise HTTPException(status_code=500, detail="failed to load skill module")
-
-    module = importlib.util.module_from_spec(spec)
-    try:
-        spec.loader.exec_module(module)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"failed to import skill '{skill_name}': {type(e).__name__}: {e}")
+    # 5) Таблица инструментов навыка (модуль импортируется один раз на версию handlers/main.py)
+    table = dispatch_table(skill_name, current.path / "handlers" / "main.py")
 
     # 6) Ищем инструмент по публичному имени, зарегистрированному @tool("<public_name>")
-    fn = resolve_tool(mod_name, public_tool)
-    if fn is None:
+    entry = table.tools.get(public_tool)
+    if entry is None:
         raise HTTPException(status_code=404, detail=f"tool '{public_tool}' is not exported by skill '{skill_name}'")
+    fn = entry.fn
 
-    # 7) Вызываем инструмент (sync/async совместимость)
+    # 7) Вызываем инструмент по его политике исполнения (inline / thread / process, см. @tool(execution=...))
     # trace_id в HTTP: читаем входной/ставим в ответ
     trace = attach_http_trace_headers(request.headers, response.headers)
     args = body.arguments or {}
+    started = time.perf_counter()
+    status = "error"
     try:
-        result = fn(**args)
-        if hasattr(result, "__await__"):
-            result = await result
+        result = await tool_executor(ctx).run(body.tool, fn, args, meta=entry.meta, module_file=current.path / "handlers" / "main.py")
+        status = "ok"
     except TypeError as e:
         # частый кейс: некорректные аргументы
+        status = "bad_args"
         raise HTTPException(status_code=400, detail=f"invalid arguments: {e}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"tool runtime error: {type(e).__name__}: {e}")
+    finally:
+        _CALL_SECONDS.labels(body.tool).observe(time.perf_counter() - started)
+        _CALLS.labels(body.tool, status).inc()
 
     return {"ok": True, "result": result, "trace_id": trace}
+
+
+@router.get("/tools/stats", dependencies=[Depends(require_token)])
+async def tools_stats():
+    """Счётчики вызовов инструментов: calls/errors/in_flight, среднее и максимальное время в очереди."""
+    return {"ok": True, "tools": _EXECUTOR.stats() if _EXECUTOR is not None else {}}
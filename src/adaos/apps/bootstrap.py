@@ -1,29 +1,58 @@
 # src/adaos/apps/bootstrap.py
 from __future__ import annotations
-from typing import Optional
-from threading import RLock
+from typing import Any, Callable, Optional
+from threading import Lock, RLock
 
 from adaos.services.settings import Settings
 from adaos.services.agent_context import AgentContext
 from adaos.adapters.fs.path_provider import PathProvider
-from adaos.services.eventbus import LocalEventBus
+from adaos.services.eventbus import LocalEventBus, AsyncEventBus
+from adaos.services.metrics import REGISTRY as METRICS
 from adaos.services.logging import setup_logging, attach_event_logger
-from adaos.adapters.git.cli_git import CliGitClient
-from adaos.adapters.db import SQLite, SQLiteKV
+from adaos.adapters.db import SQLite, SQLiteKV, CachedKV
 from adaos.services.runtime import AsyncProcessManager
 from adaos.services.policy.capabilities import InMemoryCapabilities
 from adaos.services.policy.net import NetPolicy
-from adaos.adapters.git.secure_git import SecureGitClient
 from adaos.services.policy.fs import SimpleFSPolicy
-from adaos.adapters.secrets.keyring_vault import KeyringVault
-from adaos.adapters.secrets.file_vault import FileVault
-from adaos.services.secrets.service import SecretsService
-from adaos.services.secrets.crypto import load_or_create_master  # noqa: F401 (если пока не используешь)
-from adaos.services.sandbox.runner import ProcSandbox
-from adaos.services.sandbox.service import SandboxService
 
 from adaos.services.agent_context import set_ctx
 
+# git / secrets / sandbox тянут keyring, cryptography и psutil — импортируются в фабриках _LazyAdapter
+
+
+class _LazyAdapter:
+    """
+    Адаптер, который строится при первом обращении к любому его атрибуту. Так ``adaos --help``
+    и лёгкие команды CLI не платят за импорт и сборку секретов, песочницы и git.
+    """
+
+    __slots__ = ("_factory", "_obj", "_lock")
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._obj: Any = None
+        self._lock = Lock()
+
+    def _resolve(self) -> Any:
+        obj = self._obj
+        if obj is None:
+            with self._lock:
+                if self._obj is None:
+                    self._obj = self._factory()
+                obj = self._obj
+        return obj
+
+    @property
+    def built(self) -> bool:
+        """Собран ли адаптер; проверка сама сборку не запускает (для shutdown и т.п.)."""
+        return self._obj is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self._obj!r}>" if self._obj is not None else "<lazy (not built)>"
+
 
 class _CtxHolder:
     _ctx: Optional[AgentContext] = None
@@ -72,7 +101,10 @@ class _CtxHolder:
         ):
             fs.allow_root(root)
 
-        bus = LocalEventBus()
+        if settings.event_bus == "async":
+            bus = AsyncEventBus(queue_size=settings.event_bus_queue_size, overflow=settings.event_bus_overflow, metrics=METRICS)
+        else:
+            bus = LocalEventBus(metrics=METRICS)
         root_logger = setup_logging(paths)
         attach_event_logger(bus, root_logger.getChild("events"))
 
@@ -99,42 +131,71 @@ class _CtxHolder:
         caps.grant("core", "proc.run", "net.git", "git.write", "skills.manage", "scenarios.manage", "secrets.read", "secrets.write")
 
         # Git с защитой
-        git_base = CliGitClient(depth=1)
-        git = SecureGitClient(git_base, net)
+        def _git():
+            from adaos.adapters.git.cli_git import CliGitClient
+            from adaos.adapters.git.secure_git import SecureGitClient
+
+            return SecureGitClient(CliGitClient(depth=1), net)
+
+        git = _LazyAdapter(_git)
 
         proc = AsyncProcessManager(bus=bus)
         sql = SQLite(paths)
-        kv = SQLiteKV(sql, namespace="adaos")
+        kv = SQLiteKV(
+            sql,
+            namespace="adaos",
+            write_behind=settings.kv_write_behind_ms > 0,
+            flush_interval_ms=settings.kv_write_behind_ms or 50,
+        )
+        if settings.kv_cache_size > 0:
+            kv = CachedKV(kv, max_entries=settings.kv_cache_size, bypass=settings.kv_cache_bypass)
 
         # Secrets: keyring primary; file vault fallback (ключ в keyring)
-        try:
-            secrets_backend = KeyringVault(profile=settings.profile, kv=kv)
-        except Exception:
-            # file vault (ключ через keyring, но если keyring недоступен — ищем в ENV)
-            def key_get():
-                try:
-                    import keyring
-
-                    v = keyring.get_password(f"adaos:master:{settings.profile}", "vault.key")
-                    return v.encode("utf-8") if v else None
-                except Exception:
-                    return None
-
-            def key_set(b: bytes):
-                try:
-                    import keyring
+        def _secrets():
+            from adaos.adapters.secrets.file_vault import FileVault
+            from adaos.services.secrets.service import SecretsService
 
-                    keyring.set_password(f"adaos:master:{settings.profile}", "vault.key", b.decode("utf-8"))
-                except Exception:
-                    pass
-
-            secrets_backend = FileVault(base_dir=paths.base, fs=None, key_get=key_get, key_set=key_set)
-
-        secrets = SecretsService(secrets_backend, caps)
+            try:
+                from adaos.adapters.secrets.keyring_vault import KeyringVault
 
-        # если backend FileVault — подставим fs
-        if isinstance(secrets_backend, FileVault):
-            secrets_backend.fs = fs
+                secrets_backend = KeyringVault(profile=settings.profile, kv=kv)
+            except Exception:
+                # file vault (ключ через keyring, но если keyring недоступен — ищем в ENV)
+                def key_get():
+                    try:
+                        import keyring
+
+                        v = keyring.get_password(f"adaos:master:{settings.profile}", "vault.key")
+                        return v.encode("utf-8") if v else None
+                    except Exception:
+                        return None
+
+                def key_set(b: bytes):
+                    try:
+                        import keyring
+
+                        keyring.set_password(f"adaos:master:{settings.profile}", "vault.key", b.decode("utf-8"))
+                    except Exception:
+                        pass
+
+                secrets_backend = FileVault(base_dir=paths.base, fs=None, key_get=key_get, key_set=key_set)
+
+            # если backend FileVault — подставим fs
+            if isinstance(secrets_backend, FileVault):
+                secrets_backend.fs = fs
+            return SecretsService(secrets_backend, caps)
+
+        def _sandbox():
+            from adaos.services.sandbox.runner import ProcSandbox
+            from adaos.services.sandbox.service import SandboxService
+
+            return SandboxService(
+                runner=ProcSandbox(fs_base=paths.base),
+                caps=caps,
+                bus=bus,
+                max_concurrency=settings.sandbox_max_concurrency,
+                quotas=dict(settings.sandbox_quotas),
+            )
 
         ctx = AgentContext(
             settings=settings,
@@ -145,12 +206,12 @@ class _CtxHolder:
             devices=object(),
             kv=kv,
             sql=sql,
-            secrets=secrets,
+            secrets=_LazyAdapter(_secrets),
             net=net,
             updates=object(),
             git=git,
             fs=fs,
-            sandbox=SandboxService(runner=ProcSandbox(fs_base=paths.base), caps=caps, bus=bus),
+            sandbox=_LazyAdapter(_sandbox),
         )
 
         # чтобы в адаптерах было paths.ctx.fs (если Paths это позволяет)
@@ -13,25 +13,52 @@ import typer
 # загружаем .env один раз (для переменных вроде ADAOS_TTS/ADAOS_STT)
 load_dotenv(find_dotenv())
 
-from adaos.sdk.utils.setup_env import prepare_environment
-
-# контекст и настройки (PR-2)
+# контекст и настройки (PR-2); тяжёлые модули (bootstrap контекста, команды) — по требованию
 from adaos.services.settings import Settings
-from adaos.apps.bootstrap import init_ctx, get_ctx, reload_ctx
 from adaos.apps.cli.i18n import _
+from adaos.apps.cli.lazy import LazyCommand, LazyTyperGroup
 from adaos.services.agent_context import get_ctx
 
-# общие подкоманды
-from adaos.apps.cli.commands import monitor, skill, runtime, llm, tests as tests_cmd, api, scenario, sdk_export as _sdk_export
+_CMD = "adaos.apps.cli.commands."
+
+
+def _read(name: str, default: str = "") -> str:
+    return os.getenv(name, default).strip().lower()
+
+
+def _lazy_commands() -> dict[str, LazyCommand]:
+    cmds = {
+        # общие подкоманды
+        "skill": LazyCommand(_CMD + "skill:app", _("cli.help_skill")),
+        "tests": LazyCommand(_CMD + "tests:app", _("cli.help_test")),
+        "runtime": LazyCommand(_CMD + "runtime:app", _("cli.help_runtime")),
+        "llm": LazyCommand(_CMD + "llm:app", _("cli.help_llm")),
+        "api": LazyCommand(_CMD + "api:app", "HTTP API для AdaOS"),
+        "monitor": LazyCommand(_CMD + "monitor:app", "Monitoring tools"),
+        "scenario": LazyCommand(_CMD + "scenario:scenario_app", "Управление сценариями (монорепо, реестр в БД)"),
+        "secret": LazyCommand(_CMD + "secret:app", "Управление секретами"),
+        "sandbox": LazyCommand(_CMD + "sandbox:app", "Песочница процессов (диагностика)"),
+        "sdk": LazyCommand(_CMD + "sdk_export:app", "SDK export utilities"),
+        "debug": LazyCommand(_CMD + "debug:app", "Диагностика самого CLI (время импорта и т.п.)"),
+    }
+    # ---- Фильтрация интеграций по ENV ----
+    tts = _read("ADAOS_TTS", "native")
+    if tts == "ovos":
+        cmds["ovos"] = LazyCommand(_CMD + "ovos:app", "OVOS-интеграция")
+    elif tts == "rhasspy":
+        cmds["rhasspy"] = LazyCommand(_CMD + "rhasspy:app", "Rhasspy-интеграция")
+    else:
+        # корневые команды «нативного» профиля
+        cmds["say"] = LazyCommand(_CMD + "native:app", "Озвучить текст (native TTS)", command="say")
+        cmds["start"] = LazyCommand(_CMD + "native:app", "Запускает офлайн-слушатель (Vosk). Ctrl+C для выхода.", command="start")
+    return cmds
+
+
+class _RootGroup(LazyTyperGroup):
+    lazy_commands = _lazy_commands()
 
-# интеграции
-from adaos.apps.cli.commands import native
-from adaos.apps.cli.commands import ovos as ovos_cmd
-from adaos.apps.cli.commands import rhasspy as rhasspy_cmd
-from adaos.apps.cli.commands import secret
-from adaos.apps.cli.commands import sandbox as sandbox_cmd
 
-app = typer.Typer(help=_("cli.help"))
+app = typer.Typer(help=_("cli.help"), cls=_RootGroup)
 
 # -------- вспомогательные --------
 
@@ -48,10 +75,6 @@ def _run_safe(func):
     return wrapper
 
 
-def _read(name: str, default: str = "") -> str:
-    return os.getenv(name, default).strip().lower()
-
-
 def _write_env_var(key: str, value: str, dotenv_path: Path | None = None):
     """Примитивно патчим .env (или создаём)."""
     from dotenv import find_dotenv  # локальный импорт, чтобы не тянуть при тестах
@@ -93,6 +116,8 @@ def ensure_environment():
     os.environ["ADAOS_PROFILE"] = ctx.settings.profile
 
     if not base_dir.exists():
+        from adaos.sdk.utils.setup_env import prepare_environment
+
         typer.echo(_("cli.no_env_creating"))
         prepare_environment()
 
@@ -111,6 +136,8 @@ def main(
     """
     Вызывается перед любыми подкомандами: строит (или пересобирает) контекст и гарантирует готовность окружения.
     """
+    from adaos.apps.bootstrap import init_ctx, reload_ctx
+
     # 1) читаем базовые настройки (константы/.env/ENV)
     settings = Settings.from_sources()
 
@@ -175,28 +202,9 @@ def where():
 
 
 # -------- подкоманды --------
+# группы из commands/ подключаются лениво (_RootGroup.lazy_commands)
 
-app.add_typer(skill.app, name="skill", help=_("cli.help_skill"))
-app.add_typer(tests_cmd.app, name="tests", help=_("cli.help_test"))
-app.add_typer(runtime.app, name="runtime", help=_("cli.help_runtime"))
-app.add_typer(llm.app, name="llm", help=_("cli.help_llm"))
-app.add_typer(api.app, name="api")
-app.add_typer(monitor.app, name="monitor")
-app.add_typer(scenario.scenario_app, name="scenario")
 app.add_typer(switch_app, name="switch", help="Переключение профилей интеграций")
-app.add_typer(secret.app, name="secret")
-app.add_typer(sandbox_cmd.app, name="sandbox")
-app.add_typer(_sdk_export.app, name="sdk")
-
-# ---- Фильтрация интеграций по ENV ----
-_tts = _read("ADAOS_TTS", "native")
-if _tts == "ovos":
-    app.add_typer(ovos_cmd.app, name="ovos", help="OVOS-интеграция")
-elif _tts == "rhasspy":
-    app.add_typer(rhasspy_cmd.app, name="rhasspy", help="Rhasspy-интеграция")
-else:
-    # корневые команды «нативного» профиля
-    app.add_typer(native.app, name="", help="Нативные команды (по умолчанию)")
 
 if __name__ == "__main__":
     app()
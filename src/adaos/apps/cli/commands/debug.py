@@ -0,0 +1,46 @@
+# src/adaos/apps/cli/commands/debug.py
+from __future__ import annotations
+import json
+from typing import List, Optional
+
+import typer
+
+from adaos.services.importtime import profile_command
+
+app = typer.Typer(help="Диагностика самого CLI (время импорта и т.п.)")
+
+
+@app.command("import-time")
+def import_time(
+    command: Optional[List[str]] = typer.Argument(None, help="Команда adaos для замера, например: skill list (по умолчанию --help)"),
+    top: int = typer.Option(20, "--top", "-n", help="Сколько самых медленных модулей показать"),
+    by: str = typer.Option("self", "--by", help="self | cumulative"),
+    as_json: bool = typer.Option(False, "--json", help="Вывод в JSON"),
+):
+    """Запустить команду с `python -X importtime` и показать самые медленные импорты."""
+    if by not in ("self", "cumulative"):
+        raise typer.BadParameter("--by must be self|cumulative")
+    args = list(command or ["--help"])
+    prof = profile_command(args)
+    slowest = prof.slowest(top, by=by)
+    if as_json:
+        typer.echo(
+            json.dumps(
+                {
+                    "command": args,
+                    "exit_code": prof.exit_code,
+                    "wall_ms": round(prof.wall_s * 1000, 1),
+                    "imports_ms": round(prof.total_us / 1000, 1),
+                    "modules": len(prof.timings),
+                    "slowest": [{"module": t.module, "self_ms": t.self_us / 1000, "cumulative_ms": t.cumulative_us / 1000} for t in slowest],
+                    "top_level": [{"module": t.module, "cumulative_ms": t.cumulative_us / 1000} for t in prof.top_level(top)],
+                },
+                ensure_ascii=False,
+                indent=2,
+            )
+        )
+        return
+    typer.echo(f"adaos {' '.join(args)}: wall {prof.wall_s * 1000:.0f} ms, imports {prof.total_us / 1000:.0f} ms ({len(prof.timings)} modules), exit={prof.exit_code}")
+    typer.echo(f"{'self ms':>9} {'cum ms':>9}  module")
+    for t in slowest:
+        typer.echo(f"{t.self_us / 1000:9.1f} {t.cumulative_us / 1000:9.1f}  {'  ' * t.depth}{t.module}")
@@ -1,4 +1,4 @@
-import typer, json, time, sys, requests
+import typer, json, os, time, sys, requests
 from pathlib import Path
 from adaos.services.agent_context import get_ctx
 from adaos.services.eventbus import emit
@@ -94,3 +94,32 @@ def ping():
     ctx = get_ctx()
     emit(ctx.bus, "cli.ping", {"ok": True}, "cli")
     typer.echo("event cli.ping sent")
+
+
+@app.command("metrics")
+def monitor_metrics(
+    url: str = typer.Option("http://127.0.0.1:8777/api/metrics", "--url", help="Адрес /api/metrics запущенного API"),
+    token: str = typer.Option(None, "--token", help="X-AdaOS-Token; иначе ADAOS_TOKEN или токен узла"),
+    prefix: str = typer.Option("", "--filter", "-f", help="Показать только метрики с этим префиксом имени"),
+    local: bool = typer.Option(False, "--local", help="Метрики текущего процесса CLI вместо запроса к API"),
+):
+    """Метрики (Prometheus text): задержка лупа, шина, инструменты, песочница, перезапуски процессов."""
+    from adaos.services.metrics import filter_exposition, render_prometheus
+
+    if local:
+        text = render_prometheus()
+    else:
+        if not token:
+            from adaos.apps.api.auth import _expected_token
+
+            token = os.getenv("ADAOS_TOKEN") or _expected_token()
+        try:
+            r = requests.get(url, headers={"X-AdaOS-Token": token}, timeout=10)
+        except requests.RequestException as e:
+            typer.echo(f"metrics: {url} unreachable: {e}", err=True)
+            raise typer.Exit(1)
+        if r.status_code != 200:
+            typer.echo(f"HTTP {r.status_code}: {r.text}", err=True)
+            raise typer.Exit(1)
+        text = r.text
+    typer.echo(filter_exposition(text, prefix) if prefix else text, nl=False)
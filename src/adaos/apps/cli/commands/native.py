@@ -4,10 +4,7 @@ from typing import Optional
 from pathlib import Path
 from adaos.apps.cli.i18n import _
 
-from adaos.adapters.audio.tts.native_tts import NativeTTS
-
-VoskSTT = None  # ленивый импорт
-from adaos.adapters.audio.stt.vosk_stt import VoskSTT
+# аудио-адаптеры (vosk, sounddevice, TTS-движки) импортируются внутри команд
 
 app = typer.Typer(help="Native (audio) commands")
 
@@ -41,15 +38,12 @@ def say(
     rate: int = typer.Option(None, "--rate", help="Скорость речи"),
     volume: float = typer.Option(None, "--volume", help="Громкость [0..1]"),
 ):
+    from adaos.adapters.audio.tts.native_tts import NativeTTS
+
     tts = NativeTTS(voice=voice, rate=rate, volume=volume, lang_hint=(lang or "").lower() or None)
     tts.say(text)
 
 
-import typer
-
-from adaos.adapters.audio.stt.vosk_stt import VoskSTT
-
-
 @app.command("start")
 def start(
     lang: str = typer.Option("en", "--lang", help="Язык"),
@@ -69,9 +63,8 @@ def start(
             from adaos.platform.android.mic_udp import AndroidMicUDP
 
             external = AndroidMicUDP().listen_stream()
-    global VoskSTT
-    if VoskSTT is None:
-        from adaos.adapters.audio.stt.vosk_stt import VoskSTT
+    from adaos.adapters.audio.stt.vosk_stt import VoskSTT
+
     stt = VoskSTT(model_path=model_path, samplerate=samplerate, device=device, lang=lang)
 
     tts = None
@@ -47,6 +47,7 @@ def run(
     # окружение
     inherit_env: bool = typer.Option(False, "--inherit-env/--no-inherit-env", help="Наследовать безопасную часть системного окружения"),
     env: List[str] = typer.Option([], "--env", help="Доп. переменные окружения KEY=VAL (можно многократно)"),
+    stream: bool = typer.Option(False, "--stream", help="Печатать вывод по мере появления"),
 ):
     """
     Запустить команду в sandbox с профилем лимитов/явными лимитами и безопасным окружением.
@@ -58,12 +59,13 @@ def run(
     if any(x is not None for x in (wall, cpu, rss)):
         limits = ExecLimits(wall_time_sec=wall, cpu_time_sec=cpu, max_rss_mb=rss)
 
-    res = ctx.sandbox.run(
-        shlex.split(cmd),
-        cwd=cwd,
-        profile=profile,
-        limits=limits,
-        inherit_env=inherit_env,
-        extra_env=_parse_kv(env),
-    )
+    kwargs = dict(cwd=cwd, profile=profile, limits=limits, inherit_env=inherit_env, extra_env=_parse_kv(env))
+    if stream:
+        out = ctx.sandbox.stream(shlex.split(cmd), **kwargs)
+        for item in out:
+            typer.echo(item.line, nl=False, err=item.stream == "stderr")
+        res = out.result
+        typer.echo(f"exit={res.exit_code} timed_out={res.timed_out} reason={res.killed_reason}")
+        return
+    res = ctx.sandbox.run(shlex.split(cmd), **kwargs)
     typer.echo(f"exit={res.exit_code} timed_out={res.timed_out} reason={res.killed_reason}" f"\n--- stdout ---\n{res.stdout}\n--- stderr ---\n{res.stderr}")
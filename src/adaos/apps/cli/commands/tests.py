@@ -10,6 +10,7 @@ from adaos.apps.cli.i18n import _
 from adaos.services.sandbox.bootstrap import ensure_dev_venv
 from adaos.services.agent_context import get_ctx
 from adaos.ports.sandbox import ExecLimits
+from adaos.services.tests.parallel import ShardResult, collect_test_dirs, run_parallel
 from adaos.sdk.skills import (
     push as push_skill,
     pull as pull_skill,
@@ -65,12 +66,7 @@ def _prepare_skills_repo(no_clone: bool) -> None:
 
 
 def _collect_test_dirs(root: Path) -> List[str]:
-    paths: List[str] = []
-    if root.is_dir():
-        for tdir in root.rglob("tests"):
-            if tdir.is_dir() and any(f.name.startswith("test_") and f.suffix == ".py" for f in tdir.rglob("test_*.py")):
-                paths.append(str(tdir))
-    return paths
+    return collect_test_dirs(root)
 
 
 def _drive_key(path_str: str) -> str:
@@ -82,7 +78,17 @@ def _drive_key(path_str: str) -> str:
 
 
 def _run_one_group(
-    ctx=None, *, base_dir: Path, venv_python: str, paths: list[str], addopts: str = "", py_exec: str, py_prefix: list[str], use_sandbox: bool  # ← опционально: AgentContext
+    ctx=None,
+    *,
+    base_dir: Path,
+    venv_python: str,
+    paths: list[str],
+    addopts: str = "",
+    py_exec: str,
+    py_prefix: list[str],
+    use_sandbox: bool,
+    junit_xml: Optional[str] = None,
+    limits: Optional[ExecLimits] = None,
 ) -> tuple[int, str, str]:
     """
     Запускает pytest внутри песочницы.
@@ -98,6 +104,7 @@ def _run_one_group(
         "--strict-markers",
         "-o",
         "markers=asyncio: mark asyncio tests",
+        *(["--junitxml", junit_xml] if junit_xml else []),
         *paths,
     ]
 
@@ -117,7 +124,7 @@ def _run_one_group(
     if addopts:
         extra_env["PYTEST_ADDOPTS"] = addopts
     cmd = [(venv_python or py_exec), *([] if venv_python else py_prefix), "-m", "pytest", *pytest_args]
-    return _sandbox_run(cmd, cwd=base_dir, extra_env=extra_env, use_sandbox=use_sandbox)
+    return _sandbox_run(cmd, cwd=base_dir, extra_env=extra_env, use_sandbox=use_sandbox, limits=limits)
 
 
 def _mk_sandbox(base_dir: Path, profile: str = "tool"):
@@ -196,7 +203,9 @@ def _run_direct(cmd: list[str], *, cwd: Path, extra_env: dict | None = None):
     return p.returncode, p.stdout, p.stderr
 
 
-def _sandbox_run(cmd: list[str], *, cwd: Path, profile: str = "tool", extra_env: dict | None = None, use_sandbox: bool = True):
+def _sandbox_run(
+    cmd: list[str], *, cwd: Path, profile: str = "tool", extra_env: dict | None = None, use_sandbox: bool = True, limits: Optional[ExecLimits] = None
+):
     """
     Универсальный запуск внутри песочницы:
     - авто-определяет сигнатуру ProcSandbox.run(...) и прокидывает только поддерживаемые kwargs
@@ -232,7 +241,7 @@ def _sandbox_run(cmd: list[str], *, cwd: Path, profile: str = "tool", extra_env:
     if "cwd" in params:
         kwargs["cwd"] = str(cwd)
     if "limits" in params and ExecLimits is not None:
-        kwargs["limits"] = ExecLimits(wall_time_sec=600)
+        kwargs["limits"] = limits or ExecLimits(wall_time_sec=600)
 
     # окружение
     if "env" in params:
@@ -320,6 +329,8 @@ def run_tests(
     sandbox: bool = typer.Option(False, "--sandbox/--no-sandbox", help="Run tests inside ProcSandbox"),
     python_spec: Optional[str] = typer.Option(None, "--python", help="Python to run tests with. Path to python.exe OR py-launcher spec like '3.11-64'. Overrides --use-current."),
     use_current: bool = typer.Option(True, "--use-current/--no-use-current", help="Use the same interpreter that's running this CLI (ideal for your current venv)."),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="Run test directories in N parallel sandboxed pytest processes (0 = CPU count)."),
+    junit_xml: Optional[str] = typer.Option(None, "--junit-xml", help="Write merged JUnit XML report (parallel mode)."),
     extra: Optional[List[str]] = typer.Argument(None),
 ):
     # 0) изоляция BASE
@@ -419,12 +430,48 @@ def run_tests(
         addopts_parts += extra
     addopts_str = " ".join(addopts_parts).strip()
 
+    interp = venv_python or py_exec
+    prefix = [] if venv_python else py_prefix
+
+    # 5a) Параллельный режим: каждый каталог tests/ — отдельный pytest, N одновременно
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 or junit_xml:
+        tool = getattr(ctx.sandbox, "profiles", {}).get("tool") or ExecLimits()
+        # CPU/RSS — из профиля tool; wall-time как у обычного прогона: набор тестов навыка дольше вызова инструмента
+        shard_limits = ExecLimits(wall_time_sec=600, cpu_time_sec=tool.cpu_time_sec, max_rss_mb=tool.max_rss_mb)
+
+        def _shard(paths: list[str], junit: str) -> tuple[int, str, str]:
+            code, out, err = _run_one_group(
+                ctx=ctx,
+                base_dir=base_dir,
+                venv_python=interp,
+                paths=paths,
+                addopts=addopts_str,
+                py_exec=interp,
+                py_prefix=prefix,
+                use_sandbox=sandbox,
+                junit_xml=junit,
+                limits=shard_limits if sandbox else None,
+            )
+            return code, out, err
+
+        def _report(res: ShardResult) -> None:
+            color = typer.colors.CYAN if res.exit_code in (0, 5) else typer.colors.RED
+            typer.secho(f"[pytest {res.paths[0]}] exit={res.exit_code} {res.duration:.1f}s", fg=color)
+            if res.exit_code not in (0, 5):
+                typer.echo(f"--- stdout ---\n{res.stdout}\n--- stderr ---\n{res.stderr}")
+
+        result = run_parallel(pytest_paths, _shard, jobs=jobs, kv=ctx.kv, junit_xml=junit_xml, on_done=_report)
+        typer.secho(
+            f"[AdaOS] {len(result.shards)} test dirs, jobs={jobs}: wall {result.wall_s:.1f}s, sequential {result.busy_s:.1f}s"
+            + (f", junit: {result.junit_xml}" if result.junit_xml else ""),
+            fg=typer.colors.BLUE,
+        )
+        raise typer.Exit(code=0 if result.exit_code == 5 else result.exit_code)
+
     # 5) Прогон по группам (каждую — через venv_python)
     overall_code = 0
     for dk, paths in grouped.items():
-        interp = venv_python or py_exec
-        prefix = [] if venv_python else py_prefix
-
         code, out, err = _run_one_group(
             ctx=ctx,
             base_dir=base_dir,
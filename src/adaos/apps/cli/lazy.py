@@ -0,0 +1,78 @@
+# src/adaos/apps/cli/lazy.py
+# ленивый реестр подкоманд Typer: модуль команды импортируется, только когда её вызывают
+from __future__ import annotations
+import importlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+import typer
+from typer.core import TyperCommand, TyperGroup
+
+
+@dataclass(frozen=True)
+class LazyCommand:
+    """
+    ``target`` — "модуль:атрибут" с приложением Typer. Без ``command`` приложение подключается
+    группой (как add_typer), с ``command`` — в корень берётся одна его команда (как add_typer(name="")).
+    ``help`` показывается в списке команд без импорта модуля.
+    """
+
+    target: str
+    help: Optional[str] = None
+    command: Optional[str] = None
+
+
+class LazyTyperGroup(TyperGroup):
+    """Корневая группа CLI: команды из ``lazy_commands`` собираются при первом обращении."""
+
+    lazy_commands: Dict[str, LazyCommand] = {}
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._listing = False
+
+    def list_commands(self, ctx: Any) -> List[str]:
+        names = super().list_commands(ctx)
+        return names + [n for n in self.lazy_commands if n not in self.commands]
+
+    def get_command(self, ctx: Any, cmd_name: str) -> Any:
+        cmd = self.commands.get(cmd_name)
+        if cmd is not None:
+            return cmd
+        entry = self.lazy_commands.get(cmd_name)
+        if entry is None:
+            return None
+        if self._listing:
+            # в справке нужна только строка описания — модуль не импортируем
+            return TyperCommand(name=cmd_name, help=entry.help, short_help=entry.help)
+        cmd = self.commands[cmd_name] = self._load(cmd_name, entry)
+        return cmd
+
+    @staticmethod
+    def _load(name: str, entry: LazyCommand) -> Any:
+        module_name, _, attr = entry.target.partition(":")
+        sub_app = getattr(importlib.import_module(module_name), attr or "app")
+        group = typer.main.get_group(sub_app)
+        if entry.command is not None:
+            return group.commands[entry.command]
+        group.name = name
+        if entry.help:
+            group.help = entry.help
+        return group
+
+    @contextmanager
+    def _help_listing(self) -> Iterator[None]:
+        self._listing = True
+        try:
+            yield
+        finally:
+            self._listing = False
+
+    def format_help(self, ctx: Any, formatter: Any) -> None:
+        with self._help_listing():
+            return super().format_help(ctx, formatter)
+
+    def shell_complete(self, ctx: Any, incomplete: str) -> Any:
+        with self._help_listing():
+            return super().shell_complete(ctx, incomplete)
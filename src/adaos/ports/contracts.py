@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Protocol, Iterable, Mapping, Any, Callable
+from typing import Protocol, Iterable, Iterator, Mapping, Any, Callable
 from adaos.domain import Event, ProcessSpec, SkillId
 
 class EventBus(Protocol):
@@ -23,9 +23,14 @@ class Devices(Protocol):
 
 class KV(Protocol):
     def get(self, key: str, default: Any = None) -> Any: ...
-    def set(self, key: str, value: Any) -> None: ...
+    def set(self, key: str, value: Any, *, ttl: float | None = None) -> None: ...
     def delete(self, key: str) -> None: ...
-    def list(self, prefix: str = "") -> list[str]: ...
+    def list(self, prefix: str = "", *, limit: int | None = None, cursor: str | None = None) -> list[str]: ...
+    def iter_keys(self, prefix: str = "", *, batch: int = 500) -> Iterator[str]: ...
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]: ...
+    def set_many(self, items: Mapping[str, Any], *, ttl: float | None = None) -> None: ...
+    def delete_many(self, keys: Iterable[str]) -> None: ...
+    def flush(self) -> int: ...
 
 class SQL(Protocol):
     def connect(self) -> Any: ...
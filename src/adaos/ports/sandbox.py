@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Protocol, Mapping, Sequence, Optional
+from typing import Callable, Protocol, Mapping, Sequence, Optional
 
 
 @dataclass
@@ -17,6 +17,8 @@ class ExecResult:
     stderr: str
     timed_out: bool
     killed_reason: Optional[str] = None
+    stdout_truncated: bool = False  # вывод превысил max_capture и сохранён только хвост
+    stderr_truncated: bool = False
 
 
 class Sandbox(Protocol):
@@ -29,4 +31,6 @@ class Sandbox(Protocol):
         limits: Optional[ExecLimits] = None,
         stdin: Optional[bytes] = None,
         text: bool = True,
+        on_output: Optional[Callable[[str, str], None]] = None,  # (stream, line) по мере появления
+        max_capture: Optional[int] = None,  # хранить не больше N последних символов каждого потока
     ) -> ExecResult: ...
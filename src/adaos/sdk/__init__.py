@@ -1,8 +1,33 @@
-"""AdaOS SDK public facade."""
+"""AdaOS SDK public facade.
+
+Subpackages are imported on first attribute access (PEP 562), so importing a
+single module such as ``adaos.sdk.i18n`` does not pull in the whole SDK.
+"""
 
 from __future__ import annotations
 
-from . import data, manage
-from .core.validation.skill import validate_self
+import importlib
+from typing import TYPE_CHECKING, Any
 
 __all__ = ["data", "manage", "validate_self"]
+
+if TYPE_CHECKING:
+    from . import data, manage
+    from .core.validation.skill import validate_self
+
+
+def __getattr__(name: str) -> Any:
+    if name in ("data", "manage"):
+        module = importlib.import_module(f"{__name__}.{name}")
+        globals()[name] = module
+        return module
+    if name == "validate_self":
+        from .core.validation.skill import validate_self
+
+        globals()[name] = validate_self
+        return validate_self
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
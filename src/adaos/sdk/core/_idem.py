@@ -7,6 +7,9 @@ from typing import Any, Mapping, MutableMapping
 
 from .errors import SdkRuntimeNotInitialized
 
+# idempotency records only need to outlive client retries
+DEFAULT_TTL_S = 7 * 24 * 3600
+
 
 def _ensure_kv(ctx: Any) -> Any:
     kv = getattr(ctx, "kv", None)
@@ -35,14 +38,30 @@ def load(ctx: Any, namespace: str, request_id: str) -> Mapping[str, Any] | None:
     return kv.get(key)
 
 
-def save(ctx: Any, namespace: str, request_id: str, payload: Mapping[str, Any] | MutableMapping[str, Any]) -> Mapping[str, Any]:
-    """Persist ``payload`` under the idempotency namespace and return it."""
+def save(
+    ctx: Any,
+    namespace: str,
+    request_id: str,
+    payload: Mapping[str, Any] | MutableMapping[str, Any],
+    *,
+    ttl: float | None = DEFAULT_TTL_S,
+) -> Mapping[str, Any]:
+    """Persist ``payload`` under the idempotency namespace and return it.
+
+    Records expire after ``ttl`` seconds when the KV backend supports TTL.
+    """
 
     kv = _ensure_kv(ctx)
     record = dict(payload)
     record.setdefault("request_id", request_id)
     record.setdefault("stored_at", _iso_now())
     key = _key(namespace, request_id)
+    if ttl is not None:
+        try:
+            kv.set(key, record, ttl=ttl)
+            return record
+        except TypeError:
+            pass
     kv.set(key, record)
     return record
 
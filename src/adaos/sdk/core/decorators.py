@@ -12,6 +12,7 @@ emits_map: Dict[str, set[str]] = {}  # qualname -> {topics}
 _registered: bool = False  # внутренняя защита от двойной регистрации
 _SUBSCRIPTIONS = subscriptions
 _TOOLS = tools_registry
+_EXECUTION_POLICIES = {"inline", "thread", "process"}
 
 
 def subscribe(topic: str):
@@ -56,8 +57,24 @@ def tool(
     version: Optional[str] = None,
     input_schema: Optional[dict] = None,
     output_schema: Optional[dict] = None,
+    execution: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
 ):
-    """Маркер инструмента с публичным именем и метаданными."""
+    """Маркер инструмента с публичным именем и метаданными.
+
+    ``execution`` — где исполнять при вызове через HTTP-мост: "inline" (в event loop),
+    "thread" (пул потоков) или "process" (пул процессов); по умолчанию async-инструменты
+    идут inline, sync — в пул потоков. ``max_concurrency`` ограничивает число одновременных вызовов.
+
+    Инструмент с "process" исполняется в отдельном процессе: аргументы и результат должны
+    пиклиться, AgentContext там собирается заново из настроек родителя, текущий навык —
+    владелец модуля; изменения контекста в воркере в родителя не возвращаются.
+    """
+
+    if execution is not None and execution not in _EXECUTION_POLICIES:
+        raise ValueError(f"execution must be one of {sorted(_EXECUTION_POLICIES)}")
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError("max_concurrency must be >= 1")
 
     def deco(fn: Callable):
         name = public_name or fn.__name__
@@ -75,6 +92,8 @@ def tool(
             "version": version,
             "input_schema": input_schema,
             "output_schema": output_schema,
+            "execution": execution,
+            "max_concurrency": max_concurrency,
         }
         return fn
 
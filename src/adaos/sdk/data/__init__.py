@@ -2,17 +2,65 @@
 
 from __future__ import annotations
 
-from .bus import BusNotAvailable, emit, get_meta, on
-from .context import clear_current_skill, get_current_skill, set_current_skill
-from .env import get_audio_out_backend, get_stt_backend, get_tts_backend
-from .events import publish
-from .fs import open as open  # noqa: A001 - re-export for convenience
-from .fs import save_bytes, tmp_path
-from .i18n import I18n, _
-from .memory import delete, get, list, put
-from .secrets import read, write
-from .skill_memory import get as skill_memory_get
-from .skill_memory import set as skill_memory_set
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# name -> (submodule, attribute); resolved on first access (PEP 562) so that importing
+# one helper module (e.g. ``adaos.sdk.data.i18n``) does not import the whole data plane
+_EXPORTS = {
+    "BusNotAvailable": ("bus", "BusNotAvailable"),
+    "emit": ("bus", "emit"),
+    "get_meta": ("bus", "get_meta"),
+    "on": ("bus", "on"),
+    "clear_current_skill": ("context", "clear_current_skill"),
+    "get_current_skill": ("context", "get_current_skill"),
+    "set_current_skill": ("context", "set_current_skill"),
+    "get_audio_out_backend": ("env", "get_audio_out_backend"),
+    "get_stt_backend": ("env", "get_stt_backend"),
+    "get_tts_backend": ("env", "get_tts_backend"),
+    "publish": ("events", "publish"),
+    "open": ("fs", "open"),
+    "save_bytes": ("fs", "save_bytes"),
+    "tmp_path": ("fs", "tmp_path"),
+    "I18n": ("i18n", "I18n"),
+    "_": ("i18n", "_"),
+    "delete": ("memory", "delete"),
+    "get": ("memory", "get"),
+    "list": ("memory", "list"),
+    "put": ("memory", "put"),
+    "read": ("secrets", "read"),
+    "write": ("secrets", "write"),
+    "skill_memory_get": ("skill_memory", "get"),
+    "skill_memory_set": ("skill_memory", "set"),
+}
+
+if TYPE_CHECKING:
+    from .bus import BusNotAvailable, emit, get_meta, on
+    from .context import clear_current_skill, get_current_skill, set_current_skill
+    from .env import get_audio_out_backend, get_stt_backend, get_tts_backend
+    from .events import publish
+    from .fs import open as open  # noqa: A001 - re-export for convenience
+    from .fs import save_bytes, tmp_path
+    from .i18n import I18n, _
+    from .memory import delete, get, list, put
+    from .secrets import read, write
+    from .skill_memory import get as skill_memory_get
+    from .skill_memory import set as skill_memory_set
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attr = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     "BusNotAvailable",
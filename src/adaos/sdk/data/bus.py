@@ -5,7 +5,7 @@ from __future__ import annotations
 import inspect
 import time
 from types import SimpleNamespace
-from typing import Any, Awaitable, Callable
+from typing import Any, Awaitable, Callable, Dict, Tuple
 
 from adaos.sdk.core._ctx import require_ctx
 
@@ -16,6 +16,16 @@ class BusNotAvailable(RuntimeError):
     """Raised when the runtime context does not provide an event bus."""
 
 
+# publish(topic, payload, source, ts, extra_meta) -> result
+PublishAdapter = Callable[[str, dict, str, float, Dict[str, Any]], Any]
+SubscribeAdapter = Callable[[str, Callable[[Any], Awaitable[Any]]], Any]
+
+_CACHE_LIMIT = 64
+# (id(bus), underlying function) -> (bus, adapter); the bus is kept to rule out id() reuse
+_PUBLISH_ADAPTERS: Dict[Tuple[int, Any], Tuple[Any, PublishAdapter]] = {}
+_SUBSCRIBE_ADAPTERS: Dict[Tuple[int, Any], Tuple[Any, SubscribeAdapter]] = {}
+
+
 def _bus() -> Any:
     ctx = require_ctx("sdk.data.bus")
     bus = getattr(ctx, "bus", None)
@@ -33,21 +43,32 @@ def _positional_params(fn: Callable[..., Any]) -> int:
     return sum(1 for i, p in enumerate(params) if i > 0 and p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD))
 
 
-def get_meta(payload: dict) -> dict:
-    return payload.get("_meta", {}) if isinstance(payload, dict) else {}
+def _cache_key(bus: Any, fn: Any) -> Tuple[int, Any]:
+    return id(bus), getattr(fn, "__func__", fn)
 
 
-async def emit(topic: str, payload: dict, **kw: Any):
-    bus = _bus()
-    publish = getattr(bus, "publish")
+def _cached(cache: Dict[Tuple[int, Any], Tuple[Any, Any]], bus: Any, fn: Any, build: Callable[[Any], Any]) -> Any:
+    key = _cache_key(bus, fn)
+    hit = cache.get(key)
+    if hit is not None and hit[0] is bus:
+        return hit[1]
+    adapter = build(fn)
+    if len(cache) >= _CACHE_LIMIT:
+        cache.clear()
+    cache[key] = (bus, adapter)
+    return adapter
 
-    source = kw.pop("source", "")
-    ts = float(kw.pop("ts", time.time()))
-    extra_meta = dict(kw)
 
-    pp = dict(payload) if isinstance(payload, dict) else {"value": payload}
-    if extra_meta:
-        pp["_meta"] = {**pp.get("_meta", {}), **extra_meta}
+def _event_factory() -> Callable[..., Any]:
+    try:
+        from adaos.domain.types import Event as DomainEvent
+    except Exception:
+        return SimpleNamespace
+    return DomainEvent
+
+
+def _build_publish_adapter(publish: Callable[..., Any]) -> PublishAdapter:
+    """Resolve the calling convention of ``publish`` once and return a specialised callable."""
 
     npos = _positional_params(publish)
     try:
@@ -57,68 +78,110 @@ async def emit(topic: str, payload: dict, **kw: Any):
 
     if npos >= 2:
         if sig and any(p.kind is inspect.Parameter.VAR_KEYWORD for p in sig.parameters.values()):
-            res = publish(topic, pp, source=source, ts=ts, **extra_meta)
-        else:
-            allowed = {}
-            if sig:
-                for name in ("source", "ts"):
-                    if name in sig.parameters:
-                        allowed[name] = locals()[name]
+
+            def _publish_kw(topic: str, pp: dict, source: str, ts: float, extra_meta: Dict[str, Any]) -> Any:
+                return publish(topic, pp, source=source, ts=ts, **extra_meta)
+
+            return _publish_kw
+
+        want_source = bool(sig and "source" in sig.parameters)
+        want_ts = bool(sig and "ts" in sig.parameters)
+
+        def _publish_topic(topic: str, pp: dict, source: str, ts: float, extra_meta: Dict[str, Any]) -> Any:
+            allowed: Dict[str, Any] = {}
+            if want_source:
+                allowed["source"] = source
+            if want_ts:
+                allowed["ts"] = ts
             try:
-                res = publish(topic, pp, **allowed)
+                return publish(topic, pp, **allowed)
             except TypeError:
-                res = publish(topic, pp)
-        if inspect.iscoroutine(res):
-            return await res
-        return res
+                return publish(topic, pp)
 
-    try:
-        from adaos.domain.types import Event as DomainEvent
+        return _publish_topic
 
-        event = DomainEvent(type=topic, payload=pp, source=source, ts=ts)
-    except Exception:
-        event = SimpleNamespace(type=topic, payload=pp, source=source, ts=ts)
+    make_event = _event_factory()
+
+    def _publish_event(topic: str, pp: dict, source: str, ts: float, extra_meta: Dict[str, Any]) -> Any:
+        try:
+            return publish(make_event(type=topic, payload=pp, source=source, ts=ts))
+        except TypeError:
+            return publish(topic, pp)
 
+    return _publish_event
+
+
+def _build_subscribe_adapter(subscribe: Callable[..., Any]) -> SubscribeAdapter:
     try:
-        res = publish(event)
-    except TypeError:
-        res = publish(topic, pp)
+        sig = inspect.signature(subscribe)
+    except (TypeError, ValueError):
+        sig = None
 
+    if sig and len(sig.parameters) >= 3:
+        return lambda topic, fn: subscribe(topic, fn)
+
+    def _subscribe_compat(topic: str, fn: Callable[[Any], Awaitable[Any]]) -> Any:
+        try:
+            return subscribe(fn)
+        except TypeError:
+            try:
+                return subscribe(topic=topic, handler=fn)
+            except TypeError:
+                return subscribe(topic, fn)
+
+    return _subscribe_compat
+
+
+def _publish_adapter(bus: Any) -> PublishAdapter:
+    """Cached publish adapter for ``bus`` (calling convention resolved once per bus object)."""
+
+    return _cached(_PUBLISH_ADAPTERS, bus, getattr(bus, "publish"), _build_publish_adapter)
+
+
+def get_meta(payload: dict) -> dict:
+    return payload.get("_meta", {}) if isinstance(payload, dict) else {}
+
+
+async def emit(topic: str, payload: dict, **kw: Any):
+    bus = _bus()
+
+    source = kw.pop("source", "")
+    ts = float(kw.pop("ts", time.time()))
+    extra_meta = kw
+
+    pp = dict(payload) if isinstance(payload, dict) else {"value": payload}
+    if extra_meta:
+        pp["_meta"] = {**pp.get("_meta", {}), **extra_meta}
+
+    res = _publish_adapter(bus)(topic, pp, source, ts, extra_meta)
     if inspect.iscoroutine(res):
         return await res
     return res
 
 
+def _unwrap(ev: Any) -> Any:
+    if hasattr(ev, "payload"):
+        return getattr(ev, "payload")
+    if isinstance(ev, dict) and "payload" in ev and "type" in ev:
+        return ev.get("payload")
+    return ev
+
+
 async def on(topic: str, handler: Callable[[dict], Awaitable[Any]]):
     bus = _bus()
     subscribe = getattr(bus, "subscribe")
 
-    async def _adapt(ev):
-        if hasattr(ev, "payload"):
-            data = getattr(ev, "payload")
-        elif isinstance(ev, dict) and "payload" in ev and "type" in ev:
-            data = ev.get("payload")
-        else:
-            data = ev
-        if inspect.iscoroutinefunction(handler):
-            return await handler(data)
-        return handler(data)
+    if inspect.iscoroutinefunction(handler):
 
-    try:
-        sig = inspect.signature(subscribe)
-    except (TypeError, ValueError):
-        sig = None
+        async def _adapt(ev):
+            return await handler(_unwrap(ev))
 
-    if sig and len(sig.parameters) >= 3:
-        res = subscribe(topic, _adapt)
     else:
-        try:
-            res = subscribe(_adapt)
-        except TypeError:
-            try:
-                res = subscribe(topic=topic, handler=_adapt)
-            except TypeError:
-                res = subscribe(topic, _adapt)
+
+        async def _adapt(ev):
+            return handler(_unwrap(ev))
+
+    res = _cached(_SUBSCRIBE_ADAPTERS, bus, subscribe, _build_subscribe_adapter)(topic, _adapt)
 
     if inspect.iscoroutine(res):
         return await res
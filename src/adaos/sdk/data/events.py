@@ -5,12 +5,15 @@ from __future__ import annotations
 import asyncio
 import inspect
 import time
-from types import SimpleNamespace
-from typing import Any, Mapping
+from typing import Any, Callable, Dict, Mapping, Tuple
 
 from adaos.sdk.core._ctx import require_ctx
 
-from .bus import BusNotAvailable
+from .bus import BusNotAvailable, _cached, _event_factory
+
+# publish(topic, data, source, ts) -> result
+_EventsPublisher = Callable[[str, Dict[str, Any], str, float], Any]
+_PUBLISHERS: Dict[Tuple[int, Any], Tuple[Any, _EventsPublisher]] = {}
 
 
 def _ensure_bus(ctx: Any):
@@ -18,14 +21,49 @@ def _ensure_bus(ctx: Any):
     publish = getattr(bus, "publish", None)
     if publish is None:
         raise BusNotAvailable("Event bus is not available in current context")
-    return publish
+    return bus, publish
+
+
+def _build_publisher(publish_fn: Callable[..., Any]) -> _EventsPublisher:
+    """Resolve the backend calling convention once per bus object."""
+
+    try:
+        sig = inspect.signature(publish_fn)
+    except (TypeError, ValueError):  # pragma: no cover - exotic backends
+        sig = None
+    want_source = bool(sig and "source" in sig.parameters)
+    want_ts = bool(sig and "ts" in sig.parameters)
+    make_event = _event_factory()
+
+    def _publish_event(topic: str, data: Dict[str, Any], source: str, ts: float) -> Any:
+        return publish_fn(make_event(type=topic, payload=data, source=source, ts=ts))
+
+    # single positional parameter means publish(event): build the Event directly instead of hitting TypeError per call
+    if sig is not None:
+        kinds = [p.kind for p in sig.parameters.values()]
+        positional = sum(1 for k in kinds if k in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD))
+        if positional == 1 and inspect.Parameter.VAR_POSITIONAL not in kinds:
+            return _publish_event
+
+    def _publish_topic(topic: str, data: Dict[str, Any], source: str, ts: float) -> Any:
+        kwargs: Dict[str, Any] = {}
+        if want_source:
+            kwargs["source"] = source
+        if want_ts:
+            kwargs["ts"] = ts
+        try:
+            return publish_fn(topic, data, **kwargs)
+        except TypeError:
+            return _publish_event(topic, data, source, ts)
+
+    return _publish_topic
 
 
 def publish(topic: str, payload: Mapping[str, Any] | None = None, **meta: Any) -> Any:
     """Publish an event via the runtime event bus."""
 
     ctx = require_ctx("sdk.events.publish")
-    publish_fn = _ensure_bus(ctx)
+    bus, publish_fn = _ensure_bus(ctx)
 
     data = dict(payload or {})
     extra_meta = {k: v for k, v in meta.items() if k not in {"source", "ts"}}
@@ -37,28 +75,7 @@ def publish(topic: str, payload: Mapping[str, Any] | None = None, **meta: Any) -
     source = str(meta.get("source", ""))
     ts = float(meta.get("ts", time.time()))
 
-    try:
-        sig = inspect.signature(publish_fn)
-    except (TypeError, ValueError):  # pragma: no cover - exotic backends
-        sig = None
-
-    kwargs: dict[str, Any] = {}
-    if sig:
-        if "source" in sig.parameters:
-            kwargs["source"] = source
-        if "ts" in sig.parameters:
-            kwargs["ts"] = ts
-
-    try:
-        result = publish_fn(topic, data, **kwargs)
-    except TypeError:
-        try:
-            from adaos.domain.types import Event as DomainEvent
-
-            event = DomainEvent(type=topic, payload=data, source=source, ts=ts)
-        except Exception:  # pragma: no cover - fallback path
-            event = SimpleNamespace(type=topic, payload=data, source=source, ts=ts)
-        result = publish_fn(event)
+    result = _cached(_PUBLISHERS, bus, publish_fn, _build_publisher)(topic, data, source, ts)
 
     if inspect.isawaitable(result):
         try:
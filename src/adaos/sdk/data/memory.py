@@ -58,23 +58,27 @@ def delete(key: str) -> None:
     ctx.kv.delete(_qualified_key(key))
 
 
-def list(prefix: str = "") -> List[str]:
+def list(prefix: str = "", *, limit: int | None = None, cursor: str | None = None) -> List[str]:
+    """Keys of the current skill namespace starting with ``prefix`` (relative to the namespace).
+
+    ``limit``/``cursor`` page through large namespaces; ``cursor`` is the last key of the
+    previous page as returned here.
+    """
+
     ctx = require_ctx("sdk.memory.list")
     qualified_prefix = _qualified_prefix(prefix)
-    if hasattr(ctx.kv, "list"):
-        keys: Iterable[str] = ctx.kv.list(prefix=qualified_prefix)  # type: ignore[arg-type]
-    else:
+    if not hasattr(ctx.kv, "list"):
         raise NotImplementedError("KV backend does not support list() operation")
 
     scope_prefix = f"{_namespace()}/"
-    result: List[str] = []
-    for full_key in keys:
-        if not isinstance(full_key, str):
-            continue
-        if not full_key.startswith(scope_prefix):
-            continue
-        result.append(full_key[len(scope_prefix) :])
-    return result
+    if limit is None and cursor is None:
+        keys: Iterable[str] = ctx.kv.list(prefix=qualified_prefix)  # type: ignore[arg-type]
+    else:
+        after = f"{scope_prefix}{_normalize_fragment(cursor)}" if cursor else None
+        keys = ctx.kv.list(prefix=qualified_prefix, limit=limit, cursor=after)  # type: ignore[call-arg]
+    # the backend already returns keys under ``qualified_prefix`` (a sub-prefix of the scope)
+    cut = len(scope_prefix)
+    return [full_key[cut:] for full_key in keys if isinstance(full_key, str)]
 
 
 __all__ = ["get", "put", "delete", "list"]
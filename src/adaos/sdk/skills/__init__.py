@@ -87,10 +87,19 @@ def install_all(limit: Optional[int] = None) -> List[str]:
         names = names[:limit]
 
     ok: List[str] = []
+    fetched: List[str] = []
     for n in names:
         try:
-            m.install(n)
+            res = m.install(n, validate=False)
             ok.append(n)
+            if isinstance(res, tuple):
+                fetched.append(n)
         except Exception:
             continue
+    # валидируем разом: один интерпретатор на все навыки, неизменённые — из кэша
+    if fetched:
+        try:
+            m.validate_many(fetched)
+        except Exception:
+            pass
     return ok
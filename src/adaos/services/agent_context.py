@@ -10,10 +10,7 @@ from adaos.ports.paths import PathProvider
 from adaos.ports.fs import FSPolicy
 from adaos.ports.sandbox import Sandbox
 
-from adaos.adapters.skills.git_repo import GitSkillRepository
-from adaos.adapters.scenarios.git_repo import GitScenarioRepository
 from adaos.ports.skill_context import SkillContextPort
-from adaos.adapters.sdk.inproc_skill_context import InprocSkillContext
 from contextvars import ContextVar
 from contextlib import contextmanager
 
@@ -50,6 +47,8 @@ def use_ctx(ctx: AgentContext):
 
 if TYPE_CHECKING:
     from adaos.services.i18n.service import I18nService
+    from adaos.adapters.skills.git_repo import GitSkillRepository
+    from adaos.adapters.scenarios.git_repo import GitScenarioRepository
 
 
 @dataclass(slots=True)
@@ -79,6 +78,8 @@ class AgentContext:
     def skills_repo(self) -> GitSkillRepository:
         repo = self._skills_repo
         if repo is None:
+            from adaos.adapters.skills.git_repo import GitSkillRepository  # yaml и git-адаптеры — по требованию
+
             repo = GitSkillRepository(
                 paths=self.paths,
                 git=self.git,
@@ -93,6 +94,8 @@ class AgentContext:
     def scenarios_repo(self) -> GitScenarioRepository:
         repo = self._scenarios_repo
         if repo is None:
+            from adaos.adapters.scenarios.git_repo import GitScenarioRepository
+
             repo = GitScenarioRepository(
                 paths=self.paths,
                 git=self.git,
@@ -106,6 +109,8 @@ class AgentContext:
     def skill_ctx(self) -> SkillContextPort:
         port = self._skill_ctx_port
         if port is None:
+            from adaos.adapters.sdk.inproc_skill_context import InprocSkillContext
+
             port = InprocSkillContext()
             object.__setattr__(self, "_skill_ctx_port", port)
         return port
@@ -118,6 +123,8 @@ class AgentContext:
     def i18n(self) -> I18nService:
         svc = self._i18n
         if svc is None:
+            from adaos.services.i18n.service import I18nService
+
             svc = I18nService(self)
             object.__setattr__(self, "_i18n", svc)
         return svc
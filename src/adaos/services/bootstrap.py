@@ -123,6 +123,10 @@ class BootstrapService:
 
         await register_subscriptions()
         await bus.emit("sys.bus.ready", {}, source="lifecycle", actor="system")
+        # ленивый загрузчик: код навыков импортируется в фоне, готовность его не ждёт
+        warmup = getattr(self.skills_loader, "warmup", None)
+        if warmup is not None:
+            self._boot_tasks.append(asyncio.create_task(warmup(), name="adaos-skills-warmup"))
         if conf.role == "hub":
             await bus.emit("net.subnet.hub.ready", {"subnet_id": conf.subnet_id}, source="lifecycle", actor="system")
 
@@ -157,6 +161,20 @@ class BootstrapService:
         self._booted = False
         self._ready.clear()
         await bus.emit("sys.stopped", {}, source="lifecycle", actor="system")
+        # асинхронная шина: доставляем хвост очередей до выхода
+        drain = getattr(self.ctx.bus, "drain", None)
+        if drain is not None:
+            await drain(timeout=5.0)
+        # KV в режиме write-behind: буфер должен попасть на диск до остановки
+        flush = getattr(self.ctx.kv, "flush", None)
+        if flush is not None:
+            await asyncio.to_thread(flush)
+        # тёплые воркеры песочницы не должны пережить остановку; ленивую песочницу,
+        # которую так и не собрали, ради этого не строим
+        sandbox = self.ctx.sandbox
+        close_workers = getattr(sandbox, "close_workers", None) if getattr(sandbox, "built", True) else None
+        if close_workers is not None:
+            await asyncio.to_thread(close_workers)
 
     async def switch_role(self, app: Any, role: str, *, hub_url: str | None = None, subnet_id: str | None = None) -> NodeConfig:
         prev = load_config(ctx=self.ctx)
@@ -175,6 +193,7 @@ class BootstrapService:
 # --- модульные фасады (синглтон) ---
 from adaos.services.heartbeat_requests import RequestsHeartbeat
 from adaos.services.skills_loader_importlib import ImportlibSkillsLoader
+from adaos.services.skills_loader_lazy import LazySkillsLoader
 from adaos.services.subnet_registry_mem import get_subnet_registry
 
 _SERVICE: BootstrapService | None = None
@@ -184,7 +203,12 @@ def _svc() -> BootstrapService:
     global _SERVICE
     if _SERVICE is None:
         ctx = get_ctx()
-        _SERVICE = BootstrapService(ctx, heartbeat=RequestsHeartbeat(), skills_loader=ImportlibSkillsLoader(), subnet_registry=get_subnet_registry())
+        settings = ctx.settings
+        if getattr(settings, "skills_lazy_load", True):
+            loader: SkillsLoaderPort = LazySkillsLoader(sql=ctx.sql, bus=ctx.bus, warmup_workers=getattr(settings, "skills_warmup_workers", 4))
+        else:
+            loader = ImportlibSkillsLoader(sql=ctx.sql)
+        _SERVICE = BootstrapService(ctx, heartbeat=RequestsHeartbeat(), skills_loader=loader, subnet_registry=get_subnet_registry())
     return _SERVICE
 
 
@@ -1,15 +1,61 @@
 from __future__ import annotations
 import asyncio
+import itertools
+import logging
+import threading
 import time
-from collections import defaultdict
+from collections import deque
+from enum import Enum
 from threading import RLock
-from typing import Callable, Awaitable, Any, DefaultDict, List
+from typing import Callable, Awaitable, Any, Deque, Dict, List, Optional, Tuple
 
 from adaos.domain import Event
 from adaos.ports import EventBus
+from adaos.services.metrics import Histogram, MetricsRegistry
 
 Handler = Callable[[Event], Any] | Callable[[Event], Awaitable[Any]]
 
+# (порядковый номер префикса, обработчики) — порядок номера = порядок первой подписки
+_Entry = Tuple[int, Tuple[Handler, ...]]
+
+_WILDCARDS = frozenset(("", "*"))
+
+
+class _Node:
+    """Узел префиксного дерева по сегментам топика (разделитель — точка)."""
+
+    __slots__ = ("children", "partials")
+
+    def __init__(self, children: Optional[Dict[str, "_Node"]] = None, partials: Optional[Dict[str, _Entry]] = None) -> None:
+        # полный сегмент -> дочерний узел
+        self.children: Dict[str, _Node] = children if children is not None else {}
+        # хвост префикса (незавершённый сегмент, "" = любой следующий сегмент) -> подписчики
+        self.partials: Dict[str, _Entry] = partials if partials is not None else {}
+
+    def copy(self) -> "_Node":
+        return _Node(dict(self.children), dict(self.partials))
+
+
+class _Snapshot:
+    """Неизменяемый снимок подписок: читается в publish без блокировок."""
+
+    __slots__ = ("root", "wild")
+
+    def __init__(self, root: _Node, wild: Tuple[_Entry, ...]) -> None:
+        self.root = root
+        self.wild = wild
+
+
+def _split_prefix(prefix: str) -> Tuple[List[str], str]:
+    """'a.b.c' -> (['a', 'b'], 'c'); 'a.b.' -> (['a', 'b'], '')."""
+    parts = prefix.split(".")
+    return parts[:-1], parts[-1]
+
+
+def _topic_prefix(topic: str) -> str:
+    # метка метрик — первый сегмент топика, чтобы число серий не росло с числом топиков
+    return topic.partition(".")[0] or "-"
+
 
 class LocalEventBus(EventBus):
     """
@@ -19,30 +65,411 @@ class LocalEventBus(EventBus):
     Особенности:
       * prefix = "" или "*" — подписка на всё.
       * Асинхендлеры исполняются через running loop (или блокирующе, если лупа нет).
+      * Подписки хранятся в префиксном дереве по сегментам топика; publish читает
+        copy-on-write снимок без блокировки, стоимость — O(глубина топика + совпавшие обработчики).
+      * Семантика совпадения прежняя (``event.type.startswith(prefix)``), порядок вызова —
+        по первой подписке на префикс, затем по порядку подписки обработчиков.
+      * metrics — реестр, куда пишется время доставки по первому сегменту топика
+        (adaos_bus_dispatch_seconds{prefix="sys"}); без него publish не тратит время на замеры.
     """
 
-    def __init__(self) -> None:
-        self._subs: DefaultDict[str, List[Handler]] = defaultdict(list)
+    def __init__(self, *, metrics: Optional[MetricsRegistry] = None) -> None:
         self._lock = RLock()
+        self._seq = itertools.count()
+        self._wild_seq: Dict[str, int] = {}
+        self._snapshot = _Snapshot(_Node(), ())
+        self._dispatch_seconds: Optional[Histogram] = None
+        if metrics is not None:
+            self._dispatch_seconds = metrics.histogram(
+                "adaos_bus_dispatch_seconds", "Time spent delivering one event to its handlers, by topic prefix", ("prefix",)
+            )
 
     def subscribe(self, type_prefix: str, handler: Handler) -> None:
         with self._lock:
-            self._subs[type_prefix].append(handler)
+            snap = self._snapshot
+            if type_prefix in _WILDCARDS:
+                self._snapshot = _Snapshot(snap.root, self._add_wild(snap.wild, type_prefix, handler))
+                return
+            segments, tail = _split_prefix(type_prefix)
+            # path copying: копируем только узлы на пути к префиксу
+            root = snap.root.copy()
+            node = root
+            for seg in segments:
+                child = node.children.get(seg)
+                child = child.copy() if child is not None else _Node()
+                node.children[seg] = child
+                node = child
+            entry = node.partials.get(tail)
+            if entry is None:
+                node.partials[tail] = (next(self._seq), (handler,))
+            else:
+                node.partials[tail] = (entry[0], entry[1] + (handler,))
+            self._snapshot = _Snapshot(root, snap.wild)
+
+    def _add_wild(self, wild: Tuple[_Entry, ...], type_prefix: str, handler: Handler) -> Tuple[_Entry, ...]:
+        # "" и "*" — разные префиксы (как и раньше), у каждого свой порядковый номер
+        seq = self._wild_seq.get(type_prefix)
+        if seq is None:
+            seq = self._wild_seq[type_prefix] = next(self._seq)
+            return wild + ((seq, (handler,)),)
+        return tuple((s, hs + (handler,)) if s == seq else (s, hs) for s, hs in wild)
+
+    def _match(self, topic: str) -> List[Handler]:
+        snap = self._snapshot
+        matched: List[_Entry] = list(snap.wild)
+        node: Optional[_Node] = snap.root
+        for seg in topic.split("."):
+            if node is None:
+                break
+            partials = node.partials
+            if partials:
+                if len(partials) <= len(seg) + 1:
+                    for tail, entry in partials.items():
+                        if seg.startswith(tail):
+                            matched.append(entry)
+                else:
+                    for i in range(len(seg) + 1):
+                        entry = partials.get(seg[:i])
+                        if entry is not None:
+                            matched.append(entry)
+            node = node.children.get(seg)
+        if not matched:
+            return []
+        if len(matched) > 1:
+            matched.sort(key=lambda e: e[0])
+        return [h for _, hs in matched for h in hs]
 
     def publish(self, event: Event) -> None:
+        hist = self._dispatch_seconds
+        started = time.perf_counter() if hist is not None else 0.0
+        try:
+            for h in self._match(event.type):
+                res = h(event)
+                if asyncio.iscoroutine(res):
+                    try:
+                        loop = asyncio.get_running_loop()
+                    except RuntimeError:
+                        asyncio.run(res)  # нет активного лупа — выполним синхронно
+                    else:
+                        loop.create_task(res)
+        finally:
+            if hist is not None:
+                hist.labels(_topic_prefix(event.type)).observe(time.perf_counter() - started)
+
+
+class OverflowPolicy(str, Enum):
+    BLOCK = "block"
+    DROP_OLDEST = "drop-oldest"
+    DROP_NEWEST = "drop-newest"
+
+
+_log = logging.getLogger("adaos.eventbus")
+
+
+class _Subscriber:
+    """Очередь одного подписчика + воркер, который вызывает обработчик."""
+
+    __slots__ = ("bus", "prefix", "handler", "name", "queue", "task", "backlog", "feeder", "overflowing", "delivered", "dropped", "errors", "max_depth")
+
+    def __init__(self, bus: "AsyncEventBus", prefix: str, handler: Handler) -> None:
+        self.bus = bus
+        self.prefix = prefix
+        self.handler = handler
+        self.name = getattr(handler, "__qualname__", None) or repr(handler)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=bus.queue_size)
+        self.task: Optional[asyncio.Task] = None
+        # политика block: события, ждущие места в очереди; доливает их в порядке поступления feeder
+        self.backlog: Deque[Event] = deque()
+        self.feeder: Optional[asyncio.Task] = None
+        # backlog упёрся в предел и вытесняет старые события (предупреждение — раз на эпизод)
+        self.overflowing = False
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_depth = 0
+
+    def __call__(self, event: Event) -> None:
+        # синхронная доставка (луп не привязан): ведём себя как LocalEventBus
+        res = self.handler(event)
+        if asyncio.iscoroutine(res):
+            asyncio.run(res)
+        self.delivered += 1
+
+    def depth(self) -> int:
+        return self.queue.qsize() + len(self.backlog)
+
+    def _track_depth(self) -> None:
+        depth = self.depth()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def offer(self, event: Event) -> None:
+        """Неблокирующая постановка в очередь (вызывается в потоке лупа)."""
+        q = self.queue
+        if self.backlog:
+            self._defer(event)
+        elif not q.full():
+            q.put_nowait(event)
+        elif self.bus.overflow is OverflowPolicy.DROP_NEWEST:
+            self.dropped += 1
+            return
+        elif self.bus.overflow is OverflowPolicy.DROP_OLDEST:
+            q.get_nowait()
+            q.task_done()
+            q.put_nowait(event)
+            self.dropped += 1
+        else:
+            # block: издатель в потоке лупа ждать не может — событие ждёт места в backlog
+            self._defer(event)
+        self._track_depth()
+
+    def _defer(self, event: Event) -> None:
+        # backlog без ожидания не больше queue_size: дальше вытесняем самые старые (как drop-oldest),
+        # иначе sync publish() из лупа при медленном обработчике растит память без предела
+        backlog = self.backlog
+        if len(backlog) >= self.bus.queue_size and len(backlog) > 1:
+            # голову feeder уже кладёт в очередь — вытесняем следующее по старшинству
+            del backlog[1]
+            self.dropped += 1
+            if not self.overflowing:
+                self.overflowing = True
+                _log.warning(
+                    "eventbus.backlog.overflow",
+                    extra={"extra": {"prefix": self.prefix, "handler": self.name, "limit": self.bus.queue_size}},
+                )
+        backlog.append(event)
+        self._ensure_feeder()
+
+    async def put(self, event: Event) -> None:
+        """Постановка с ожиданием места (политика block): возвращается, когда событие в очереди."""
+        if self.backlog or self.queue.full():
+            self.backlog.append(event)
+            self._track_depth()
+            feeder = self._ensure_feeder()
+            await asyncio.shield(feeder)
+            return
+        self.queue.put_nowait(event)
+        self._track_depth()
+
+    def _ensure_feeder(self) -> asyncio.Task:
+        if self.feeder is None or self.feeder.done():
+            self.feeder = self.bus._create_task(self._feed(), f"adaos-bus-feed:{self.prefix or '*'}")
+        return self.feeder
+
+    async def _feed(self) -> None:
+        while self.backlog:
+            await self.queue.put(self.backlog[0])
+            self.backlog.popleft()
+        self.overflowing = False
+
+    async def run(self) -> None:
+        q = self.queue
+        hist = self.bus._handler_seconds
+        timer = hist.labels(self.prefix or "*") if hist is not None else None
+        while True:
+            event = await q.get()
+            started = time.perf_counter()
+            try:
+                res = self.handler(event)
+                if asyncio.iscoroutine(res):
+                    await res
+                self.delivered += 1
+                if timer is not None:
+                    timer.observe(time.perf_counter() - started)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+                _log.exception("eventbus.handler.error", extra={"extra": {"prefix": self.prefix, "handler": self.name, "type": event.type}})
+            finally:
+                q.task_done()
+
+    async def drain(self) -> None:
+        # join() ждёт task_done по всем взятым из очереди событиям; хвост backlog доливает feeder
+        while True:
+            if self.backlog:
+                await asyncio.shield(self._ensure_feeder())
+            await self.queue.join()
+            if not self.backlog:
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "prefix": self.prefix,
+            "handler": self.name,
+            "depth": self.depth(),
+            "max_depth": self.max_depth,
+            "maxsize": self.queue.maxsize,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
+
+
+class AsyncEventBus(LocalEventBus):
+    """
+    Шина с асинхронной доставкой: у каждого подписчика своя ограниченная очередь и воркер-задача,
+    поэтому медленный обработчик не тормозит издателя и остальных подписчиков.
+      * overflow: block | drop-oldest | drop-newest — что делать с переполненной очередью.
+      * publish() из потока лупа никогда не ждёт; при block лишние события копятся в хвосте
+        подписчика, но не больше queue_size — дальше вытесняются самые старые (счётчик dropped,
+        предупреждение в лог). apublish() при block ждёт освобождения места (настоящий backpressure).
+      * publish() из чужого потока передаёт событие в луп; при block поток ждёт постановки.
+      * Пока луп не привязан (CLI, скрипты без asyncio) — доставка синхронная, как в LocalEventBus.
+      * Луп привязывается start() или первым publish() изнутри работающего лупа.
+    """
+
+    def __init__(
+        self, *, queue_size: int = 1000, overflow: OverflowPolicy | str = OverflowPolicy.BLOCK, metrics: Optional[MetricsRegistry] = None
+    ) -> None:
+        super().__init__(metrics=metrics)
+        self._handler_seconds: Optional[Histogram] = None
+        if metrics is not None:
+            self._handler_seconds = metrics.histogram(
+                "adaos_bus_handler_seconds", "Time a queued subscriber spends handling one event, by subscription prefix", ("prefix",)
+            )
+        if queue_size <= 0:
+            raise ValueError("queue_size must be positive")
+        self.queue_size = queue_size
+        self.overflow = OverflowPolicy(overflow)
+        self._subscribers: List[_Subscriber] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+
+    # ---------- подписка/привязка к лупу ----------
+
+    def subscribe(self, type_prefix: str, handler: Handler) -> None:
+        sub = _Subscriber(self, type_prefix, handler)
+        with self._lock:
+            self._subscribers.append(sub)
+            super().subscribe(type_prefix, sub)
+            loop = self._loop
+        if loop is not None and not loop.is_closed():
+            if threading.get_ident() == self._loop_thread:
+                self._spawn(sub)
+            else:
+                loop.call_soon_threadsafe(self._spawn, sub)
+
+    def start(self) -> None:
+        """Привязать шину к текущему (работающему) лупу и запустить воркеры."""
+        loop = asyncio.get_running_loop()
         with self._lock:
-            pairs = [(p, hs[:]) for p, hs in self._subs.items()]
-        for prefix, handlers in pairs:
-            if prefix == "*" or prefix == "" or event.type.startswith(prefix):
-                for h in handlers:
-                    res = h(event)
-                    if asyncio.iscoroutine(res):
-                        try:
-                            loop = asyncio.get_running_loop()
-                        except RuntimeError:
-                            asyncio.run(res)  # нет активного лупа — выполним синхронно
-                        else:
-                            loop.create_task(res)
+            if self._loop is loop:
+                return
+            self._loop = loop
+            self._loop_thread = threading.get_ident()
+            subs = list(self._subscribers)
+        for sub in subs:
+            self._rebind(sub)
+
+    def _rebind(self, sub: _Subscriber) -> None:
+        # очередь asyncio привязана к лупу — при смене лупа переносим недоставленное в новую
+        old = sub.queue
+        pending = list(sub.backlog)
+        sub.queue = asyncio.Queue(maxsize=self.queue_size)
+        sub.backlog.clear()
+        sub.task = sub.feeder = None
+        while not old.empty():
+            sub.offer(old.get_nowait())
+        for event in pending:
+            sub.offer(event)
+        self._spawn(sub)
+
+    def _create_task(self, coro: Awaitable[Any], name: str) -> asyncio.Task:
+        assert self._loop is not None
+        return self._loop.create_task(coro, name=name)  # type: ignore[arg-type]
+
+    def _spawn(self, sub: _Subscriber) -> None:
+        if sub.task is None or sub.task.done():
+            sub.task = self._create_task(sub.run(), f"adaos-bus:{sub.prefix or '*'}")
+
+    def _bound_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        loop = self._loop
+        if running is not None and running is not loop and (loop is None or loop.is_closed() or not loop.is_running()):
+            self.start()
+            return running
+        if loop is not None and loop.is_running():
+            return loop
+        return None
+
+    # ---------- публикация ----------
+
+    def publish(self, event: Event) -> None:
+        loop = self._bound_loop()
+        if loop is None:
+            super().publish(event)
+            return
+        subs = self._match(event.type)
+        if threading.get_ident() == self._loop_thread:
+            for sub in subs:
+                sub.offer(event)  # type: ignore[attr-defined]
+            return
+        if self.overflow is OverflowPolicy.BLOCK:
+            # чужой поток: ждём, пока событие встанет во все очереди
+            for sub in subs:
+                asyncio.run_coroutine_threadsafe(sub.put(event), loop).result()  # type: ignore[attr-defined]
+        else:
+            for sub in subs:
+                loop.call_soon_threadsafe(sub.offer, event)  # type: ignore[attr-defined]
+
+    async def apublish(self, event: Event) -> None:
+        """Асинхронная публикация: при политике block ждёт места в очередях подписчиков."""
+        loop = self._bound_loop()
+        if loop is None or threading.get_ident() != self._loop_thread:
+            self.publish(event)
+            return
+        for sub in self._match(event.type):
+            if self.overflow is OverflowPolicy.BLOCK:
+                await sub.put(event)  # type: ignore[attr-defined]
+            else:
+                sub.offer(event)  # type: ignore[attr-defined]
+
+    # ---------- обслуживание ----------
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Дождаться обработки всех поставленных событий. False — не успели за timeout."""
+
+        async def _all() -> None:
+            for sub in list(self._subscribers):
+                await sub.drain()
+
+        if self._loop is None:
+            return True
+        try:
+            await asyncio.wait_for(_all(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def aclose(self, timeout: Optional[float] = 5.0) -> None:
+        """Доставить хвост (не дольше timeout) и остановить воркеры."""
+        await self.drain(timeout)
+        tasks = [t for s in self._subscribers for t in (s.task, s.feeder) if t is not None]
+        for t in tasks:
+            t.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for s in self._subscribers:
+            s.task = s.feeder = None
+        self._loop = None
+        self._loop_thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Метрики: глубина очередей, максимумы, доставки, сбросы и ошибки по подписчикам."""
+        subs = [s.stats() for s in list(self._subscribers)]
+        return {
+            "overflow": self.overflow.value,
+            "queue_size": self.queue_size,
+            "depth": sum(s["depth"] for s in subs),
+            "dropped": sum(s["dropped"] for s in subs),
+            "delivered": sum(s["delivered"] for s in subs),
+            "errors": sum(s["errors"] for s in subs),
+            "subscribers": subs,
+        }
 
 
 def emit(bus: EventBus, type_: str, payload: dict, source: str) -> None:
@@ -0,0 +1,408 @@
+# src/adaos/services/eventlog.py
+# сегментированный append-only журнал событий: events.log + events.log.N.gz и индекс-спутник *.idx
+from __future__ import annotations
+import bisect, gzip, itertools, json, math, os, threading
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+BLOCK_BYTES = 32 * 1024  # блок — единица индекса и чтения; в .gz каждый блок — отдельный gzip-член
+_GZ_LEVEL = 6
+
+
+@dataclass(slots=True)
+class Block:
+    """Непрерывный кусок сегмента из целых строк и сводка по нему для отбора без чтения."""
+
+    off: int  # смещение в несжатых данных сегмента
+    size: int = 0
+    lines: int = 0
+    ts_min: float = math.inf
+    ts_max: float = -math.inf
+    topics: Set[str] = field(default_factory=set)
+    nodes: Set[str] = field(default_factory=set)
+    zoff: int = -1  # смещение gzip-члена в сжатом сегменте (-1 — блок в несжатом events.log)
+    zsize: int = 0
+
+    def add(self, line: str, nbytes: int) -> None:
+        self.size += nbytes
+        self.lines += 1
+        evt = _parse(line)
+        if evt is None:
+            return
+        ts = _ts(evt)
+        if ts is not None:
+            self.ts_min = min(self.ts_min, ts)
+            self.ts_max = max(self.ts_max, ts)
+        self.topics.add(str(evt.get("topic", "")))
+        self.nodes.add(str(evt.get("node_id")))
+
+    def may_match(self, since: Optional[float], until: Optional[float], topic_prefix: Optional[str], node_id: Optional[str]) -> bool:
+        if since is not None and self.ts_max < since:
+            return False
+        if until is not None and self.ts_min > until:
+            return False
+        if topic_prefix and not any(t.startswith(topic_prefix) for t in self.topics):
+            return False
+        if node_id and node_id not in self.nodes:
+            return False
+        return True
+
+    def copy(self) -> "Block":
+        return replace(self, topics=set(self.topics), nodes=set(self.nodes))
+
+    def to_json(self) -> str:
+        rec: Dict[str, Any] = {"off": self.off, "size": self.size, "lines": self.lines, "topics": sorted(self.topics), "nodes": sorted(self.nodes)}
+        if self.ts_max >= self.ts_min:
+            rec["ts"] = [self.ts_min, self.ts_max]
+        if self.zoff >= 0:
+            rec["zoff"], rec["zsize"] = self.zoff, self.zsize
+        return json.dumps(rec, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, line: str) -> "Block":
+        rec = json.loads(line)
+        ts = rec.get("ts") or (math.inf, -math.inf)
+        return cls(
+            off=int(rec["off"]),
+            size=int(rec["size"]),
+            lines=int(rec.get("lines", 0)),
+            ts_min=float(ts[0]),
+            ts_max=float(ts[1]),
+            topics=set(rec.get("topics") or ()),
+            nodes=set(rec.get("nodes") or ()),
+            zoff=int(rec.get("zoff", -1)),
+            zsize=int(rec.get("zsize", 0)),
+        )
+
+
+@dataclass(slots=True)
+class _Segment:
+    seq: int  # постоянный номер сегмента в процессе (num меняется при ротации)
+    num: int  # 0 — events.log, N — events.log.N.gz
+    blocks: List[Block]
+
+
+def _parse(line: str) -> Optional[Dict[str, Any]]:
+    try:
+        evt = json.loads(line)
+    except ValueError:
+        return None
+    return evt if isinstance(evt, dict) else None
+
+
+def _ts(evt: Dict[str, Any]) -> Optional[float]:
+    try:
+        return float(evt["ts"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _matches(line: str, since: Optional[float], until: Optional[float], topic_prefix: Optional[str], node_id: Optional[str]) -> bool:
+    """Та же семантика, что у observe.pass_filters (+ верхняя граница until)."""
+    if not (since or until is not None or topic_prefix or node_id):
+        return True
+    evt = _parse(line)
+    if evt is None:
+        return False
+    if topic_prefix and not str(evt.get("topic", "")).startswith(topic_prefix):
+        return False
+    if node_id and str(evt.get("node_id")) != node_id:
+        return False
+    if since or until is not None:
+        ts = _ts(evt) or 0.0
+        if since and ts < since:
+            return False
+        if until is not None and ts > until:
+            return False
+    return True
+
+
+def _replace_text(path: Path, text: str) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class EventLog:
+    """
+    Журнал событий (JSON-строки) из сегментов: активный ``events.log`` и сжатые ``events.log.N.gz``
+    (N=1 — самый свежий). Рядом с каждым сегментом лежит индекс ``*.idx`` — по строке JSON на блок
+    (~BLOCK_BYTES): смещение, число строк, диапазон ts, топики и node_id блока.
+      * Запросы (since/until, topic_prefix, node_id) по индексу пропускают неподходящие блоки и
+        читают только нужные; в .gz блоки — отдельные gzip-члены, читаются seek'ом по zoff.
+      * Память запроса — один блок (+ n строк для tail), независимо от размера журнала.
+      * Файл .gz остаётся обычным gzip (члены склеены), его читают gzip/zcat как раньше.
+      * Индекс восстанавливается при открытии: хвост events.log без индекса доиндексируется,
+        старые .gz без индекса перепаковываются поблочно.
+    Писатель — один процесс; чтения потокобезопасны и не мешают ротации.
+    """
+
+    def __init__(self, path: Path, *, max_bytes: int = 5 * 1024 * 1024, keep: int = 3, block_bytes: int = BLOCK_BYTES) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.block_bytes = block_bytes
+        self._lock = threading.RLock()
+        self._seq = itertools.count()
+        self._rotated: List[_Segment] = []  # по возрастанию num
+        self._active = _Segment(seq=-1, num=0, blocks=[])
+        self._open = Block(off=0)
+        self._size = 0
+        self._load()
+
+    # ---------- пути ----------
+
+    def _gz_path(self, num: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.{num}.gz")
+
+    def _idx_path(self, num: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.idx" if num == 0 else f"{self.path.name}.{num}.idx")
+
+    # ---------- открытие и восстановление индекса ----------
+
+    def _load(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        rotated = []
+        for num in range(self.keep, 0, -1):  # от старых к новым — seq растёт вместе с возрастом данных
+            gz = self._gz_path(num)
+            if gz.exists():
+                blocks = self._read_index(num)
+                if blocks is None or any(b.zoff < 0 for b in blocks):
+                    try:
+                        blocks = self._repack(num)
+                    except (OSError, EOFError):
+                        blocks = []  # битый архив: не читаем, уйдёт при следующих ротациях
+                rotated.append(_Segment(seq=next(self._seq), num=num, blocks=blocks))
+        self._rotated = sorted(rotated, key=lambda s: s.num)
+        self._active = _Segment(seq=next(self._seq), num=0, blocks=[])
+        self._recover_active()
+
+    def _read_index(self, num: int) -> Optional[List[Block]]:
+        try:
+            text = self._idx_path(num).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        try:
+            return [Block.from_json(ln) for ln in text.split("\n") if ln.strip()]
+        except (ValueError, KeyError, TypeError, IndexError):
+            return None
+
+    def _write_index(self, num: int, blocks: Sequence[Block]) -> None:
+        _replace_text(self._idx_path(num), "".join(b.to_json() + "\n" for b in blocks))
+
+    def _recover_active(self) -> None:
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        indexed = self._read_index(0) or []
+        blocks: List[Block] = []
+        end = 0
+        for b in indexed:
+            # индекс доверяем, пока блоки идут подряд и укладываются в файл
+            if b.off != end or b.off + b.size > size or b.zoff >= 0:
+                break
+            blocks.append(b)
+            end = b.off + b.size
+        self._active.blocks = blocks
+        self._open = Block(off=end)
+        self._size = size
+        closed: List[Block] = []
+        if end < size:
+            with self.path.open("rb") as f:
+                f.seek(end)
+                for raw in f:
+                    self._add_line(raw.decode("utf-8", errors="replace"), len(raw), closed)
+        if len(blocks) - len(closed) != len(indexed):
+            self._write_index(0, self._active.blocks)
+        elif closed:
+            self._append_index(closed)
+
+    def _repack(self, num: int) -> List[Block]:
+        """Старый .gz без индекса: перепаковать в gzip-члены по блокам и построить индекс."""
+        gz = self._gz_path(num)
+        tmp = gz.with_name(gz.name + ".tmp")
+        blocks: List[Block] = []
+        buf: List[bytes] = []
+        block = Block(off=0)
+
+        def _flush(dst: Any) -> None:
+            nonlocal block
+            if block.lines:
+                z = gzip.compress(b"".join(buf), compresslevel=_GZ_LEVEL)
+                block.zoff, block.zsize = dst.tell(), len(z)
+                dst.write(z)
+                blocks.append(block)
+                block = Block(off=block.off + block.size)
+                buf.clear()
+
+        with gzip.open(gz, "rb") as src, tmp.open("wb") as dst:
+            for raw in src:
+                buf.append(raw)
+                block.add(raw.decode("utf-8", errors="replace"), len(raw))
+                if block.size >= self.block_bytes:
+                    _flush(dst)
+            _flush(dst)
+        os.replace(tmp, gz)
+        self._write_index(num, blocks)
+        return blocks
+
+    # ---------- запись ----------
+
+    def _add_line(self, line: str, nbytes: int, closed: List[Block]) -> None:
+        self._open.add(line, nbytes)
+        if self._open.size >= self.block_bytes:
+            self._close_open(closed)
+
+    def _close_open(self, closed: List[Block]) -> None:
+        block = self._open
+        if block.lines:
+            self._active.blocks.append(block)
+            closed.append(block)
+            self._open = Block(off=block.off + block.size)
+
+    def _append_index(self, blocks: Sequence[Block]) -> None:
+        with self._idx_path(0).open("a", encoding="utf-8") as f:
+            f.write("".join(b.to_json() + "\n" for b in blocks))
+
+    def append(self, lines: Sequence[str]) -> None:
+        """Дописать строки (каждая с завершающим \\n) одной записью, обновить индекс, при необходимости ротировать."""
+        if not lines:
+            return
+        chunks = [ln.encode("utf-8") for ln in lines]
+        with self._lock:
+            with self.path.open("ab") as f:
+                f.write(b"".join(chunks))
+            closed: List[Block] = []
+            for line, raw in zip(lines, chunks):
+                self._add_line(line, len(raw), closed)
+                self._size += len(raw)
+            if closed:
+                self._append_index(closed)
+            if self._size >= self.max_bytes:
+                self.rotate()
+
+    def rotate(self) -> None:
+        """events.log -> events.log.1.gz (поблочно), старые .N.gz сдвигаются, лишние удаляются."""
+        with self._lock:
+            closed: List[Block] = []
+            self._close_open(closed)
+            for seg in sorted(self._rotated, key=lambda s: -s.num):
+                if seg.num >= self.keep:
+                    self._gz_path(seg.num).unlink(missing_ok=True)
+                    self._idx_path(seg.num).unlink(missing_ok=True)
+                    self._rotated.remove(seg)
+                    continue
+                os.replace(self._gz_path(seg.num), self._gz_path(seg.num + 1))
+                if self._idx_path(seg.num).exists():
+                    os.replace(self._idx_path(seg.num), self._idx_path(seg.num + 1))
+                seg.num += 1
+            active = self._active
+            if self.keep > 0 and active.blocks:
+                gz = self._gz_path(1)
+                tmp = gz.with_name(gz.name + ".tmp")
+                packed: List[Block] = []
+                with self.path.open("rb") as src, tmp.open("wb") as dst:
+                    for b in active.blocks:
+                        src.seek(b.off)
+                        z = gzip.compress(src.read(b.size), compresslevel=_GZ_LEVEL)
+                        packed.append(replace(b, zoff=dst.tell(), zsize=len(z)))
+                        dst.write(z)
+                os.replace(tmp, gz)
+                self._write_index(1, packed)
+                self._rotated.insert(0, _Segment(seq=active.seq, num=1, blocks=packed))
+            self.path.unlink(missing_ok=True)
+            self._idx_path(0).unlink(missing_ok=True)
+            self._active = _Segment(seq=next(self._seq), num=0, blocks=[])
+            self._open = Block(off=0)
+            self._size = 0
+
+    # ---------- чтение ----------
+
+    def _plan(self) -> List[Tuple[int, List[Block]]]:
+        """Снимок (seq, блоки) от старых сегментов к новым; незакрытый блок — копией."""
+        with self._lock:
+            plan = [(s.seq, list(s.blocks)) for s in sorted(self._rotated, key=lambda s: -s.num)]
+            active = list(self._active.blocks)
+            if self._open.lines:
+                active.append(self._open.copy())
+            plan.append((self._active.seq, active))
+            return plan
+
+    def _read_block(self, seq: int, block: Block) -> Optional[bytes]:
+        # сегмент ищем по seq под блокировкой: между снимком и чтением могла пройти ротация
+        with self._lock:
+            seg = self._active if self._active.seq == seq else next((s for s in self._rotated if s.seq == seq), None)
+            if seg is None:
+                return None  # сегмент уже удалён ротацией
+            if seg.num == 0:
+                with self.path.open("rb") as f:
+                    f.seek(block.off)
+                    return f.read(block.size)
+            offs = [b.off for b in seg.blocks]
+            i = bisect.bisect_left(offs, block.off)
+            if i == len(offs) or offs[i] != block.off:
+                return None
+            current = seg.blocks[i]
+            with self._gz_path(seg.num).open("rb") as f:
+                f.seek(current.zoff)
+                raw = f.read(current.zsize)
+        # снимок незакрытого блока мог стать частью большего блока — берём только его начало
+        return gzip.decompress(raw)[: block.size]
+
+    def blocks(
+        self,
+        *,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        topic_prefix: Optional[str] = None,
+        node_id: Optional[str] = None,
+        reverse: bool = False,
+    ) -> Iterator[List[str]]:
+        """Подходящие строки поблочно (без \\n); reverse — от новых к старым, и внутри блока тоже."""
+        plan = self._plan()
+        if reverse:
+            plan = [(seq, blocks[::-1]) for seq, blocks in reversed(plan)]
+        for seq, blocks in plan:
+            for b in blocks:
+                if not b.may_match(since, until, topic_prefix, node_id):
+                    continue
+                data = self._read_block(seq, b)
+                if data is None:
+                    continue
+                # только \n: splitlines() режет ещё и по U+2028/U+2029/U+0085, а json.dumps(ensure_ascii=False) их не экранирует
+                out = [ln for ln in data.decode("utf-8", errors="replace").split("\n") if ln and _matches(ln, since, until, topic_prefix, node_id)]
+                if out:
+                    yield out[::-1] if reverse else out
+
+    def query(self, **filters: Any) -> Iterator[str]:
+        """Все подходящие строки в порядке записи (since/until/topic_prefix/node_id)."""
+        for chunk in self.blocks(**filters):
+            yield from chunk
+
+    def tail(self, n: int, **filters: Any) -> List[str]:
+        """Последние n подходящих строк в порядке записи."""
+        if n <= 0:
+            return []
+        out: List[str] = []
+        for chunk in self.blocks(reverse=True, **filters):
+            out.extend(chunk)
+            if len(out) >= n:
+                break
+        return out[:n][::-1]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            segs = [self._active] + sorted(self._rotated, key=lambda s: s.num)
+            return {
+                "segments": [
+                    {
+                        "file": (self.path if s.num == 0 else self._gz_path(s.num)).name,
+                        "blocks": len(s.blocks) + (1 if s.num == 0 and self._open.lines else 0),
+                        "lines": sum(b.lines for b in s.blocks) + (self._open.lines if s.num == 0 else 0),
+                        "bytes": sum(b.size for b in s.blocks) + (self._open.size if s.num == 0 else 0),
+                    }
+                    for s in segs
+                ],
+            }
@@ -0,0 +1,57 @@
+# src/adaos/services/importtime.py
+# разбор вывода `python -X importtime`: какие модули дороже всего импортируются при старте
+from __future__ import annotations
+import os, re, subprocess, sys, time
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S.*)$")
+
+
+@dataclass(frozen=True, slots=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int  # 0 — импортирован напрямую запускаемым кодом
+
+
+@dataclass
+class ImportProfile:
+    argv: List[str]
+    wall_s: float
+    exit_code: int
+    timings: List[ImportTiming] = field(default_factory=list)
+
+    @property
+    def total_us(self) -> int:
+        """Суммарное время импортов (сумма self по всем модулям)."""
+        return sum(t.self_us for t in self.timings)
+
+    def slowest(self, n: int = 20, *, by: str = "self") -> List[ImportTiming]:
+        key = (lambda t: t.self_us) if by == "self" else (lambda t: t.cumulative_us)
+        return sorted(self.timings, key=key, reverse=True)[:n]
+
+    def top_level(self, n: int = 20) -> List[ImportTiming]:
+        """Модули верхнего уровня по накопленному времени — с чего начинать ленивые импорты."""
+        return sorted((t for t in self.timings if t.depth == 0), key=lambda t: t.cumulative_us, reverse=True)[:n]
+
+
+def parse_importtime(text: str) -> List[ImportTiming]:
+    """Строки ``import time: self | cumulative | name``; прочий вывод игнорируется."""
+    out: List[ImportTiming] = []
+    for line in text.splitlines():
+        m = _LINE.match(line)
+        if m is None:
+            continue
+        self_us, cum_us, indent, name = m.groups()
+        out.append(ImportTiming(module=name.strip(), self_us=int(self_us), cumulative_us=int(cum_us), depth=max(len(indent) - 1, 0) // 2))
+    return out
+
+
+def profile_command(args: Sequence[str], *, module: str = "adaos", env: Optional[dict] = None, timeout: Optional[float] = 120.0) -> ImportProfile:
+    """Запустить ``python -X importtime -m <module> <args>`` и собрать время импортов."""
+    argv = [sys.executable, "-X", "importtime", "-m", module, *args]
+    started = time.perf_counter()
+    proc = subprocess.run(argv, capture_output=True, text=True, env={**os.environ, **(env or {})}, timeout=timeout)
+    return ImportProfile(argv=argv, wall_s=time.perf_counter() - started, exit_code=proc.returncode, timings=parse_importtime(proc.stderr))
@@ -0,0 +1,367 @@
+# src/adaos/services/metrics.py
+# лёгкие метрики процесса (счётчики, гистограммы с фиксированными корзинами, датчики)
+# и их выдача в текстовом формате Prometheus; без внешних зависимостей
+from __future__ import annotations
+import asyncio
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# корзины по умолчанию (секунды): от 0.1 мс до минуты
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_LabelKey = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _CounterChild:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("counter can only increase")
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("_lock", "value", "fn")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.value = 0.0
+        self.fn: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        """Значение считается при чтении (например, число живых процессов)."""
+        self.fn = fn
+
+    def get(self) -> float:
+        fn = self.fn
+        if fn is not None:
+            try:
+                return float(fn())
+            except Exception:
+                return math.nan
+        return self.value
+
+
+class _HistogramChild:
+    __slots__ = ("_lock", "_bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self._lock = threading.Lock()
+        self._bounds = bounds
+        # counts[i] — попадания ровно в корзину i (не накопительно); последняя — +Inf
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self._bounds, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def cumulative(self) -> List[int]:
+        with self._lock:
+            counts = list(self.counts)
+        acc, out = 0, []
+        for c in counts:
+            acc += c
+            out.append(acc)
+        return out
+
+
+class _Metric:
+    """Семейство метрики: имя, описание, имена меток и дочерние серии по значениям меток."""
+
+    type: str = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[_LabelKey, Any] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: Any, **kw: Any) -> Any:
+        if kw:
+            if values:
+                raise ValueError("use either positional or keyword label values")
+            values = tuple(kw[n] for n in self.labelnames)
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is not None:
+            return child
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {key}")
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+        return child
+
+    def _default(self) -> Any:
+        if self.labelnames:
+            raise ValueError(f"{self.name}: metric has labels {self.labelnames}, use .labels()")
+        return self._children[()]
+
+    def series(self) -> List[Tuple[_LabelKey, Any]]:
+        with self._lock:
+            return sorted(self._children.items())
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {_escape(self.help)}", f"# TYPE {self.name} {self.type}"]
+        for key, child in self.series():
+            lines.extend(self._render_child(key, child))
+        return lines
+
+    def _render_child(self, key: _LabelKey, child: Any) -> List[str]:
+        raise NotImplementedError
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "type": self.type,
+            "help": self.help,
+            "series": [{"labels": dict(zip(self.labelnames, key)), **self._snapshot_child(child)} for key, child in self.series()],
+        }
+
+    def _snapshot_child(self, child: Any) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def _render_child(self, key: _LabelKey, child: _CounterChild) -> List[str]:
+        return [f"{self.name}{_labels(self.labelnames, key)} {_fmt(child.value)}"]
+
+    def _snapshot_child(self, child: _CounterChild) -> Dict[str, Any]:
+        return {"value": child.value}
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default().dec(amount)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        self._default().set_function(fn)
+
+    def _render_child(self, key: _LabelKey, child: _GaugeChild) -> List[str]:
+        return [f"{self.name}{_labels(self.labelnames, key)} {_fmt(child.get())}"]
+
+    def _snapshot_child(self, child: _GaugeChild) -> Dict[str, Any]:
+        return {"value": child.get()}
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        bounds = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+        if not bounds:
+            raise ValueError("histogram needs at least one finite bucket")
+        self.buckets = bounds
+        super().__init__(name, help, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def time(self) -> Any:
+        return self._default().time()
+
+    def _render_child(self, key: _LabelKey, child: _HistogramChild) -> List[str]:
+        cumulative = child.cumulative()
+        lines = []
+        for bound, acc in zip(self.buckets + (math.inf,), cumulative):
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, ('le', _fmt(bound)))} {acc}")
+        labels = _labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_fmt(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {cumulative[-1]}")
+        return lines
+
+    def _snapshot_child(self, child: _HistogramChild) -> Dict[str, Any]:
+        cumulative = child.cumulative()
+        return {
+            "count": cumulative[-1],
+            "sum": child.sum,
+            "buckets": {_fmt(b): acc for b, acc in zip(self.buckets + (math.inf,), cumulative)},
+        }
+
+
+class MetricsRegistry:
+    """
+    Реестр метрик процесса. ``counter/gauge/histogram`` возвращают уже зарегистрированную
+    метрику с тем же именем (повторная регистрация из разных модулей безопасна).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _get_or_create(self, cls: type, name: str, help: str, labelnames: Sequence[str], **kw: Any) -> Any:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, help, labelnames, **kw)
+        if type(metric) is not cls or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"metric {name!r} already registered as {metric.type}{list(metric.labelnames)}")
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def metrics(self) -> List[_Metric]:
+        with self._lock:
+            return [self._metrics[n] for n in sorted(self._metrics)]
+
+    def render(self) -> str:
+        """Текстовый формат экспозиции Prometheus 0.0.4."""
+        lines: List[str] = []
+        for metric in self.metrics():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {m.name: m.snapshot() for m in self.metrics()}
+
+
+# реестр процесса по умолчанию: сюда пишут шина, инструменты, песочница и менеджер процессов
+REGISTRY = MetricsRegistry()
+
+
+def render_prometheus(registry: Optional[MetricsRegistry] = None) -> str:
+    return (registry or REGISTRY).render()
+
+
+def filter_exposition(text: str, prefix: str) -> str:
+    """Оставить в тексте экспозиции только метрики, чьё имя начинается с ``prefix``."""
+    out = []
+    for line in text.splitlines():
+        name = line.split(" ", 3)[2] if line.startswith("# ") and line.count(" ") >= 2 else line
+        if name.startswith(prefix):
+            out.append(line)
+    return "\n".join(out) + "\n" if out else ""
+
+
+class LoopLagSampler:
+    """
+    Замер задержки event loop: задача спит ``interval`` и записывает, насколько позже
+    положенного проснулась. Большой лаг = кто-то блокирует луп синхронным кодом.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, *, interval: float = 0.5) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        reg = registry or REGISTRY
+        self.interval = interval
+        self._hist = reg.histogram("adaos_event_loop_lag_seconds", "Event loop wake-up delay beyond the scheduled interval")
+        self._last = reg.gauge("adaos_event_loop_lag_last_seconds", "Most recent event loop lag sample")
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="adaos-loop-lag")
+        return self._task
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def record(self, lag: float) -> None:
+        lag = max(lag, 0.0)
+        self._hist.observe(lag)
+        self._last.set(lag)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record(loop.time() - started - self.interval)
@@ -1,7 +1,9 @@
 from __future__ import annotations
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from pathlib import Path
-import os, uuid, yaml, sys
+from threading import RLock
+from typing import Dict, Tuple
+import os, uuid, yaml, sys, time
 
 try:
     from adaos.services.agent_context import get_ctx, AgentContext  # type: ignore
@@ -34,9 +36,7 @@ def _base_dir(ctx: AgentContext | None = None) -> Path:
 
 
 def _config_path(ctx: AgentContext | None = None) -> Path:
-    p = _base_dir(ctx) / "node.yaml"
-    p.parent.mkdir(parents=True, exist_ok=True)
-    return p
+    return _base_dir(ctx) / "node.yaml"
 
 
 @dataclass
@@ -58,12 +58,21 @@ def _default_conf() -> NodeConfig:
     )
 
 
-def load_config(ctx: AgentContext | None = None) -> NodeConfig:
-    path = _config_path(ctx)
-    if not path.exists():
-        conf = _default_conf()
-        save_config(conf, ctx=ctx)
-        return conf
+# кэш конфигов: путь -> (момент последней проверки, (mtime_ns, size), NodeConfig)
+_STAT_INTERVAL = 1.0  # чаще раза в секунду файл не stat'им — внешние правки видны с задержкой ≤ 1 с
+_CACHE: Dict[Path, Tuple[float, Tuple[int, int], NodeConfig]] = {}
+_CACHE_LOCK = RLock()
+
+
+def _file_sig(path: Path) -> Tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _parse_config(path: Path) -> NodeConfig:
     data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
     node_id = data.get("node_id") or str(uuid.uuid4())
     subnet_id = data.get("subnet_id") or str(uuid.uuid4())
@@ -73,8 +82,47 @@ def load_config(ctx: AgentContext | None = None) -> NodeConfig:
     return NodeConfig(node_id=node_id, subnet_id=subnet_id, role=role, hub_url=hub_url, token=token)
 
 
+def load_config(ctx: AgentContext | None = None) -> NodeConfig:
+    """
+    Конфиг узла из {base_dir}/node.yaml. Кэшируется на процесс: повторный вызов — обращение к словарю,
+    файл перечитывается только если изменились его mtime/size (проверка не чаще _STAT_INTERVAL).
+    Возвращается копия — правки вызывающего кода кэш не портят.
+    """
+    path = _config_path(ctx)
+    now = time.monotonic()
+    hit = _CACHE.get(path)
+    if hit is not None and now - hit[0] < _STAT_INTERVAL:
+        return replace(hit[2])
+    with _CACHE_LOCK:
+        sig = _file_sig(path)
+        if sig is None:
+            conf = _default_conf()
+            save_config(conf, ctx=ctx)
+            return replace(conf)
+        hit = _CACHE.get(path)
+        if hit is not None and hit[1] == sig:
+            conf = hit[2]
+        else:
+            conf = _parse_config(path)
+        _CACHE[path] = (now, sig, conf)
+        return replace(conf)
+
+
 def save_config(conf: NodeConfig, *, ctx: AgentContext | None = None) -> None:
-    _config_path(ctx).write_text(yaml.safe_dump(asdict(conf), allow_unicode=True), encoding="utf-8")
+    path = _config_path(ctx)
+    with _CACHE_LOCK:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(yaml.safe_dump(asdict(conf), allow_unicode=True), encoding="utf-8")
+        # обновляем кэш на месте — следующий load_config не пойдёт на диск
+        sig = _file_sig(path)
+        if sig is not None:
+            _CACHE[path] = (time.monotonic(), sig, replace(conf))
+
+
+def invalidate_config_cache() -> None:
+    """Сбросить кэш (например, после ручной правки node.yaml в тестах)."""
+    with _CACHE_LOCK:
+        _CACHE.clear()
 
 
 def set_role(role: str, *, hub_url: str | None = None, subnet_id: str | None = None, ctx: AgentContext | None = None) -> NodeConfig:
@@ -1,12 +1,15 @@
 # src/adaos/services/observe.py
 from __future__ import annotations
-import asyncio, json, time, uuid, gzip, os
+import asyncio, itertools, json, time, uuid, os, threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
 
 import requests
 
 from adaos.services.node_config import load_config
+from adaos.services.metrics import REGISTRY as METRICS
+from adaos.services.eventlog import EventLog
 from adaos.sdk import bus as bus_module  # будем мягко оборачивать emit
 
 try:
@@ -39,37 +42,162 @@ BASE_DIR = _resolve_base_dir()
 _MAX_BYTES = 5 * 1024 * 1024  # 5MB
 _KEEP = 3
 
+# буфер events.log: emit кладёт строку в кольцо, запись на диск — в фоновой задаче пачками
+_RING_MAX = 10_000  # при отставании писателя старые строки вытесняются (см. _DROPPED)
+_FLUSH_LINES = 256  # разбудить писателя, когда накопилось столько строк
+_FLUSH_INTERVAL = 0.5  # ...или не реже, чем раз в столько секунд
+
 _LOG_TASK: Optional[asyncio.Task] = None
+_WRITER_TASK: Optional[asyncio.Task] = None
+_WRITER_WAKE: Optional[asyncio.Event] = None
+_WRITER_STOP = False
+_RING: Deque[str] = deque(maxlen=_RING_MAX)
+_WRITE_LOCK = threading.Lock()
+_DROPPED = 0
 _QUEUE: "asyncio.Queue[Dict[str, Any]]" | None = None
 _ORIG_EMIT = None
 _LOG_FILE: Path | None = None
+_EVENT_LOG: EventLog | None = None
 
 
-class EventBroadcaster:
-    def __init__(self):
-        self._subs: List[asyncio.Queue] = []
+def sse_frame(line: str) -> bytes:
+    """SSE-кадр для уже сериализованного в JSON события."""
+    return b"event: adaos\ndata: " + line.encode("utf-8") + b"\n\n"
 
-    async def publish(self, evt: Dict[str, Any]):
-        for q in list(self._subs):
-            try:
-                if q.full():
-                    _ = q.get_nowait()
-                q.put_nowait(evt)
-            except Exception:
-                try:
-                    self._subs.remove(q)
-                except Exception:
-                    pass
 
-    def subscribe(self, *, topic_prefix: str | None, node_id: str | None, since_ts: float | None) -> "asyncio.Queue[Dict[str, Any]]":
-        q: asyncio.Queue = asyncio.Queue(maxsize=500)
-        q._adaos_filter = {"topic_prefix": topic_prefix, "node_id": node_id, "since": since_ts}  # type: ignore[attr-defined]
-        self._subs.append(q)
-        return q
+class _TrieNode:
+    __slots__ = ("children", "subs")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.subs: List["Subscription"] = []
+
+
+def _event_ts(evt: Dict[str, Any]) -> float:
+    # ts приходит и из /observe/ingest: мусор не должен ронять доставку остальным — считаем его 0 (как журнал)
+    try:
+        return float(evt.get("ts") or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class Subscription:
+    """Подписка SSE-клиента: фильтр, очередь готовых кадров и счётчики доставки/сбросов."""
+
+    __slots__ = ("id", "topic_prefix", "node_id", "since", "queue", "delivered", "dropped")
+
+    def __init__(self, sub_id: int, topic_prefix: str | None, node_id: str | None, since_ts: float | None, maxsize: int) -> None:
+        self.id = sub_id
+        self.topic_prefix = topic_prefix or ""
+        self.node_id = node_id
+        self.since = float(since_ts) if since_ts is not None else None
+        self.queue: "asyncio.Queue[bytes]" = asyncio.Queue(maxsize=maxsize)
+        self.delivered = 0
+        self.dropped = 0
+
+    def accepts(self, node_id: Any, ts: float) -> bool:
+        if self.node_id and str(node_id) != self.node_id:
+            return False
+        if self.since and ts < self.since:
+            return False
+        return True
+
+    def offer(self, frame: bytes) -> None:
+        q = self.queue
+        if q.full():
+            # медленный клиент: выбрасываем самый старый кадр, чтобы не тормозить остальных
+            q.get_nowait()
+            self.dropped += 1
+            _SSE_DROPPED.inc()
+        q.put_nowait(frame)
+        self.delivered += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "topic_prefix": self.topic_prefix or None,
+            "node_id": self.node_id,
+            "depth": self.queue.qsize(),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+
+class EventBroadcaster:
+    """
+    Раздача событий SSE-клиентам. Маршрутизация — при публикации: посимвольное дерево префиксов
+    топиков отдаёт только подходящие подписки, node_id/since проверяются там же. Событие
+    сериализуется в кадр один раз, все подписчики получают одни и те же байты.
+    """
+
+    def __init__(self, *, queue_size: int = 500):
+        self.queue_size = queue_size
+        self._root = _TrieNode()
+        self._subs: List[Subscription] = []
+        self._ids = itertools.count(1)
+
+    async def publish(self, evt: Dict[str, Any], line: str | None = None):
+        """``line`` — событие, уже сериализованное в JSON (например, для events.log)."""
+        subs = self._match(str(evt.get("topic", "")))
+        if not subs:
+            return
+        node_id, ts = evt.get("node_id"), _event_ts(evt)
+        frame: bytes | None = None
+        for sub in subs:
+            if not sub.accepts(node_id, ts):
+                continue
+            if frame is None:
+                frame = sse_frame(line if line is not None else json.dumps(evt, ensure_ascii=False))
+            sub.offer(frame)
+
+    def _match(self, topic: str) -> List[Subscription]:
+        node = self._root
+        out = list(node.subs)
+        for ch in topic:
+            node = node.children.get(ch)  # type: ignore[assignment]
+            if node is None:
+                break
+            if node.subs:
+                out.extend(node.subs)
+        return out
+
+    def subscribe(self, *, topic_prefix: str | None, node_id: str | None, since_ts: float | None) -> Subscription:
+        sub = Subscription(next(self._ids), topic_prefix, node_id, since_ts, self.queue_size)
+        node = self._root
+        for ch in sub.topic_prefix:
+            node = node.children.setdefault(ch, _TrieNode())
+        node.subs.append(sub)
+        self._subs.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        try:
+            self._subs.remove(sub)
+        except ValueError:
+            return
+        path = [self._root]
+        for ch in sub.topic_prefix:
+            path.append(path[-1].children[ch])
+        path[-1].subs.remove(sub)
+        # подрезаем опустевшие ветви
+        for parent, ch in zip(reversed(path[:-1]), reversed(sub.topic_prefix)):
+            child = parent.children[ch]
+            if child.subs or child.children:
+                break
+            del parent.children[ch]
+
+    def __len__(self) -> int:
+        return len(self._subs)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [s.stats() for s in self._subs]
 
 
 BROADCAST = EventBroadcaster()
 
+_SSE_DROPPED = METRICS.counter("adaos_observe_sse_dropped_total", "SSE frames dropped because a subscriber queue was full")
+METRICS.gauge("adaos_observe_sse_subscribers", "Open SSE event streams").set_function(lambda: len(BROADCAST))
+
 
 def _log_path() -> Path:
     p = BASE_DIR / "logs"
@@ -101,31 +229,83 @@ def _serialize_event(topic: str, payload: Dict[str, Any], kwargs: Dict[str, Any]
     }
 
 
-def _rotate_if_needed(path: Path):
-    try:
-        if path.exists() and path.stat().st_size >= _MAX_BYTES:
-            for i in range(_KEEP, 0, -1):
-                src = path.with_suffix(path.suffix + ("" if i == 1 else f".{i-1}.gz"))
-                dst = path.with_suffix(path.suffix + f".{i}.gz")
-                if i == 1:
-                    if path.exists():
-                        data = path.read_bytes()
-                        with gzip.open(path.with_suffix(path.suffix + ".1.gz"), "wb") as gz:
-                            gz.write(data)
-                        path.unlink(missing_ok=True)
-                else:
-                    if src.exists():
-                        src.rename(dst)
-    except Exception:
-        pass
-
-
-def _write_local(e: Dict[str, Any]) -> None:
-    global _LOG_FILE
+def _event_log() -> EventLog:
+    """Журнал для текущего _LOG_FILE/_MAX_BYTES (вызывать под _WRITE_LOCK)."""
+    global _LOG_FILE, _EVENT_LOG
     if _LOG_FILE is None:
         _LOG_FILE = _log_path()
-    with _LOG_FILE.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(e, ensure_ascii=False) + "\n")
+    log = _EVENT_LOG
+    if log is None or log.path != _LOG_FILE or log.max_bytes != _MAX_BYTES or log.keep != _KEEP:
+        log = _EVENT_LOG = EventLog(_LOG_FILE, max_bytes=_MAX_BYTES, keep=_KEEP)
+    return log
+
+
+def event_log() -> EventLog:
+    """Индексированный журнал events.log (+ сжатые сегменты) для tail/replay."""
+    with _WRITE_LOCK:
+        return _event_log()
+
+
+def _write_batch(lines: List[str]) -> None:
+    """Одна запись на пачку + индекс и ротация; выполняется в потоке, не на event loop."""
+    with _WRITE_LOCK:
+        _event_log().append(lines)
+
+
+def _drain_ring() -> List[str]:
+    lines: List[str] = []
+    while _RING:
+        lines.append(_RING.popleft())
+    return lines
+
+
+def _write_local(e: Dict[str, Any], line: str | None = None) -> None:
+    """Поставить событие в буфер events.log (диск не трогаем); ``line`` — готовый JSON события."""
+    global _DROPPED
+    if len(_RING) == _RING_MAX:
+        _DROPPED += 1
+    _RING.append((line if line is not None else json.dumps(e, ensure_ascii=False)) + "\n")
+    if _WRITER_WAKE is not None and len(_RING) >= _FLUSH_LINES:
+        _WRITER_WAKE.set()
+
+
+async def _writer_loop() -> None:
+    """Фоновый писатель events.log: сбрасывает кольцо по порогу размера или времени."""
+    assert _WRITER_WAKE is not None
+    while True:
+        try:
+            await asyncio.wait_for(_WRITER_WAKE.wait(), timeout=_FLUSH_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        _WRITER_WAKE.clear()
+        lines = _drain_ring()
+        if lines:
+            try:
+                # при отмене поток всё равно допишет пачку, поэтому строки в кольцо не возвращаем
+                await asyncio.to_thread(_write_batch, lines)
+            except Exception:
+                pass
+        if _WRITER_STOP:
+            return
+
+
+def _ensure_writer() -> None:
+    global _WRITER_TASK, _WRITER_WAKE, _WRITER_STOP
+    if _WRITER_TASK is None or _WRITER_TASK.done():
+        _WRITER_STOP = False
+        _WRITER_WAKE = asyncio.Event()
+        _WRITER_TASK = asyncio.create_task(_writer_loop(), name="adaos-observe-writer")
+
+
+async def flush_local() -> None:
+    """Сбросить буфер events.log на диск (перед чтением лога и при остановке)."""
+    lines = _drain_ring()
+    if lines:
+        await asyncio.to_thread(_write_batch, lines)
+
+
+def writer_stats() -> Dict[str, Any]:
+    return {"buffered": len(_RING), "dropped": _DROPPED, "running": bool(_WRITER_TASK and not _WRITER_TASK.done())}
 
 
 async def _push_loop():
@@ -172,8 +352,11 @@ async def _emit_wrapper(topic: str, payload: Dict[str, Any], **kwargs):
     res = await _ORIG_EMIT(topic, payload, **kwargs)
     event = _serialize_event(topic, payload, kwargs)
     conf = load_config()
-    _write_local(event)
-    await BROADCAST.publish(event)
+    _ensure_writer()
+    # одна сериализация на событие: строка уходит и в events.log, и во все SSE-потоки
+    line = json.dumps(event, ensure_ascii=False)
+    _write_local(event, line)
+    await BROADCAST.publish(event, line)
     if conf.role == "member" and _QUEUE:
         try:
             _QUEUE.put_nowait(event)
@@ -203,6 +386,7 @@ async def start_observer():
 
     _ORIG_EMIT = bus_module.emit
     bus_module.emit = _emit_wrapper  # type: ignore
+    _ensure_writer()
 
     conf = load_config()
     if conf.role == "member":
@@ -212,8 +396,19 @@ async def start_observer():
 
 
 async def stop_observer():
-    """Отключить фоновые задачи и вернуть оригинальный emit."""
-    global _ORIG_EMIT, _LOG_TASK, _QUEUE
+    """Отключить фоновые задачи, дописать буфер events.log и вернуть оригинальный emit."""
+    global _ORIG_EMIT, _LOG_TASK, _QUEUE, _WRITER_TASK, _WRITER_STOP
+    if _WRITER_TASK:
+        # мягкая остановка: писатель сбрасывает текущую пачку и выходит
+        _WRITER_STOP = True
+        if _WRITER_WAKE is not None:
+            _WRITER_WAKE.set()
+        try:
+            await asyncio.wait_for(_WRITER_TASK, timeout=5.0)
+        except BaseException:
+            pass
+        _WRITER_TASK = None
+    await flush_local()
     if _LOG_TASK:
         _LOG_TASK.cancel()
         try:
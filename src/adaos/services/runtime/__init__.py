@@ -1,4 +1,5 @@
 # src/adaos/services/runtime/__init__.py
 from .manager import AsyncProcessManager, ProcState
+from .tool_executor import ExecPolicy, ToolExecutor
 
-__all__ = ["AsyncProcessManager", "ProcState"]
+__all__ = ["AsyncProcessManager", "ProcState", "ExecPolicy", "ToolExecutor"]
@@ -7,17 +7,37 @@ import time
 import uuid
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from adaos.domain import Event, ProcessSpec
 from adaos.ports import EventBus, Process
 from adaos.services.eventbus import emit
+from adaos.services.metrics import REGISTRY as METRICS
+from adaos.services.sandbox.streams import LineSplitter, OutputCapture, OutputLine, OutputPublisher
+
+_READ_CHUNK = 64 * 1024
+_DRAIN_GRACE_S = 1.0  # после выхода процесса дочитываем pipe, который могли унаследовать его потомки
+
+_RESTARTS = METRICS.counter("adaos_proc_restarts_total", "Supervised process restarts after a crash, by process name", ("name",))
+_CRASH_LOOPS = METRICS.counter("adaos_proc_crash_loops_total", "Supervised processes given up on after too many restarts", ("name",))
 
 
 def _gen_handle() -> str:
     return uuid.uuid4().hex
 
 
+def _offer(q: asyncio.Queue, item: Any) -> None:
+    """put без ожидания: при переполнении подписчика выбрасываем самую старую строку."""
+    try:
+        q.put_nowait(item)
+    except asyncio.QueueFull:
+        try:
+            q.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        q.put_nowait(item)
+
+
 class ProcState(str, Enum):
     INIT = "init"
     STARTING = "starting"
@@ -40,6 +60,10 @@ class _Record:
     # итог выполнения
     returncode: Optional[int] = None
     error: Optional[str] = None
+    # хвосты вывода (общие для всех перезапусков) и подписчики output()
+    stdout: OutputCapture = field(default_factory=OutputCapture)
+    stderr: OutputCapture = field(default_factory=OutputCapture)
+    listeners: List[asyncio.Queue] = field(default_factory=list)
 
 
 class AsyncProcessManager(Process):
@@ -48,6 +72,9 @@ class AsyncProcessManager(Process):
       - поддерживает либо внешнюю команду (spec.cmd), либо корутину (spec.entrypoint)
       - публикует события в EventBus: proc.starting|running|stopping|stopped|exited|restart|error
       - минимальный anti-crash: backoff + ограничение перезапусков
+      - stdout/stderr внешней команды вычитываются всегда (процесс не встанет на полном pipe):
+        хвост до ``max_capture`` символов на поток — в output_tail(), строки — в output()
+        и событиями proc.stdout|proc.stderr (не чаще ``output_rate`` строк в секунду)
     """
 
     def __init__(
@@ -59,6 +86,10 @@ class AsyncProcessManager(Process):
         backoff_base: float = 0.5,
         backoff_max: float = 5.0,
         crash_window_s: float = 10.0,
+        max_capture: Optional[int] = 64 * 1024,
+        publish_output: bool = True,
+        output_rate: float = 50.0,
+        output_burst: int = 200,
     ) -> None:
         self._bus = bus
         self._records: Dict[str, _Record] = {}
@@ -68,6 +99,10 @@ class AsyncProcessManager(Process):
         self._backoff_base = backoff_base
         self._backoff_max = backoff_max
         self._crash_window_s = crash_window_s
+        self._max_capture = max_capture
+        self._publish_output = publish_output
+        self._output_rate = output_rate
+        self._output_burst = output_burst
 
     # ---------- API ----------
 
@@ -79,6 +114,8 @@ class AsyncProcessManager(Process):
             spec=spec,
             state=ProcState.STARTING,
             last_start_ts=time.time(),
+            stdout=OutputCapture(self._max_capture),
+            stderr=OutputCapture(self._max_capture),
         )
         self._records[handle] = rec
         # событие до фактического запуска — тест ожидает минимум "starting"
@@ -129,9 +166,47 @@ class AsyncProcessManager(Process):
         rec = self._records.get(handle)
         return rec.state.value if rec else ProcState.ERROR.value
 
+    def output_tail(self, handle: str) -> Dict[str, Any]:
+        """Сохранённый хвост stdout/stderr процесса (с пометкой усечения, если вывод превысил лимит)."""
+        rec = self._records.get(handle)
+        if rec is None:
+            return {}
+        return {
+            "stdout": rec.stdout.value(),
+            "stderr": rec.stderr.value(),
+            "truncated": {"stdout": rec.stdout.truncated, "stderr": rec.stderr.truncated},
+        }
+
+    async def output(self, handle: str, *, buffer: int = 1000) -> AsyncIterator[OutputLine]:
+        """
+        Строки stdout/stderr процесса по мере появления (начиная с момента подписки) до его
+        окончательной остановки. Если подписчик отстал больше чем на ``buffer`` строк, старые выбрасываются.
+        """
+        rec = self._records.get(handle)
+        if rec is None or rec.state in (ProcState.STOPPED, ProcState.ERROR):
+            return
+        q: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+        rec.listeners.append(q)
+        try:
+            while True:
+                item = await q.get()
+                if item is None:
+                    return
+                yield item
+        finally:
+            if q in rec.listeners:
+                rec.listeners.remove(q)
+
     # ---------- внутренняя логика ----------
 
     async def _supervise(self, rec: _Record) -> None:
+        try:
+            await self._supervise_loop(rec)
+        finally:
+            for q in rec.listeners:
+                _offer(q, None)
+
+    async def _supervise_loop(self, rec: _Record) -> None:
         restarts = 0
         while True:
             rec.state = ProcState.STARTING
@@ -200,6 +275,7 @@ class AsyncProcessManager(Process):
             if restarts > self._max_restarts:
                 rec.state = ProcState.ERROR
                 rec.error = f"crash_loop: restarts>{self._max_restarts}"
+                _CRASH_LOOPS.labels(rec.name or "-").inc()
                 emit(
                     self._bus,
                     "proc.error",
@@ -214,6 +290,7 @@ class AsyncProcessManager(Process):
 
             # backoff
             delay = min(self._backoff_base * (2 ** (restarts - 1)), self._backoff_max)
+            _RESTARTS.labels(rec.name or "-").inc()
             emit(
                 self._bus,
                 "proc.restart",
@@ -229,13 +306,56 @@ class AsyncProcessManager(Process):
 
     async def _wait_subprocess(self, rec: _Record) -> None:
         assert rec.proc is not None
-        # опционально: можно читать stdout/stderr и слать события proc.stdout/stderr
-        await rec.proc.wait()
+        publisher = None
+        if self._publish_output:
+            publisher = OutputPublisher(
+                self._bus, {"handle": rec.handle, "name": rec.name}, source="runtime", rate=self._output_rate, burst=self._output_burst
+            )
+        readers = [
+            asyncio.create_task(self._pump(rec, "stdout", rec.proc.stdout, rec.stdout, publisher)),
+            asyncio.create_task(self._pump(rec, "stderr", rec.proc.stderr, rec.stderr, publisher)),
+        ]
+        try:
+            await rec.proc.wait()
+            _, pending = await asyncio.wait(readers, timeout=_DRAIN_GRACE_S)
+            for t in pending:
+                t.cancel()
+        finally:
+            for t in readers:
+                if not t.done():
+                    t.cancel()
+            if publisher is not None:
+                publisher.close()
         rec.returncode = rec.proc.returncode
         # если нас не переводили в STOPPING — это незапланированное завершение
         if rec.state == ProcState.RUNNING:
             rec.state = ProcState.ERROR if (rec.returncode or 0) != 0 else ProcState.STOPPED
 
+    async def _pump(
+        self,
+        rec: _Record,
+        stream: str,
+        reader: Optional[asyncio.StreamReader],
+        capture: OutputCapture,
+        publisher: Optional[OutputPublisher],
+    ) -> None:
+        if reader is None:
+            return
+        splitter = LineSplitter()
+        while True:
+            chunk = await reader.read(_READ_CHUNK)
+            lines = splitter.feed(chunk) if chunk else splitter.flush()
+            for line in lines:
+                capture.feed(line)
+                if publisher is not None:
+                    publisher(stream, line)
+                if rec.listeners:
+                    item = OutputLine(stream, line)
+                    for q in rec.listeners:
+                        _offer(q, item)
+            if not chunk:
+                return
+
     async def _run_entrypoint(self, rec: _Record) -> None:
         assert rec.spec.entrypoint is not None
         try:
@@ -0,0 +1,228 @@
+# src/adaos/services/runtime/tool_executor.py
+# исполнение инструментов навыков по политике: inline / пул потоков / пул процессов
+from __future__ import annotations
+import asyncio, contextvars, importlib.util, inspect, multiprocessing, os, threading, time, weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+
+class ExecPolicy(str, Enum):
+    INLINE = "inline"  # прямо в event loop (async-инструменты и заведомо быстрые sync)
+    THREAD = "thread"  # ограниченный пул потоков — блокирующий IO (git, sqlite, файлы, TTS)
+    PROCESS = "process"  # пул процессов — CPU-bound; функция переимпортируется в воркере по пути модуля
+
+
+def resolve_policy(fn: Callable[..., Any], meta: Mapping[str, Any] | None) -> ExecPolicy:
+    """Политика из метаданных @tool(execution=...); по умолчанию async — inline, sync — thread."""
+    declared = (meta or {}).get("execution")
+    if declared:
+        return ExecPolicy(declared)
+    return ExecPolicy.INLINE if inspect.iscoroutinefunction(fn) else ExecPolicy.THREAD
+
+
+@dataclass(slots=True)
+class ToolStats:
+    calls: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    queue_s_total: float = 0.0
+    queue_s_max: float = 0.0
+    run_s_total: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        done = max(self.calls, 1)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "queue_ms_avg": self.queue_s_total * 1000 / done,
+            "queue_ms_max": self.queue_s_max * 1000,
+            "run_ms_avg": self.run_s_total * 1000 / done,
+        }
+
+
+# ---------- воркер пула процессов ----------
+
+# (файл, имя модуля) -> ((mtime_ns, size) файла при импорте, модуль)
+_CHILD_MODULES: Dict[Tuple[str, str], Tuple[Tuple[int, int], ModuleType]] = {}
+
+
+def _child_module(module_file: str, module_name: str) -> ModuleType:
+    # как таблицы tool_bridge: изменился файл — модуль переимпортируется и в воркере
+    st = os.stat(module_file)
+    sig = (st.st_mtime_ns, st.st_size)
+    cached = _CHILD_MODULES.get((module_file, module_name))
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+    spec = importlib.util.spec_from_file_location(module_name, module_file)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot import {module_file}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _CHILD_MODULES[(module_file, module_name)] = (sig, module)
+    return module
+
+
+def _set_child_skill(module_file: str) -> None:
+    # текущий навык воркера — владелец handlers/main.py (как в мосте: skills_dir/<skill>)
+    from adaos.services.agent_context import get_ctx
+
+    try:
+        ctx = get_ctx()
+    except RuntimeError:  # пул без инициализатора контекста
+        return
+    skill_dir = Path(module_file).parent.parent
+    ctx.skill_ctx.set(skill_dir.name, skill_dir)
+
+
+def _process_call(module_file: str, module_name: str, attr: str, args: Dict[str, Any]) -> Any:
+    """Выполняется в процессе пула: модуль навыка импортируется один раз на версию файла."""
+    module = _child_module(module_file, module_name)
+    _set_child_skill(module_file)
+    result = getattr(module, attr)(**args)
+    if inspect.isawaitable(result):
+        result = asyncio.run(result)
+    return result
+
+
+class ToolExecutor:
+    """
+    Запускает инструменты по ExecPolicy. Пулы создаются лениво и ограничены: число одновременно
+    отданных в пул задач не превышает числа воркеров, остальные ждут в event loop — это время
+    учитывается как queue time. ``max_concurrency`` из метаданных @tool ограничивает параллелизм
+    конкретного инструмента.
+
+    Процессы пула — spawn, contextvars родителя туда не попадают: ``process_initializer``
+    (например, сборка AgentContext) вызывается в каждом воркере один раз при старте.
+    """
+
+    def __init__(
+        self,
+        *,
+        thread_workers: int = 8,
+        process_workers: int = 2,
+        process_initializer: Optional[Callable[..., None]] = None,
+        process_initargs: Sequence[Any] = (),
+    ):
+        self.thread_workers = max(int(thread_workers), 1)
+        self.process_workers = max(int(process_workers), 1)
+        self.process_initializer = process_initializer
+        self.process_initargs = tuple(process_initargs)
+        self._lock = threading.Lock()
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        # семафоры живут в конкретном loop: loop -> {ключ -> Semaphore}
+        self._sems: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+        self._stats: Dict[str, ToolStats] = {}
+
+    # ---------- пулы ----------
+
+    def _pool(self, policy: ExecPolicy) -> Executor:
+        with self._lock:
+            if policy is ExecPolicy.PROCESS:
+                if self._processes is None:
+                    # spawn: форк процесса с потоками uvicorn/пулов небезопасен
+                    self._processes = ProcessPoolExecutor(
+                        self.process_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=self.process_initializer,
+                        initargs=self.process_initargs,
+                    )
+                return self._processes
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(self.thread_workers, thread_name_prefix="adaos-tool")
+            return self._threads
+
+    def _sem(self, key: str, size: int) -> asyncio.Semaphore:
+        per_loop = self._sems.setdefault(asyncio.get_running_loop(), {})
+        sem = per_loop.get(key)
+        if sem is None:
+            sem = per_loop[key] = asyncio.Semaphore(size)
+        return sem
+
+    # ---------- вызов ----------
+
+    async def run(
+        self,
+        key: str,
+        fn: Callable[..., Any],
+        args: Mapping[str, Any],
+        *,
+        meta: Mapping[str, Any] | None = None,
+        module_file: Optional[Path] = None,
+    ) -> Any:
+        """
+        Вызвать ``fn(**args)`` по политике инструмента. ``key`` — имя для лимитов и статистики
+        (например, "<skill>:<tool>"); ``module_file`` нужен для политики process.
+        """
+        policy = resolve_policy(fn, meta)
+        limit = (meta or {}).get("max_concurrency")
+        stats = self._stats.setdefault(key, ToolStats())
+        queued = time.perf_counter()
+        stats.in_flight += 1
+        try:
+            tool_sem = self._sem(f"tool:{key}", int(limit)) if limit else None
+            if tool_sem is not None:
+                await tool_sem.acquire()
+            try:
+                if policy is ExecPolicy.INLINE:
+                    started = self._started(stats, queued)
+                    result = fn(**args)
+                    if inspect.isawaitable(result):
+                        result = await result
+                else:
+                    async with self._sem(f"pool:{policy.value}", self.process_workers if policy is ExecPolicy.PROCESS else self.thread_workers):
+                        started = self._started(stats, queued)
+                        result = await self._submit(policy, fn, dict(args), module_file)
+            finally:
+                if tool_sem is not None:
+                    tool_sem.release()
+        except BaseException:
+            stats.errors += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+        stats.run_s_total += time.perf_counter() - started
+        return result
+
+    @staticmethod
+    def _started(stats: ToolStats, queued: float) -> float:
+        now = time.perf_counter()
+        waited = now - queued
+        stats.calls += 1
+        stats.queue_s_total += waited
+        if waited > stats.queue_s_max:
+            stats.queue_s_max = waited
+        return now
+
+    async def _submit(self, policy: ExecPolicy, fn: Callable[..., Any], args: Dict[str, Any], module_file: Optional[Path]) -> Any:
+        loop = asyncio.get_running_loop()
+        if policy is ExecPolicy.PROCESS:
+            if module_file is None:
+                raise ValueError("process execution requires the tool's module file")
+            return await loop.run_in_executor(self._pool(policy), _process_call, str(module_file), fn.__module__, fn.__name__, args)
+
+        def _call() -> Any:
+            result = fn(**args)
+            if inspect.isawaitable(result):  # async-инструмент, явно отправленный в поток
+                result = asyncio.run(result)
+            return result
+
+        # contextvars (AgentContext, текущий навык) должны быть видны и в потоке пула
+        return await loop.run_in_executor(self._pool(policy), contextvars.copy_context().run, _call)
+
+    # ---------- служебное ----------
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {key: s.as_dict() for key, s in self._stats.items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            pools, self._threads, self._processes = (self._threads, self._processes), None, None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,464 @@
+# \src\adaos\services\sandbox\monitor.py
+# общий монитор лимитов для всех процессов песочницы: один поток, адаптивный опрос,
+# учёт через cgroup v2 (если делегирован), завершение через pidfd
+from __future__ import annotations
+import heapq, itertools, os, selectors, threading, time, uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import psutil
+
+from adaos.ports.sandbox import ExecLimits
+
+_MIN_INTERVAL = 0.02
+_MAX_INTERVAL = 1.0
+_FIRST_INTERVAL = 0.05
+_CGROUP_FS = Path("/sys/fs/cgroup")
+
+
+def _kill_tree(proc: psutil.Process) -> None:
+    try:
+        children = proc.children(recursive=True)
+        for c in children:
+            try:
+                c.kill()
+            except Exception:
+                pass
+        proc.kill()
+    except Exception:
+        pass
+
+
+def _children_map() -> Dict[int, List[int]]:
+    """ppid -> [pid] по всей системе: один проход на пачку замеров вместо children(recursive) на каждый."""
+    out: Dict[int, List[int]] = {}
+    for pr in psutil.process_iter(["ppid"]):
+        ppid = pr.info.get("ppid")
+        if ppid is not None:
+            out.setdefault(ppid, []).append(pr.pid)
+    return out
+
+
+def _descendants(pid: int, children_of: Dict[int, List[int]]) -> List[int]:
+    out = [pid]
+    i = 0
+    while i < len(out):
+        out.extend(children_of.get(out[i], ()))
+        i += 1
+    return out
+
+
+# ---------- cgroup v2 ----------
+
+
+def _read_int(path: Path) -> Optional[int]:
+    try:
+        raw = path.read_text().split()
+    except OSError:
+        return None
+    try:
+        return int(raw[0]) if raw else None
+    except ValueError:
+        return None
+
+
+def _cpu_usage_sec(cg: Path) -> Optional[float]:
+    try:
+        for line in (cg / "cpu.stat").read_text().splitlines():
+            name, _, value = line.partition(" ")
+            if name == "usage_usec":
+                return int(value) / 1e6
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+_CG_PARENT: Optional[Path] = None
+_CG_PROBED = False
+_CG_LOCK = threading.Lock()
+
+
+def _cgroup_parent() -> Optional[Path]:
+    """
+    Каталог cgroup v2, в котором можно создавать под-группы для песочниц, или None.
+    Берётся из ADAOS_SANDBOX_CGROUP либо из собственной группы процесса (делегированной,
+    например, systemd ``Delegate=yes``); нужен контроллер memory в cgroup.subtree_control.
+    """
+    global _CG_PARENT, _CG_PROBED
+    with _CG_LOCK:
+        if _CG_PROBED:
+            return _CG_PARENT
+        _CG_PROBED = True
+        if os.name != "posix" or not (_CGROUP_FS / "cgroup.controllers").is_file():
+            return None  # нет unified-иерархии (v1 или hybrid)
+        candidate: Optional[Path] = None
+        override = os.getenv("ADAOS_SANDBOX_CGROUP")
+        if override:
+            candidate = Path(override)
+        else:
+            try:
+                for line in Path("/proc/self/cgroup").read_text().splitlines():
+                    if line.startswith("0::"):
+                        candidate = _CGROUP_FS / line[3:].lstrip("/")
+            except OSError:
+                return None
+        if candidate is None:
+            return None
+        try:
+            controllers = (candidate / "cgroup.subtree_control").read_text().split()
+        except OSError:
+            return None
+        if "memory" not in controllers or not os.access(candidate, os.W_OK):
+            return None
+        _CG_PARENT = candidate
+        return candidate
+
+
+class SandboxCgroup:
+    """Под-группа cgroup v2 на один запуск: memory.max, учёт CPU по cpu.stat и пик памяти."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    @classmethod
+    def create(cls, limits: ExecLimits) -> Optional["SandboxCgroup"]:
+        parent = _cgroup_parent()
+        if parent is None:
+            return None
+        path = parent / f"adaos-sandbox-{uuid.uuid4().hex[:12]}"
+        try:
+            path.mkdir()
+            if limits.max_rss_mb:
+                (path / "memory.max").write_text(str(int(limits.max_rss_mb) * 1024 * 1024))
+                try:
+                    (path / "memory.swap.max").write_text("0")
+                except OSError:
+                    pass
+        except OSError:
+            try:
+                path.rmdir()
+            except OSError:
+                pass
+            return None
+        return cls(path)
+
+    def enter(self) -> None:
+        """Вызывается в дочернем процессе до exec(): все потомки наследуют группу."""
+        with open(self.path / "cgroup.procs", "w") as f:
+            f.write(str(os.getpid()))
+
+    def cpu_sec(self) -> Optional[float]:
+        return _cpu_usage_sec(self.path)
+
+    def memory_bytes(self) -> Optional[int]:
+        return _read_int(self.path / "memory.current")
+
+    def peak_bytes(self) -> Optional[int]:
+        return _read_int(self.path / "memory.peak")
+
+    def oom_killed(self) -> bool:
+        try:
+            for line in (self.path / "memory.events").read_text().splitlines():
+                name, _, value = line.partition(" ")
+                if name == "oom_kill" and int(value) > 0:
+                    return True
+        except (OSError, ValueError):
+            pass
+        return False
+
+    def kill(self) -> bool:
+        try:
+            (self.path / "cgroup.kill").write_text("1")
+            return True
+        except OSError:
+            return False
+
+    def remove(self) -> None:
+        for _ in range(50):
+            try:
+                self.path.rmdir()
+                return
+            except FileNotFoundError:
+                return
+            except OSError:
+                # группа ещё не опустела (потомки завершаются)
+                self.kill()
+                time.sleep(0.01)
+
+
+# ---------- монитор ----------
+
+
+@dataclass
+class Watch:
+    """Наблюдение за одним процессом. Итог — ``timed_out``/``killed_reason``/``peak_rss``."""
+
+    pid: int
+    limits: ExecLimits
+    cgroup: Optional[SandboxCgroup] = None
+    started: float = field(default_factory=time.monotonic)
+    timed_out: bool = False
+    killed_reason: Optional[str] = None
+    cpu_sec: float = 0.0
+    peak_rss: int = 0
+    samples: int = 0
+    interval: float = _FIRST_INTERVAL
+    active: bool = True
+    _proc: Optional[psutil.Process] = None
+    _pidfd: Optional[int] = None
+    _last: Tuple[float, float] = (0.0, 0.0)  # (monotonic, cpu_sec) предыдущего замера
+
+    @property
+    def deadline(self) -> Optional[float]:
+        wall = self.limits.wall_time_sec
+        return None if wall is None else self.started + wall
+
+    @property
+    def sampled(self) -> bool:
+        """Нужен ли опрос ресурсов (если есть только wall-time — достаточно таймера)."""
+        return self.limits.cpu_time_sec is not None or self.limits.max_rss_mb is not None
+
+
+class SandboxMonitor:
+    """
+    Один поток на все процессы песочницы. Вместо опроса каждые 50 мс на процесс:
+
+    - wall-time — точный таймер по куче дедлайнов;
+    - CPU/RSS — замер с адаптивным интервалом: далеко от лимита интервал растёт до
+      ``max_interval``, вблизи — сжимается до ``min_interval``; для CPU интервал ещё
+      ограничен прогнозом времени до исчерпания лимита по текущей скорости;
+    - в cgroup v2 замер — чтение cpu.stat/memory.current (учитываются и завершившиеся
+      потомки), memory.max ограничивает память ядром; без cgroup таблица ppid строится
+      один раз на пробуждение и общая для всех песочниц, чьи замеры совпали по времени;
+    - завершение процесса — по pidfd (Linux 5.3+), без ожидания следующего замера.
+      Процесс не reap-ится: его код возврата забирает владелец Popen.
+    """
+
+    def __init__(self, *, min_interval: float = _MIN_INTERVAL, max_interval: float = _MAX_INTERVAL):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._lock = threading.Lock()
+        self._watches: Dict[int, Watch] = {}
+        self._heap: List[Tuple[float, int, int]] = []  # (когда, seq, pid)
+        self._seq = itertools.count()
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self._thread: Optional[threading.Thread] = None
+        self.samples = 0
+        self.wakeups = 0
+        self.cpu_sec = 0.0  # CPU-время, потраченное самим монитором
+
+    # ---------- регистрация ----------
+
+    def watch(self, pid: int, limits: ExecLimits, *, cgroup: Optional[SandboxCgroup] = None) -> Watch:
+        w = Watch(pid=pid, limits=limits, cgroup=cgroup)
+        try:
+            w._proc = psutil.Process(pid)
+        except psutil.Error:
+            w.active = False
+            return w
+        pidfd_open = getattr(os, "pidfd_open", None)
+        if pidfd_open is not None:
+            try:
+                w._pidfd = pidfd_open(pid)
+            except OSError:
+                w._pidfd = None
+        with self._lock:
+            self._watches[pid] = w
+            if w._pidfd is not None:
+                self._selector.register(w._pidfd, selectors.EVENT_READ, pid)
+            if w.deadline is not None:
+                heapq.heappush(self._heap, (w.deadline, next(self._seq), pid))
+            if w.sampled:
+                heapq.heappush(self._heap, (w.started + w.interval, next(self._seq), pid))
+            self._ensure_thread()
+        self._wake()
+        return w
+
+    def unwatch(self, w: Watch) -> None:
+        """Процесс завершён (или больше не интересен) — снять с наблюдения."""
+        with self._lock:
+            self._drop(w)
+
+    def _drop(self, w: Watch) -> None:
+        # под self._lock; записи в куче для снятого pid отбрасываются лениво
+        w.active = False
+        if self._watches.get(w.pid) is w:
+            del self._watches[w.pid]
+        if w._pidfd is not None:
+            try:
+                self._selector.unregister(w._pidfd)
+            except (KeyError, ValueError):
+                pass
+            os.close(w._pidfd)
+            w._pidfd = None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="adaos-sandbox-monitor", daemon=True)
+            self._thread.start()
+
+    def _wake(self) -> None:
+        try:
+            os.write(self._wake_w, b"x")
+        except (BlockingIOError, OSError):
+            pass
+
+    # ---------- цикл ----------
+
+    def _loop(self) -> None:
+        while True:
+            with self._lock:
+                timeout = None
+                while self._heap and self._heap[0][2] not in self._watches:
+                    heapq.heappop(self._heap)
+                if self._heap:
+                    timeout = max(0.0, self._heap[0][0] - time.monotonic())
+                elif not self._watches:
+                    timeout = 5.0
+            events = self._selector.select(timeout)
+            started = time.thread_time()
+            self.wakeups += 1
+            for key, _ in events:
+                if key.data is None:
+                    try:
+                        while os.read(self._wake_r, 4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                    continue
+                with self._lock:
+                    w = self._watches.get(key.data)
+                    if w is not None:
+                        self._drop(w)  # pidfd readable: процесс завершился
+            self._due()
+            self.cpu_sec += time.thread_time() - started
+
+    def _due(self) -> None:
+        # сроки ближе slack обрабатываем в этом же пробуждении: замеры разных песочниц
+        # схлопываются, и дерево процессов строится один раз на пачку
+        now = time.monotonic()
+        horizon = now + self.min_interval / 2
+        due: Dict[int, Watch] = {}
+        with self._lock:
+            while self._heap and self._heap[0][0] <= horizon:
+                _, _, pid = heapq.heappop(self._heap)
+                w = self._watches.get(pid)
+                if w is not None and w.active:
+                    due[pid] = w
+        if not due:
+            return
+        children_of: Optional[Dict[int, List[int]]] = None
+        for w in due.values():
+            deadline = w.deadline
+            if deadline is not None and now >= deadline:
+                self._kill(w, "wall_time_exceeded")
+                continue
+            if not w.sampled:
+                continue
+            try:
+                if w.cgroup is None and children_of is None:
+                    children_of = _children_map()
+                self._sample(w, now, children_of)
+            except Exception:
+                # замер упал: безопаснее завершить процесс, чем оставить его без лимитов
+                self._kill(w, "monitor_error")
+                continue
+            if w.active:
+                with self._lock:
+                    if self._watches.get(w.pid) is w:
+                        heapq.heappush(self._heap, (now + w.interval, next(self._seq), w.pid))
+
+    def _sample(self, w: Watch, now: float, children_of: Optional[Dict[int, List[int]]] = None) -> None:
+        self.samples += 1
+        w.samples += 1
+        limits = w.limits
+        cpu: Optional[float] = None
+        rss: Optional[int] = None
+        if w.cgroup is not None:
+            cpu = w.cgroup.cpu_sec()
+            rss = w.cgroup.memory_bytes()
+            w.peak_rss = max(w.peak_rss, w.cgroup.peak_bytes() or 0)
+            if w.cgroup.oom_killed():
+                self._kill(w, "rss_exceeded")
+                return
+        if cpu is None or rss is None:
+            try:
+                if w._proc.status() == psutil.STATUS_ZOMBIE:
+                    with self._lock:
+                        self._drop(w)
+                    return
+            except psutil.NoSuchProcess:
+                with self._lock:
+                    self._drop(w)
+                return
+            total_cpu = 0.0
+            max_rss = 0
+            for pid in _descendants(w.pid, children_of or {}):
+                try:
+                    pr = w._proc if pid == w.pid else psutil.Process(pid)
+                    with pr.oneshot():
+                        t = pr.cpu_times()
+                        total_cpu += t.user + t.system
+                        max_rss = max(max_rss, pr.memory_info().rss)
+                except psutil.Error:
+                    pass
+            cpu = total_cpu if cpu is None else cpu
+            rss = max_rss if rss is None else rss
+
+        w.cpu_sec = max(w.cpu_sec, cpu)
+        w.peak_rss = max(w.peak_rss, rss)
+        if limits.cpu_time_sec is not None and cpu > limits.cpu_time_sec:
+            self._kill(w, "cpu_time_exceeded")
+            return
+        if limits.max_rss_mb is not None and rss > limits.max_rss_mb * 1024 * 1024:
+            self._kill(w, "rss_exceeded")
+            return
+        w.interval = self._next_interval(w, now, cpu, rss)
+        w._last = (now, cpu)
+
+    def _next_interval(self, w: Watch, now: float, cpu: float, rss: int) -> float:
+        interval = min(w.interval * 1.5, self.max_interval)
+        limits = w.limits
+        if limits.cpu_time_sec is not None:
+            last_t, last_cpu = w._last
+            rate = (cpu - last_cpu) / (now - last_t) if last_t and now > last_t else 1.0
+            if rate > 0:
+                # успеть замерить хотя бы дважды до исчерпания лимита
+                interval = min(interval, (limits.cpu_time_sec - cpu) / rate / 2)
+        if limits.max_rss_mb is not None and rss > limits.max_rss_mb * 1024 * 1024 * 0.8:
+            interval = self.min_interval
+        deadline = w.deadline
+        if deadline is not None:
+            interval = min(interval, max(deadline - now, 0.0) + self.min_interval)
+        return max(interval, self.min_interval)
+
+    def _kill(self, w: Watch, reason: str) -> None:
+        w.timed_out = True
+        w.killed_reason = reason
+        if w.cgroup is None or not w.cgroup.kill():
+            if w._proc is not None:
+                _kill_tree(w._proc)
+        with self._lock:
+            self._drop(w)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            active = len(self._watches)
+        return {"active": active, "samples": self.samples, "wakeups": self.wakeups, "cpu_sec": self.cpu_sec}
+
+
+_MONITOR: Optional[SandboxMonitor] = None
+_MONITOR_LOCK = threading.Lock()
+
+
+def shared_monitor() -> SandboxMonitor:
+    """Процессный монитор, общий для всех ProcSandbox."""
+    global _MONITOR
+    with _MONITOR_LOCK:
+        if _MONITOR is None:
+            _MONITOR = SandboxMonitor()
+        return _MONITOR
@@ -1,27 +1,18 @@
 # \src\adaos\services\sandbox\runner.py
 from __future__ import annotations
-import os, sys, time, subprocess, threading
+import asyncio, os, sys, subprocess, threading
+from functools import partial
 from pathlib import Path
-from typing import Mapping, Sequence, Optional, List
-from dataclasses import dataclass
 import psutil
+from typing import Any, Mapping, Sequence, Optional, List
 
 from adaos.ports.sandbox import Sandbox, ExecLimits, ExecResult
+from adaos.services.sandbox.monitor import SandboxCgroup, SandboxMonitor, _kill_tree, shared_monitor
+from adaos.services.sandbox.streams import MAX_LINE, LineSplitter, OnOutput, OutputCapture, OutputStream, fan_out
 
 _IS_POSIX = os.name == "posix"
-
-
-def _kill_tree(proc: psutil.Process) -> None:
-    try:
-        children = proc.children(recursive=True)
-        for c in children:
-            try:
-                c.kill()
-            except Exception:
-                pass
-        proc.kill()
-    except Exception:
-        pass
+_READ_CHUNK = 64 * 1024
+STREAM_MAX_CAPTURE = 1024 * 1024  # stream(): строки уже отданы итератору, целиком их хранить незачем
 
 
 def _collect_output(p: subprocess.Popen) -> tuple[str, str]:
@@ -34,6 +25,40 @@ def _collect_output(p: subprocess.Popen) -> tuple[str, str]:
     return out, err
 
 
+def _pump(stream_name: str, f, capture: OutputCapture, on_output: Optional[OnOutput]) -> None:
+    """Читать поток построчно до EOF: в ограниченный захват и (если задан) в on_output."""
+    try:
+        for line in iter(partial(f.readline, MAX_LINE), f.read(0)):
+            capture.feed(line)
+            if on_output is not None:
+                try:
+                    on_output(stream_name, line if isinstance(line, str) else line.decode("utf-8", errors="replace"))
+                except Exception:
+                    pass  # сбой подписчика не должен останавливать чтение (иначе процесс встанет на полном pipe)
+    except (OSError, ValueError):
+        pass
+    finally:
+        try:
+            f.close()
+        except Exception:
+            pass
+
+
+def _stream_output(p: subprocess.Popen, *, text: bool, on_output: Optional[OnOutput], max_capture: Optional[int]) -> tuple[OutputCapture, OutputCapture]:
+    out = OutputCapture(max_capture, binary=not text)
+    err = OutputCapture(max_capture, binary=not text)
+    readers = [
+        threading.Thread(target=_pump, args=("stdout", p.stdout, out, on_output), daemon=True),
+        threading.Thread(target=_pump, args=("stderr", p.stderr, err, on_output), daemon=True),
+    ]
+    for t in readers:
+        t.start()
+    p.wait()
+    for t in readers:
+        t.join()
+    return out, err
+
+
 def _preexec_posix(limits: ExecLimits):
     # вызывается только на POSIX до exec()
     import resource
@@ -53,16 +78,63 @@ def _preexec_posix(limits: ExecLimits):
                 pass
 
 
-@dataclass
-class _MonState:
-    timed_out: bool = False
-    killed_reason: Optional[str] = None
+def _preexec_fn(limits: ExecLimits, cgroup: Optional[SandboxCgroup]):
+    if cgroup is not None:
+        # память ограничивает memory.max группы — точнее, чем RLIMIT_AS
+        limits = ExecLimits(wall_time_sec=limits.wall_time_sec, cpu_time_sec=limits.cpu_time_sec, max_rss_mb=None)
+
+    def _pe():
+        if cgroup is not None:
+            cgroup.enter()  # до exec(): потомки наследуют группу
+        _preexec_posix(limits)
+
+    return _pe
+
+
+def _safe_env(env: Optional[Mapping[str, str]]) -> Optional[dict[str, str]]:
+    # минимальный env: только безопасный поднабор системных переменных; None — унаследовать
+    if env is None:
+        return None
+    # пропускаем только строки
+    return {k: v for k, v in env.items() if isinstance(k, str) and isinstance(v, str)}
+
+
+def _spawn_mode(limits: ExecLimits) -> tuple[bool, int]:
+    """(нужен ли preexec с лимитами ядра, creationflags)."""
+    if os.name == "nt":
+        # отдельная группа процессов
+        return False, subprocess.CREATE_NEW_PROCESS_GROUP
+    return _IS_POSIX and bool(limits.cpu_time_sec or limits.max_rss_mb), 0
+
+
+def _as_bytes(stdin: Any) -> bytes:
+    return bytes(stdin) if isinstance(stdin, (bytes, bytearray)) else str(stdin).encode("utf-8")
+
+
+async def _apump(stream_name: str, reader: Optional[asyncio.StreamReader], capture: OutputCapture, on_output: Optional[OnOutput]) -> None:
+    if reader is None:
+        return
+    splitter = LineSplitter()
+    while True:
+        chunk = await reader.read(_READ_CHUNK)
+        for line in splitter.feed(chunk) if chunk else splitter.flush():
+            capture.feed(line)
+            if on_output is not None:
+                try:
+                    on_output(stream_name, line)
+                except Exception:
+                    pass
+        if not chunk:
+            return
 
 
 class ProcSandbox(Sandbox):
-    def __init__(self, *, fs_base: str):
+    def __init__(self, *, fs_base: str, monitor: Optional[SandboxMonitor] = None, use_cgroups: bool = True):
         # допускаем только запуск внутри BASE_DIR (доп. проверка; FSPolicy — отдельно)
         self._base = Path(fs_base).resolve()
+        # лимиты CPU/RSS/wall-time отслеживает общий для всех запусков монитор
+        self._monitor = monitor
+        self._use_cgroups = use_cgroups
 
     def _check_cwd(self, cwd: Optional[str]) -> None:
         if not cwd:
@@ -82,41 +154,45 @@ class ProcSandbox(Sandbox):
         limits: Optional[ExecLimits] = None,
         stdin: Optional[bytes] = None,
         text: bool = True,
+        on_output: Optional[OnOutput] = None,
+        max_capture: Optional[int] = None,
     ) -> ExecResult:
+        """
+        Запустить команду под лимитами. ``on_output(stream, line)`` получает строки stdout/stderr
+        по мере появления (из потоков-читателей); ``max_capture`` ограничивает сохраняемый вывод
+        каждого потока последними N символами (байтами при text=False).
+        """
         limits = limits or ExecLimits()
         self._check_cwd(cwd)
+        safe_env = _safe_env(env)
+        limited, creationflags = _spawn_mode(limits)
+        cgroup = SandboxCgroup.create(limits) if limited and self._use_cgroups else None
 
-        # минимальный env: только безопасный поднабор системных переменных
-        safe_env = {}
-        if env:
-            # пропускаем только строки
-            for k, v in env.items():
-                if isinstance(k, str) and isinstance(v, str):
-                    safe_env[k] = v
-
-        creationflags = 0
-        preexec = None
-        if _IS_POSIX and (limits.cpu_time_sec or limits.max_rss_mb):
-            # на POSIX установим лимиты ядром
-            def _pe():
-                _preexec_posix(limits)
-
-            preexec = _pe
-        elif os.name == "nt":
-            # отдельная группа процессов
-            creationflags = subprocess.CREATE_NEW_PROCESS_GROUP
-
-        p = subprocess.Popen(
-            cmd,
-            cwd=cwd,
-            env=safe_env if env is not None else None,
-            stdin=subprocess.PIPE if stdin is not None else None,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=text,
-            preexec_fn=preexec if _IS_POSIX else None,
-            creationflags=creationflags,
-        )
+        while True:
+            try:
+                p = subprocess.Popen(
+                    cmd,
+                    cwd=cwd,
+                    env=safe_env,
+                    stdin=subprocess.PIPE if stdin is not None else None,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=text,
+                    # на POSIX установим лимиты ядром
+                    preexec_fn=_preexec_fn(limits, cgroup) if limited else None,
+                    creationflags=creationflags,
+                )
+                break
+            except subprocess.SubprocessError:
+                if cgroup is None:
+                    raise
+                # перенести процесс в группу не дали — запускаем без cgroup
+                cgroup.remove()
+                cgroup = None
+            except BaseException:
+                if cgroup is not None:
+                    cgroup.remove()
+                raise
         if stdin is not None:
             try:
                 p.stdin.write(stdin.decode("utf-8") if isinstance(stdin, (bytes, bytearray)) else str(stdin))
@@ -128,79 +204,125 @@ class ProcSandbox(Sandbox):
                 except Exception:
                     pass
 
-        proc = psutil.Process(p.pid)
-        state = _MonState()
-
-        # мониторинг по CPU/RSS
-        def _monitor():
-            try:
-                start = time.time()
-                while True:
-                    if p.poll() is not None:
-                        return
-                    now = time.time()
-                    # wall-time
-                    if limits.wall_time_sec is not None and (now - start) > limits.wall_time_sec:
-                        state.timed_out = True
-                        state.killed_reason = "wall_time_exceeded"
-                        _kill_tree(proc)
-                        return
-                    # cpu-time (сумма по дереву)
-                    if limits.cpu_time_sec is not None:
-                        total_cpu = 0.0
-                        try:
-                            procs = [proc] + proc.children(recursive=True)
-                        except Exception:
-                            procs = [proc]
-                        for pr in procs:
-                            try:
-                                t = pr.cpu_times()
-                                total_cpu += t.user + t.system
-                            except Exception:
-                                pass
-                        if total_cpu > limits.cpu_time_sec:
-                            state.timed_out = True
-                            state.killed_reason = "cpu_time_exceeded"
-                            _kill_tree(proc)
-                            return
-                    # rss (берём максимум среди потомков)
-                    if limits.max_rss_mb is not None:
-                        max_rss = 0
-                        try:
-                            procs = [proc] + proc.children(recursive=True)
-                        except Exception:
-                            procs = [proc]
-                        for pr in procs:
-                            try:
-                                rss = pr.memory_info().rss
-                                if rss > max_rss:
-                                    max_rss = rss
-                            except Exception:
-                                pass
-                        if max_rss > limits.max_rss_mb * 1024 * 1024:
-                            state.timed_out = True
-                            state.killed_reason = "rss_exceeded"
-                            _kill_tree(proc)
-                            return
-                    time.sleep(0.05)
-            except Exception:
-                # монитор упал: лучше завершить процесс
-                try:
-                    _kill_tree(proc)
-                except Exception:
-                    pass
-                state.timed_out = True
-                state.killed_reason = state.killed_reason or "monitor_error"
-
-        mon = threading.Thread(target=_monitor, daemon=True)
-        mon.start()
-
-        out, err = _collect_output(p)
+        monitor = self._monitor or shared_monitor()
+        watch = monitor.watch(p.pid, limits, cgroup=cgroup)
+        truncated = (False, False)
+        try:
+            if on_output is None and max_capture is None:
+                out, err = _collect_output(p)
+            else:
+                out_cap, err_cap = _stream_output(p, text=text, on_output=on_output, max_capture=max_capture)
+                out, err = (v.decode("utf-8", errors="replace") if isinstance(v, bytes) else v for v in (out_cap.value(), err_cap.value()))
+                truncated = (out_cap.truncated, err_cap.truncated)
+        finally:
+            monitor.unwatch(watch)
+            if cgroup is not None:
+                cgroup.remove()
         code = p.returncode if p.returncode is not None else -9
         return ExecResult(
             exit_code=code,
             stdout=out,
             stderr=err,
-            timed_out=state.timed_out,
-            killed_reason=state.killed_reason,
+            timed_out=watch.timed_out,
+            killed_reason=watch.killed_reason,
+            stdout_truncated=truncated[0],
+            stderr_truncated=truncated[1],
+        )
+
+    async def arun(
+        self,
+        cmd: Sequence[str],
+        *,
+        cwd: Optional[str] = None,
+        env: Optional[Mapping[str, str]] = None,
+        limits: Optional[ExecLimits] = None,
+        stdin: Optional[bytes] = None,
+        text: bool = True,
+        on_output: Optional[OnOutput] = None,
+        max_capture: Optional[int] = None,
+    ) -> ExecResult:
+        """
+        Асинхронный вариант run() на asyncio-подпроцессах: event loop не блокируется, лимиты
+        так же следит общий монитор. Вывод всегда декодируется в str (как у run()); ``text``
+        принят для совместимости сигнатур. Отмена корутины убивает дерево процесса.
+        """
+        limits = limits or ExecLimits()
+        self._check_cwd(cwd)
+        limited, creationflags = _spawn_mode(limits)
+        cgroup = SandboxCgroup.create(limits) if limited and self._use_cgroups else None
+
+        while True:
+            try:
+                p = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    cwd=cwd,
+                    env=_safe_env(env),
+                    stdin=asyncio.subprocess.PIPE if stdin is not None else None,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    preexec_fn=_preexec_fn(limits, cgroup) if limited else None,
+                    creationflags=creationflags,
+                )
+                break
+            except subprocess.SubprocessError:
+                if cgroup is None:
+                    raise
+                cgroup.remove()
+                cgroup = None
+            except BaseException:
+                if cgroup is not None:
+                    cgroup.remove()
+                raise
+
+        monitor = self._monitor or shared_monitor()
+        watch = monitor.watch(p.pid, limits, cgroup=cgroup)
+        out_cap, err_cap = OutputCapture(max_capture), OutputCapture(max_capture)
+        try:
+            if stdin is not None:
+                try:
+                    p.stdin.write(_as_bytes(stdin))
+                    await p.stdin.drain()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    p.stdin.close()
+            await asyncio.gather(
+                _apump("stdout", p.stdout, out_cap, on_output),
+                _apump("stderr", p.stderr, err_cap, on_output),
+                p.wait(),
+            )
+        except BaseException:
+            # отмена/ошибка: процесс не должен пережить вызывающего
+            if p.returncode is None:
+                try:
+                    _kill_tree(psutil.Process(p.pid))
+                except psutil.Error:
+                    pass
+                try:
+                    # дождаться выхода, чтобы транспорт подпроцесса закрылся в этом же loop
+                    await asyncio.wait_for(p.wait(), timeout=5)
+                except BaseException:
+                    pass
+            raise
+        finally:
+            monitor.unwatch(watch)
+            if cgroup is not None:
+                cgroup.remove()
+        return ExecResult(
+            exit_code=p.returncode if p.returncode is not None else -9,
+            stdout=out_cap.value(),
+            stderr=err_cap.value(),
+            timed_out=watch.timed_out,
+            killed_reason=watch.killed_reason,
+            stdout_truncated=out_cap.truncated,
+            stderr_truncated=err_cap.truncated,
         )
+
+    def stream(self, cmd: Sequence[str], **kwargs) -> OutputStream[ExecResult]:
+        """
+        Запуск с итерацией по выводу: ``for item in sandbox.stream(cmd): item.stream, item.line``;
+        итог — ``.result``. kwargs — как у run(); по умолчанию захват ограничен ``max_capture``.
+        """
+        kwargs.setdefault("max_capture", STREAM_MAX_CAPTURE)
+        user_cb = kwargs.pop("on_output", None)
+        return OutputStream(lambda cb: self.run(cmd, on_output=fan_out(user_cb, cb), **kwargs))
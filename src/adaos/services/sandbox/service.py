@@ -1,14 +1,23 @@
 # \src\adaos\services\sandbox\service.py
 from __future__ import annotations
-import os, time, shlex
-from typing import Mapping, Optional, Sequence
+import asyncio, os, time, shlex, threading, weakref
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Mapping, Optional, Sequence
 from adaos.ports.sandbox import Sandbox, ExecLimits, ExecResult
 from adaos.ports import Capabilities, EventBus
 from adaos.services.sandbox.profiles import DEFAULT_PROFILES
 from adaos.services.eventbus import emit
+from adaos.services.metrics import REGISTRY as METRICS
+from adaos.services.sandbox.runner import STREAM_MAX_CAPTURE
+from adaos.services.sandbox.streams import OnOutput, OutputPublisher, OutputStream, fan_out
+from adaos.services.sandbox.workers import HandlerWorkerPool, WorkerResult
 
 _POSIX = os.name == "posix"
 
+_RUN_SECONDS = METRICS.histogram("adaos_sandbox_run_seconds", "Wall time of sandboxed commands, by limits profile", ("profile",))
+_KILLS = METRICS.counter("adaos_sandbox_kills_total", "Sandboxed commands killed by a limit, by profile and reason", ("profile", "reason"))
+
 _ALLOW_KEYS = {
     # POSIX-общие
     "path",
@@ -68,15 +77,33 @@ class SandboxService(Sandbox):
     - профили лимитов (profile="prep"/"handler"/"tool"/"default")
     - безопасное наследование окружения
     - события в шину: sandbox.start / .killed / .end
+    - arun() для event loop с общим лимитом параллелизма и квотами профилей
     """
 
-    def __init__(self, *, runner: Sandbox, caps: Capabilities, bus: EventBus, profiles: dict[str, ExecLimits] | None = None):
+    def __init__(
+        self,
+        *,
+        runner: Sandbox,
+        caps: Capabilities,
+        bus: EventBus,
+        profiles: dict[str, ExecLimits] | None = None,
+        max_concurrency: int = 8,
+        quotas: Mapping[str, int] | None = None,
+    ):
         self.runner = runner
         self.caps = caps
         self.bus = bus
         self.profiles = dict(DEFAULT_PROFILES)
         if profiles:
             self.profiles.update(profiles)
+        self._workers: dict[str, HandlerWorkerPool] = {}
+        self._workers_lock = threading.Lock()
+        # arun: общий лимит одновременных запусков и квоты по профилям
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self.quotas = {k: int(v) for k, v in (quotas or {}).items() if int(v) > 0}
+        self._slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+        self._slots_lock = threading.Lock()
+        self._active: dict[str, int] = {}
 
     def run(
         self,
@@ -90,9 +117,83 @@ class SandboxService(Sandbox):
         profile: Optional[str] = None,
         inherit_env: bool = False,
         extra_env: Optional[Mapping[str, str]] = None,
+        on_output: Optional[OnOutput] = None,
+        max_capture: Optional[int] = None,
+        publish_output: bool = False,
+        output_rate: float = 50.0,
+    ) -> ExecResult:
+        """
+        ``on_output``/``max_capture`` — потоковый вывод и ограничение захвата (см. ProcSandbox.run).
+        ``publish_output`` — дополнительно публиковать строки событиями proc.stdout/proc.stderr
+        с ограничением ``output_rate`` строк в секунду.
+        """
+        self.caps.require("core", "proc.run")
+        use_limits, base = self._prepare(cmd, cwd, limits, profile, env, inherit_env, extra_env)
+        publisher, stream_kw = self._stream_kw(cmd, cwd, on_output, max_capture, publish_output, output_rate)
+        started_at = time.time()
+        try:
+            res = self.runner.run(cmd, cwd=cwd, env=base, limits=use_limits, stdin=stdin, text=text, **stream_kw)
+        finally:
+            if publisher is not None:
+                publisher.close()
+        self._finish(cmd, cwd, res, time.time() - started_at, profile)
+        return res
+
+    async def arun(
+        self,
+        cmd: Sequence[str],
+        *,
+        cwd: Optional[str] = None,
+        env: Optional[Mapping[str, str]] = None,
+        limits: Optional[ExecLimits] = None,
+        stdin: Optional[bytes] = None,
+        text: bool = True,
+        profile: Optional[str] = None,
+        inherit_env: bool = False,
+        extra_env: Optional[Mapping[str, str]] = None,
+        on_output: Optional[OnOutput] = None,
+        max_capture: Optional[int] = None,
+        publish_output: bool = False,
+        output_rate: float = 50.0,
     ) -> ExecResult:
+        """
+        Асинхронный run(): те же профили, лимиты, фильтрация окружения и события, но без
+        блокировки event loop. Одновременно выполняется не больше ``max_concurrency`` запусков
+        и не больше квоты профиля (``quotas``); ожидание слота попадает в sandbox.start как ``queued_s``.
+        Если runner не умеет arun, синхронный run уходит в поток.
+        """
         self.caps.require("core", "proc.run")
+        prof = profile or "default"
+        queued_at = time.time()
+        async with self._slot(prof):
+            use_limits, base = self._prepare(cmd, cwd, limits, profile, env, inherit_env, extra_env, queued_s=time.time() - queued_at)
+            publisher, stream_kw = self._stream_kw(cmd, cwd, on_output, max_capture, publish_output, output_rate)
+            started_at = time.time()
+            try:
+                arun = getattr(self.runner, "arun", None)
+                if arun is not None:
+                    res = await arun(cmd, cwd=cwd, env=base, limits=use_limits, stdin=stdin, text=text, **stream_kw)
+                else:
+                    res = await asyncio.to_thread(self.runner.run, cmd, cwd=cwd, env=base, limits=use_limits, stdin=stdin, text=text, **stream_kw)
+            finally:
+                if publisher is not None:
+                    publisher.close()
+        self._finish(cmd, cwd, res, time.time() - started_at, profile)
+        return res
 
+    # ---------- общее для run/arun ----------
+
+    def _prepare(
+        self,
+        cmd: Sequence[str],
+        cwd: Optional[str],
+        limits: Optional[ExecLimits],
+        profile: Optional[str],
+        env: Optional[Mapping[str, str]],
+        inherit_env: bool,
+        extra_env: Optional[Mapping[str, str]],
+        **start_extra: Any,
+    ) -> tuple[ExecLimits, dict[str, str]]:
         # лимиты: приоритет — явные limits > профиль > default
         use_limits = limits or self.profiles.get(profile or "default") or DEFAULT_PROFILES["default"]
 
@@ -103,7 +204,6 @@ class SandboxService(Sandbox):
         if extra_env:
             base.update({k: v for k, v in extra_env.items() if isinstance(k, str) and isinstance(v, str)})
 
-        started_at = time.time()
         emit(
             self.bus,
             "sandbox.start",
@@ -112,16 +212,97 @@ class SandboxService(Sandbox):
                 "cwd": cwd,
                 "profile": profile or "default",
                 "limits": {"wall": use_limits.wall_time_sec, "cpu": use_limits.cpu_time_sec, "rss": use_limits.max_rss_mb},
+                **start_extra,
             },
             "sandbox.service",
         )
+        return use_limits, base
 
-        res = self.runner.run(cmd, cwd=cwd, env=base, limits=use_limits, stdin=stdin, text=text)
-        duration = time.time() - started_at
+    def _stream_kw(
+        self, cmd: Sequence[str], cwd: Optional[str], on_output: Optional[OnOutput], max_capture: Optional[int], publish_output: bool, output_rate: float
+    ) -> tuple[Optional[OutputPublisher], dict[str, Any]]:
+        publisher = OutputPublisher(self.bus, {"cmd": list(cmd), "cwd": cwd}, source="sandbox.service", rate=output_rate) if publish_output else None
+        # runner получает потоковые параметры, только если они заданы (совместимость с простыми Sandbox)
+        stream_kw: dict[str, Any] = {}
+        callback = fan_out(on_output, publisher)
+        if callback is not None:
+            stream_kw["on_output"] = callback
+        if max_capture is not None:
+            stream_kw["max_capture"] = max_capture
+        return publisher, stream_kw
 
+    def _finish(self, cmd: Sequence[str], cwd: Optional[str], res: ExecResult, duration: float, profile: Optional[str] = None) -> None:
+        prof = profile or "default"
+        _RUN_SECONDS.labels(prof).observe(duration)
         if res.timed_out:
+            _KILLS.labels(prof, res.killed_reason or "unknown").inc()
             emit(self.bus, "sandbox.killed", {"cmd": list(cmd), "cwd": cwd, "reason": res.killed_reason, "duration": duration}, "sandbox.service")
 
         emit(self.bus, "sandbox.end", {"cmd": list(cmd), "cwd": cwd, "exit": res.exit_code, "timed_out": res.timed_out, "duration": duration}, "sandbox.service")
 
-        return res
+    @asynccontextmanager
+    async def _slot(self, profile: str) -> AsyncIterator[None]:
+        """Глобальный слот + слот квоты профиля. Семафоры живут в конкретном event loop."""
+        loop = asyncio.get_running_loop()
+        with self._slots_lock:
+            sems = self._slots.get(loop)
+            if sems is None:
+                sems = self._slots[loop] = {"*": asyncio.Semaphore(self.max_concurrency)}
+            quota = self.quotas.get(profile)
+            if quota and profile not in sems:
+                sems[profile] = asyncio.Semaphore(quota)
+            per_profile = sems.get(profile) if quota else None
+            glob = sems["*"]
+        # сначала квота профиля, потом общий слот: ожидающий квоты не занимает общий
+        if per_profile is not None:
+            await per_profile.acquire()
+        try:
+            async with glob:
+                self._active[profile] = self._active.get(profile, 0) + 1
+                try:
+                    yield
+                finally:
+                    self._active[profile] -= 1
+        finally:
+            if per_profile is not None:
+                per_profile.release()
+
+    def concurrency(self) -> dict[str, Any]:
+        """Текущая загрузка arun: активные запуски по профилям и лимиты."""
+        return {"max": self.max_concurrency, "quotas": dict(self.quotas), "active": {k: v for k, v in self._active.items() if v}}
+
+    def stream(self, cmd: Sequence[str], **kwargs: Any) -> OutputStream[ExecResult]:
+        """Как run(), но с итерацией по строкам вывода; итог — ``.result``."""
+        kwargs.setdefault("max_capture", STREAM_MAX_CAPTURE)
+        user_cb = kwargs.pop("on_output", None)
+        return OutputStream(lambda cb: self.run(cmd, on_output=fan_out(user_cb, cb), **kwargs))
+
+    # ---------- тёплые воркеры обработчиков ----------
+
+    def worker_pool(self, profile: str = "handler", **options: Any) -> HandlerWorkerPool:
+        """Пул тёплых воркеров для профиля (создаётся при первом обращении; options — параметры HandlerWorkerPool)."""
+        with self._workers_lock:
+            pool = self._workers.get(profile)
+            if pool is None:
+                limits = self.profiles.get(profile) or DEFAULT_PROFILES["default"]
+                pool = self._workers[profile] = HandlerWorkerPool(
+                    limits=limits,
+                    env=_inherit_env_filtered(None, True),
+                    on_event=lambda topic, payload: emit(self.bus, topic, {**payload, "profile": profile}, "sandbox.service"),
+                    **options,
+                )
+            return pool
+
+    def call_handler(self, skill_dir: str | Path, topic: str, payload: Any, *, profile: str = "handler", limits: Optional[ExecLimits] = None) -> WorkerResult:
+        """
+        Выполнить ``handle(topic, payload)`` навыка в тёплом воркере: интерпретатор и импорт
+        handlers/main.py оплачиваются один раз на воркер, а не на каждый вызов.
+        """
+        self.caps.require("core", "proc.run")
+        return self.worker_pool(profile).call(Path(skill_dir) / "handlers" / "main.py", topic, payload, limits=limits)
+
+    def close_workers(self) -> None:
+        with self._workers_lock:
+            pools, self._workers = list(self._workers.values()), {}
+        for pool in pools:
+            pool.close()
@@ -0,0 +1,207 @@
+# \src\adaos\services\sandbox\streams.py
+# потоковый вывод процессов: ограниченный захват, разбиение на строки, события в шину с rate limit
+from __future__ import annotations
+import codecs, queue, threading, time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, TypeVar
+
+from adaos.ports import EventBus
+from adaos.services.eventbus import emit
+
+MAX_LINE = 64 * 1024  # длиннее — режем на куски, чтобы одна «строка» не съела память
+
+R = TypeVar("R")
+OnOutput = Callable[[str, str], None]  # (stream: "stdout"|"stderr", line)
+
+
+@dataclass(frozen=True, slots=True)
+class OutputLine:
+    stream: str  # "stdout" | "stderr"
+    line: str
+
+
+class OutputCapture:
+    """
+    Захват вывода с ограничением: хранится не больше ``max_size`` последних символов (для bytes —
+    байт), более ранний вывод отбрасывается, а в начало value() ставится пометка об усечении.
+    ``max_size=None`` — без ограничения.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, *, binary: bool = False):
+        self.max_size = max_size
+        self.binary = binary
+        self.total = 0
+        self.dropped = 0
+        self._parts: List[Any] = []
+        self._size = 0
+
+    @property
+    def truncated(self) -> bool:
+        return self.dropped > 0
+
+    def feed(self, chunk: Any) -> None:
+        if not chunk:
+            return
+        self.total += len(chunk)
+        self._parts.append(chunk)
+        self._size += len(chunk)
+        if self.max_size is None:
+            return
+        while self._size > self.max_size and self._parts:
+            head = self._parts[0]
+            excess = self._size - self.max_size
+            if len(head) <= excess:
+                self._parts.pop(0)
+                cut = len(head)
+            else:
+                self._parts[0] = head[excess:]
+                cut = excess
+            self._size -= cut
+            self.dropped += cut
+
+    def value(self) -> Any:
+        body = (b"" if self.binary else "").join(self._parts)
+        if not self.truncated:
+            return body
+        marker = f"[... truncated {self.dropped} of {self.total} ...]\n"
+        return (marker.encode() if self.binary else marker) + body
+
+
+class LineSplitter:
+    """Режет поток байт на строки (utf-8, errors="replace"); строки длиннее ``max_line`` — кусками."""
+
+    def __init__(self, max_line: int = MAX_LINE):
+        self.max_line = max_line
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pending = ""
+
+    def feed(self, data: bytes) -> List[str]:
+        text = self._pending + self._decoder.decode(data)
+        lines = text.splitlines(keepends=True)
+        self._pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        while len(self._pending) > self.max_line:
+            lines.append(self._pending[: self.max_line])
+            self._pending = self._pending[self.max_line :]
+        return lines
+
+    def flush(self) -> List[str]:
+        rest = self._pending + self._decoder.decode(b"", final=True)
+        self._pending = ""
+        return [rest] if rest else []
+
+
+class RateLimiter:
+    """Token bucket: ``rate`` событий в секунду, всплеск до ``burst``."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.burst = max(int(burst), 1)
+        self._tokens = float(self.burst)
+        self._ts = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._ts) * self.rate)
+            self._ts = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+class OutputPublisher:
+    """
+    Публикует строки вывода событиями ``proc.stdout``/``proc.stderr``. Сверх лимита строки
+    не публикуются, а считаются: число пропущенных приходит полем ``dropped`` со следующим
+    событием потока (или итоговым событием с ``line=None`` при close()).
+    """
+
+    def __init__(self, bus: EventBus, payload: Dict[str, Any], *, source: str, rate: float = 50.0, burst: int = 200):
+        self.bus = bus
+        self.payload = dict(payload)
+        self.source = source
+        self._limiter = RateLimiter(rate, burst)
+        self._dropped: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, stream: str, line: str) -> None:
+        if not self._limiter.allow():
+            with self._lock:
+                self._dropped[stream] = self._dropped.get(stream, 0) + 1
+            return
+        with self._lock:
+            dropped = self._dropped.pop(stream, 0)
+        emit(self.bus, f"proc.{stream}", {**self.payload, "line": line.rstrip("\r\n"), "dropped": dropped}, self.source)
+
+    def close(self) -> None:
+        with self._lock:
+            pending, self._dropped = self._dropped, {}
+        for stream, dropped in pending.items():
+            emit(self.bus, f"proc.{stream}", {**self.payload, "line": None, "dropped": dropped}, self.source)
+
+
+def fan_out(*callbacks: Optional[OnOutput]) -> Optional[OnOutput]:
+    """Объединить несколько on_output в один (None пропускаются)."""
+    active = [cb for cb in callbacks if cb is not None]
+    if not active:
+        return None
+    if len(active) == 1:
+        return active[0]
+
+    def _all(stream: str, line: str) -> None:
+        for cb in active:
+            cb(stream, line)
+
+    return _all
+
+
+_END = object()
+
+
+class OutputStream(Generic[R]):
+    """
+    Итератор по строкам вывода запуска: ``start(on_output)`` выполняется в отдельном потоке,
+    строки приходят как OutputLine по мере появления. После исчерпания итератора итог
+    запуска доступен в ``result`` (исключение запуска пробрасывается оттуда же).
+    """
+
+    def __init__(self, start: Callable[[OnOutput], R], *, buffer: int = 10_000):
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=buffer)
+        self._result: Optional[R] = None
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, args=(start,), daemon=True, name="adaos-output-stream")
+        self._thread.start()
+
+    def _run(self, start: Callable[[OnOutput], R]) -> None:
+        try:
+            self._result = start(lambda stream, line: self._queue.put(OutputLine(stream, line)))
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._queue.put(_END)
+
+    def __iter__(self) -> Iterator[OutputLine]:
+        while not self._done:
+            item = self._queue.get()
+            if item is _END:
+                self._done = True
+                return
+            yield item
+
+    def lines(self, stream: Optional[str] = None) -> Iterator[str]:
+        """Только текст строк (опционально одного потока)."""
+        for item in self:
+            if stream is None or item.stream == stream:
+                yield item.line
+
+    @property
+    def result(self) -> R:
+        for _ in self:  # недочитанный вывод выбрасываем, иначе запуск упрётся в полную очередь
+            pass
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._result  # type: ignore[return-value]
@@ -0,0 +1,76 @@
+# \src\adaos\services\sandbox\worker_main.py
+"""
+Тёплый воркер песочницы: один раз импортирует handlers/main.py и обслуживает запросы
+``handle(topic, payload)``, пришедшие JSON-строками в stdin; ответы — JSON-строками в stdout.
+
+Запуск: ``python -m adaos.services.sandbox.worker_main <handlers/main.py>``.
+Вывод самого обработчика (print) перенаправляется в stderr, чтобы не ломать протокол.
+"""
+from __future__ import annotations
+import asyncio, importlib.util, inspect, json, os, sys
+
+_IS_POSIX = os.name == "posix"
+
+
+def _load(handler_file: str):
+    spec = importlib.util.spec_from_file_location("adaos_skill_handler", handler_file)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot import {handler_file}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    handle = getattr(module, "handle", None)
+    if handle is None:
+        raise AttributeError("handler module does not define handle(topic, payload)")
+    return handle
+
+
+def _limit_cpu(seconds: float | None) -> None:
+    """RLIMIT_CPU накопительный, поэтому мягкий лимит ставим относительно уже израсходованного."""
+    if not _IS_POSIX or not seconds:
+        return
+    import math, resource
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(math.ceil(usage.ru_utime + usage.ru_stime + seconds))
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def main(argv: list[str]) -> int:
+    proto_out = os.fdopen(os.dup(1), "w", encoding="utf-8", buffering=1)
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    def reply(obj: dict) -> None:
+        proto_out.write(json.dumps(obj, ensure_ascii=False, default=str) + "\n")
+        proto_out.flush()
+
+    try:
+        handle = _load(argv[1])
+    except BaseException as e:
+        reply({"ready": False, "error": f"{type(e).__name__}: {e}"})
+        return 1
+    reply({"ready": True, "pid": os.getpid()})
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        req = json.loads(line)
+        try:
+            _limit_cpu(req.get("cpu"))
+            result = handle(req.get("topic"), req.get("payload"))
+            if inspect.isawaitable(result):
+                result = asyncio.run(result)
+            reply({"id": req.get("id"), "ok": True, "result": result})
+        except MemoryError:
+            reply({"id": req.get("id"), "ok": False, "error": "MemoryError", "fatal": True})
+            return 1
+        except Exception as e:
+            reply({"id": req.get("id"), "ok": False, "error": f"{type(e).__name__}: {e}"})
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - запускается в отдельном процессе
+    sys.exit(main(sys.argv))
@@ -0,0 +1,327 @@
+# \src\adaos\services\sandbox\workers.py
+# пул тёплых процессов-воркеров для обработчиков навыков (см. worker_main.py)
+from __future__ import annotations
+import json, os, queue, signal, subprocess, sys, threading, time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional
+import psutil
+
+from adaos.ports.sandbox import ExecLimits
+from adaos.services.sandbox.runner import _IS_POSIX, _kill_tree, _preexec_posix
+
+_EOF = object()
+_STDERR_TAIL = 64 * 1024
+# каталог, из которого импортируется пакет adaos, — воркеру он нужен в PYTHONPATH
+_PKG_ROOT = str(Path(__file__).resolve().parents[3])
+
+
+@dataclass
+class WorkerResult:
+    ok: bool
+    result: Any = None
+    error: Optional[str] = None
+    timed_out: bool = False
+    killed_reason: Optional[str] = None
+    duration: float = 0.0
+    worker_pid: Optional[int] = None
+
+
+class WorkerError(RuntimeError):
+    """Воркер не смог стартовать (например, handlers/main.py не импортируется)."""
+
+
+class _Worker:
+    def __init__(self, handler_file: str, *, python: str, cwd: Optional[str], env: Mapping[str, str], limits: ExecLimits, startup_timeout: float):
+        preexec = None
+        if _IS_POSIX and limits.max_rss_mb:
+            # CPU ограничиваем по-запросно в самом воркере: RLIMIT_CPU копится за всю жизнь процесса
+            rss_only = ExecLimits(wall_time_sec=None, cpu_time_sec=None, max_rss_mb=limits.max_rss_mb)
+
+            def preexec():
+                _preexec_posix(rss_only)
+
+        self.proc = subprocess.Popen(
+            [python, "-m", "adaos.services.sandbox.worker_main", handler_file],
+            cwd=cwd,
+            env=dict(env),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+            preexec_fn=preexec,
+        )
+        self.calls = 0
+        self.sig = _file_sig(handler_file)
+        self.stderr_tail: Deque[str] = deque()
+        self._stderr_size = 0
+        self._replies: "queue.Queue[Any]" = queue.Queue()
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+        threading.Thread(target=self._read_stderr, daemon=True).start()
+        ready = self._next(startup_timeout)
+        if not isinstance(ready, dict) or not ready.get("ready"):
+            self.kill()
+            detail = ready.get("error") if isinstance(ready, dict) else self.stderr()
+            raise WorkerError(f"sandbox worker failed to start for {handler_file}: {detail}")
+
+    @property
+    def pid(self) -> int:
+        return self.proc.pid
+
+    def _read_stdout(self) -> None:
+        for line in self.proc.stdout:
+            try:
+                self._replies.put(json.loads(line))
+            except ValueError:
+                pass
+        self._replies.put(_EOF)
+
+    def _read_stderr(self) -> None:
+        # stderr надо вычитывать постоянно, иначе болтливый обработчик упрётся в полный pipe
+        for chunk in self.proc.stderr:
+            self.stderr_tail.append(chunk)
+            self._stderr_size += len(chunk)
+            while self._stderr_size > _STDERR_TAIL and len(self.stderr_tail) > 1:
+                self._stderr_size -= len(self.stderr_tail.popleft())
+
+    def _next(self, timeout: Optional[float]) -> Any:
+        try:
+            return self._replies.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def stderr(self) -> str:
+        return "".join(self.stderr_tail)
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def rss_mb(self) -> float:
+        try:
+            return psutil.Process(self.proc.pid).memory_info().rss / (1024 * 1024)
+        except Exception:
+            return 0.0
+
+    def call(self, topic: str, payload: Any, limits: ExecLimits) -> WorkerResult:
+        self.calls += 1
+        started = time.perf_counter()
+        req = {"id": self.calls, "topic": topic, "payload": payload, "cpu": limits.cpu_time_sec}
+        try:
+            self.proc.stdin.write(json.dumps(req, ensure_ascii=False, default=str) + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            return self._died(started)
+        reply = self._next(limits.wall_time_sec)
+        if reply is None:
+            self.kill()
+            return WorkerResult(ok=False, error="wall time exceeded", timed_out=True, killed_reason="wall_time_exceeded", duration=time.perf_counter() - started, worker_pid=self.pid)
+        if reply is _EOF:
+            return self._died(started)
+        if reply.get("fatal"):
+            self.kill()
+            return WorkerResult(ok=False, error=reply.get("error"), timed_out=True, killed_reason="rss_exceeded", duration=time.perf_counter() - started, worker_pid=self.pid)
+        return WorkerResult(ok=bool(reply.get("ok")), result=reply.get("result"), error=reply.get("error"), duration=time.perf_counter() - started, worker_pid=self.pid)
+
+    def _died(self, started: float) -> WorkerResult:
+        try:
+            code = self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.kill()
+            code = None
+        reason = "cpu_time_exceeded" if _IS_POSIX and code == -getattr(signal, "SIGXCPU", -1) else "worker_died"
+        return WorkerResult(ok=False, error=f"worker exited with code {code}", timed_out=reason == "cpu_time_exceeded", killed_reason=reason, duration=time.perf_counter() - started, worker_pid=self.pid)
+
+    def kill(self) -> None:
+        if self.alive():
+            try:
+                _kill_tree(psutil.Process(self.proc.pid))
+            except Exception:
+                pass
+        try:
+            self.proc.wait(timeout=5)
+        except Exception:
+            pass
+        for stream in (self.proc.stdin, self.proc.stdout, self.proc.stderr):
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def stop(self) -> None:
+        """Мягкая остановка: закрыть stdin, дождаться выхода; при зависании — kill."""
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=2)
+        except Exception:
+            pass
+        self.kill()
+
+
+class _SkillPool:
+    def __init__(self) -> None:
+        self.idle: List[_Worker] = []
+        self.count = 0  # живые воркеры (занятые + idle)
+        self.cond = threading.Condition()
+        self.sig: Optional[tuple[int, int]] = None  # (mtime_ns, size) handlers/main.py, под которую запущены воркеры
+
+
+def _file_sig(path: str) -> Optional[tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class HandlerWorkerPool:
+    """
+    Пул предзапущенных воркеров на каждый handlers/main.py. Воркер стартует с rlimit по памяти
+    (как _preexec_posix), CPU-лимит выставляется на каждый запрос, wall-time контролирует пул.
+    После ``max_calls`` вызовов или при RSS больше ``recycle_rss_mb`` воркер перезапускается.
+    """
+
+    def __init__(
+        self,
+        *,
+        limits: ExecLimits,
+        size: int = 2,
+        max_calls: int = 500,
+        recycle_rss_mb: Optional[float] = None,
+        python: str = sys.executable,
+        env: Optional[Mapping[str, str]] = None,
+        startup_timeout: float = 30.0,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    ):
+        self.limits = limits
+        self.size = max(int(size), 1)
+        self.max_calls = max(int(max_calls), 1)
+        if recycle_rss_mb is None and limits.max_rss_mb:
+            recycle_rss_mb = limits.max_rss_mb * 0.8
+        self.recycle_rss_mb = recycle_rss_mb
+        self.python = python
+        self.startup_timeout = startup_timeout
+        self.on_event = on_event
+        env = dict(os.environ if env is None else env)
+        env["PYTHONPATH"] = os.pathsep.join(p for p in (_PKG_ROOT, env.get("PYTHONPATH", "")) if p)
+        self.env = env
+        self._pools: Dict[str, _SkillPool] = {}
+        self._lock = threading.Lock()
+        self.spawned = 0
+        self.recycled = 0
+
+    def _event(self, topic: str, payload: Dict[str, Any]) -> None:
+        if self.on_event is not None:
+            try:
+                self.on_event(topic, payload)
+            except Exception:
+                pass
+
+    def _pool(self, handler_file: str) -> _SkillPool:
+        with self._lock:
+            pool = self._pools.get(handler_file)
+            if pool is None:
+                pool = self._pools[handler_file] = _SkillPool()
+            return pool
+
+    def _acquire(self, handler_file: str, pool: _SkillPool) -> _Worker:
+        with pool.cond:
+            while True:
+                while pool.idle:
+                    worker = pool.idle.pop()
+                    if worker.alive():
+                        return worker
+                    pool.count -= 1
+                if pool.count < self.size:
+                    pool.count += 1
+                    break
+                pool.cond.wait()
+        try:
+            worker = _Worker(handler_file, python=self.python, cwd=str(Path(handler_file).parent.parent), env=self.env, limits=self.limits, startup_timeout=self.startup_timeout)
+        except BaseException:
+            with pool.cond:
+                pool.count -= 1
+                pool.cond.notify()
+            raise
+        self.spawned += 1
+        self._event("sandbox.worker.spawned", {"handler": handler_file, "pid": worker.pid})
+        return worker
+
+    def _release(self, handler_file: str, pool: _SkillPool, worker: _Worker) -> None:
+        reason = None
+        if not worker.alive():
+            reason = "dead"
+        elif worker.sig != pool.sig:
+            reason = "code_changed"
+        elif worker.calls >= self.max_calls:
+            reason = "max_calls"
+        elif self.recycle_rss_mb is not None and worker.rss_mb() > self.recycle_rss_mb:
+            reason = "rss"
+        if reason is not None:
+            if reason != "dead":
+                worker.stop()
+                self.recycled += 1
+            self._event("sandbox.worker.recycled", {"handler": handler_file, "pid": worker.pid, "reason": reason, "calls": worker.calls})
+        with pool.cond:
+            if reason is None:
+                pool.idle.append(worker)
+            else:
+                pool.count -= 1
+            pool.cond.notify()
+
+    def call(self, handler_file: str | Path, topic: str, payload: Any, *, limits: Optional[ExecLimits] = None) -> WorkerResult:
+        """Вызвать ``handle(topic, payload)`` в тёплом воркере навыка."""
+        key = str(Path(handler_file).resolve())
+        pool = self._pool(key)
+        sig = _file_sig(key)
+        if sig != pool.sig:
+            # обработчик обновился: простаивающие воркеры со старым кодом больше не нужны
+            self.invalidate(key)
+            pool.sig = sig
+        worker = self._acquire(key, pool)
+        try:
+            res = worker.call(topic, payload, limits or self.limits)
+        finally:
+            self._release(key, pool, worker)
+        if res.killed_reason:
+            self._event("sandbox.killed", {"handler": key, "reason": res.killed_reason, "duration": res.duration, "stderr": worker.stderr()[-2000:]})
+        return res
+
+    def warm(self, handler_file: str | Path, count: Optional[int] = None) -> int:
+        """Заранее поднять воркеры навыка (до ``count``, по умолчанию — до размера пула). Возвращает число поднятых."""
+        key = str(Path(handler_file).resolve())
+        pool = self._pool(key)
+        pool.sig = pool.sig or _file_sig(key)
+        started = 0
+        target = min(self.size, count or self.size)
+        while True:
+            with pool.cond:
+                if pool.count >= target:
+                    return started
+            self._release(key, pool, self._acquire(key, pool))
+            started += 1
+
+    def invalidate(self, handler_file: str | Path | None = None) -> None:
+        """Остановить простаивающие воркеры (все или одного навыка) — например, после обновления кода."""
+        with self._lock:
+            keys = list(self._pools) if handler_file is None else [str(Path(handler_file).resolve())]
+            pools = [(k, self._pools.get(k)) for k in keys]
+        for _, pool in pools:
+            if pool is None:
+                continue
+            with pool.cond:
+                idle, pool.idle = pool.idle, []
+                pool.count -= len(idle)
+                pool.cond.notify_all()
+            for worker in idle:
+                worker.stop()
+
+    def close(self) -> None:
+        self.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            per_skill = {k: {"workers": p.count, "idle": len(p.idle)} for k, p in self._pools.items()}
+        return {"spawned": self.spawned, "recycled": self.recycled, "pools": per_skill}
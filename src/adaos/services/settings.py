@@ -36,6 +36,32 @@ class Settings:
     default_cpu_time_sec: float | None = None
     default_max_rss_mb: int | None = None
 
+    # шина событий: local (синхронная доставка) | async (очереди на подписчика)
+    event_bus: str = "local"
+    event_bus_queue_size: int = 1000
+    event_bus_overflow: str = "block"  # block | drop-oldest | drop-newest
+
+    # KV: 0 — запись сразу; >0 — write-behind со сбросом раз в столько мс
+    kv_write_behind_ms: int = 0
+    # LRU-кэш чтения перед KV: 0 — выключен; bypass — namespace ключей, которые не кэшируем
+    kv_cache_size: int = 4096
+    kv_cache_bypass: tuple[str, ...] = ()
+
+    # исполнение sync/CPU-bound инструментов в HTTP-мосте: размеры пулов потоков/процессов
+    tool_thread_workers: int = 8
+    tool_process_workers: int = 2
+
+    # SandboxService.arun: общий лимит одновременных запусков и квоты профилей ("tool=4,prep=2")
+    sandbox_max_concurrency: int = 8
+    sandbox_quotas: tuple[tuple[str, int], ...] = ()
+
+    # бут: навыки подключаются лениво (подписки из манифеста), прогрев импорта — пулом из N потоков (0 — без прогрева)
+    skills_lazy_load: bool = True
+    skills_warmup_workers: int = 4
+
+    # метрики: период замера задержки event loop в API-сервере, сек (0 — не замерять)
+    loop_lag_interval: float = 0.5
+
     # жёсткие (или dev-override через .env)
     skills_monorepo_url: Optional[str] = const.SKILLS_MONOREPO_URL
     skills_monorepo_branch: Optional[str] = const.SKILLS_MONOREPO_BRANCH
@@ -97,6 +123,21 @@ class Settings:
         return Settings(
             base_dir=base,
             profile=profile,
+            event_bus=pick_env("ADAOS_EVENT_BUS", "local").strip().lower(),
+            event_bus_queue_size=int(pick_env("ADAOS_EVENT_BUS_QUEUE", "1000")),
+            event_bus_overflow=pick_env("ADAOS_EVENT_BUS_OVERFLOW", "block").strip().lower(),
+            kv_write_behind_ms=int(pick_env("ADAOS_KV_WRITE_BEHIND_MS", "0")),
+            kv_cache_size=int(pick_env("ADAOS_KV_CACHE_SIZE", "4096")),
+            kv_cache_bypass=tuple(ns.strip() for ns in pick_env("ADAOS_KV_CACHE_BYPASS").split(",") if ns.strip()),
+            tool_thread_workers=int(pick_env("ADAOS_TOOL_THREADS", "8")),
+            tool_process_workers=int(pick_env("ADAOS_TOOL_PROCESSES", "2")),
+            sandbox_max_concurrency=int(pick_env("ADAOS_SANDBOX_CONCURRENCY", "8")),
+            sandbox_quotas=tuple(
+                (name.strip(), int(value)) for name, _, value in (item.partition("=") for item in pick_env("ADAOS_SANDBOX_QUOTAS").split(",")) if name.strip() and value.strip()
+            ),
+            skills_lazy_load=pick_env("ADAOS_SKILLS_LAZY", "1").strip().lower() not in ("0", "false", "no", "off"),
+            skills_warmup_workers=int(pick_env("ADAOS_SKILLS_WARMUP_WORKERS", "4")),
+            loop_lag_interval=float(pick_env("ADAOS_LOOP_LAG_INTERVAL", "0.5")),
             skills_monorepo_url=skills_url,
             skills_monorepo_branch=skills_branch,
             scenarios_monorepo_url=scenarios_url,
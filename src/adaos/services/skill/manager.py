@@ -1,6 +1,6 @@
 # src\adaos\services\skill\manager.py
 from __future__ import annotations
-import re, os
+import re, os, sys
 from pathlib import Path
 from typing import Optional
 
@@ -14,7 +14,7 @@ from adaos.services.git.safe_commit import sanitize_message, check_no_denied
 from adaos.services.git.workspace_guard import ensure_clean
 from adaos.services.settings import Settings
 from adaos.services.agent_context import get_ctx
-from adaos.services.skill.validation import SkillValidationService
+from adaos.services.skill.runtime import get_skill_index, invalidate_handler_cache
 from adaos.services.agent_context import AgentContext
 
 _name_re = re.compile(r"^[a-zA-Z0-9_\-\/]+$")
@@ -38,6 +38,20 @@ class SkillManager:
         self.settings = settings
         self.ctx: AgentContext = get_ctx()
 
+    def _skills_changed(self, name: str | None = None) -> None:
+        """Исходники навыков на диске поменялись: сбросить прогретые handler'ы и обновить индекс каталогов."""
+        self._drop_warm_modules(name)
+        get_skill_index(self.ctx).refresh()
+
+    @staticmethod
+    def _drop_warm_modules(name: str | None = None) -> None:
+        """Сбросить прогретые модули навыка: handler'ы рантайма и таблицы инструментов HTTP-моста."""
+        invalidate_handler_cache(name)
+        # мост живёт в слое apps (FastAPI): если он не импортирован в этом процессе — и таблиц нет
+        bridge = sys.modules.get("adaos.apps.api.tool_bridge")
+        if bridge is not None:
+            bridge.invalidate_dispatch_tables(name)
+
     def list_installed(self) -> list[SkillRecord]:
         self.caps.require("core", "skills.manage")
         return self.ctx.skills_repo.list()
@@ -60,8 +74,25 @@ class SkillManager:
         if names:
             self.ctx.git.sparse_set(root, names, no_cone=True)
         self.ctx.git.pull(root)
+        self._skills_changed()
         emit(self.bus, "skill.sync", {"count": len(names)}, "skill.mgr")
 
+    def pull(self, name: str) -> str:
+        """Подтянуть исходники установленного навыка (pull монорепо) и сбросить его прогретый handler."""
+        self.caps.require("core", "skills.manage", "net.git")
+        name = name.strip()
+        if not _name_re.match(name):
+            raise ValueError("invalid skill name")
+        if not self.reg.get(name):
+            raise FileNotFoundError(f"skill '{name}' is not installed")
+        root = self.ctx.paths.skills_dir()
+        if not (Path(root) / ".git").exists():
+            raise RuntimeError("Skills repo is not initialized. Run `adaos skill sync` once.")
+        self.ctx.git.pull(root)
+        self._skills_changed(name)
+        emit(self.bus, "skill.pulled", {"id": name}, "skill.mgr")
+        return f"pulled: {name}"
+
     def install(self, name: str, pin: str | None = None, validate: bool = True, strict: bool = True, probe_tools: bool = False) -> tuple[SkillMeta, Optional[object]]:
         """
         Возвращает (meta, report|None). При strict и ошибках валидации можно выбрасывать исключение.
@@ -80,8 +111,11 @@ class SkillManager:
             return f"installed: {name} (registry-only{' test-mode' if test_mode else ''})"
         # 3) mono-only установка через репозиторий (sparse-add + pull)
         meta = self.ctx.skills_repo.install(name, branch=None)
-        """ if not validate:
-            return meta, None """
+        self._skills_changed(name)
+        if not validate:
+            return meta, None
+        from adaos.services.skill.validation import SkillValidationService  # jsonschema — только при установке
+
         report = SkillValidationService(self.ctx).validate(meta.id.value, strict=strict, probe_tools=probe_tools)
         if strict and not report.ok:
             # опционально можно откатывать установку:
@@ -91,6 +125,12 @@ class SkillManager:
 
         return meta, report  # return f"installed: {name}"
 
+    def validate_many(self, names: list[str], *, strict: bool = True, probe_tools: bool = False) -> dict[str, object]:
+        """Валидация пачки навыков: неизменённые — из кэша, остальные — в одном процессе Python."""
+        from adaos.services.skill.validation import SkillValidationService
+
+        return SkillValidationService(self.ctx).validate_many(names, strict=strict, probe_tools=probe_tools)
+
     def uninstall(self, name: str) -> None:
         self.caps.require("core", "skills.manage", "net.git")
         name = name.strip()
@@ -101,6 +141,7 @@ class SkillManager:
         if not rec:
             return f"uninstalled: {name} (not found)"
         self.reg.unregister(name)
+        self._drop_warm_modules(name)
         root = self.ctx.paths.skills_dir()
         test_mode = os.getenv("ADAOS_TESTING") == "1"
         # в тестах/без .git — только реестр, без git операций
@@ -113,6 +154,7 @@ class SkillManager:
             self.ctx.git.sparse_set(root, names, no_cone=True)
         self.ctx.git.pull(root)
         remove_tree(str(Path(root) / name), fs=self.ctx.paths.ctx.fs if hasattr(self.ctx.paths, "ctx") else get_ctx().fs)
+        self._skills_changed(name)
         emit(self.bus, "skill.uninstalled", {"id": name}, "skill.mgr")
 
     def push(self, name: str, message: str, *, signoff: bool = False) -> str:
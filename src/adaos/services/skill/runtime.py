@@ -11,14 +11,22 @@ from __future__ import annotations
 
 import asyncio
 import importlib.util
+import os
+import threading
+import weakref
+from dataclasses import dataclass
 from inspect import isawaitable
 from pathlib import Path
-from typing import Any, Mapping, Optional
+from types import ModuleType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
 
+from adaos.adapters.db.sqlite_skill_index import SqliteSkillIndex
 from adaos.services.agent_context import AgentContext, get_ctx
 from adaos.services.skill.context import SkillContextService
 
-_MANIFEST_NAMES = ("skill.yaml", "manifest.yaml", "adaos.skill.yaml")
+# sql -> {skills_root: index}
+_INDEXES: "weakref.WeakKeyDictionary[Any, Dict[str, SqliteSkillIndex]]" = weakref.WeakKeyDictionary()
+_INDEXES_LOCK = threading.Lock()
 
 
 class SkillRuntimeError(RuntimeError):
@@ -65,14 +73,28 @@ class SkillPrepMissingFunctionError(SkillPrepError):
     """Raised when ``run_prep`` is not defined in ``prepare.py``."""
 
 
+def get_skill_index(ctx: Optional[AgentContext] = None) -> SqliteSkillIndex:
+    """Return the persisted skill directory index for the context's ``skills_root``."""
+
+    agent_ctx = ctx or get_ctx()
+    root = str(agent_ctx.paths.skills_dir())
+    with _INDEXES_LOCK:
+        per_sql = _INDEXES.setdefault(agent_ctx.sql, {})
+        index = per_sql.get(root)
+        if index is None:
+            index = per_sql[root] = SqliteSkillIndex(agent_ctx.sql, root)
+    return index
+
+
 def find_skill_dir(skill_name: str, *, ctx: Optional[AgentContext] = None) -> Path:
     """Locate the directory with the skill sources inside ``skills_root``.
 
     The lookup is performed in two stages:
 
     1. Direct lookup by ``<skills_root>/<skill_name>``
-    2. Fallback search for ``<skills_root>/**/<skill_name>`` that contains one
-       of the known manifest files.
+    2. Lookup in the persisted skill index (see :func:`get_skill_index`) for
+       ``<skills_root>/**/<skill_name>`` that contains one of the known
+       manifest files. The index is refreshed incrementally on a miss.
 
     Args:
         skill_name: Identifier of the skill (normally matches the directory
@@ -95,10 +117,7 @@ def find_skill_dir(skill_name: str, *, ctx: Optional[AgentContext] = None) -> Pa
     if direct.is_dir():
         return direct
 
-    matches = []
-    for path in skills_root.rglob("*"):
-        if path.is_file() and path.name in _MANIFEST_NAMES and path.parent.name == skill_name:
-            matches.append(path.parent)
+    matches = [entry.path for entry in get_skill_index(agent_ctx).find(skill_name)]
 
     if not matches:
         raise SkillDirectoryNotFoundError(
@@ -115,6 +134,19 @@ def find_skill_dir(skill_name: str, *, ctx: Optional[AgentContext] = None) -> Pa
     return matches[0]
 
 
+@dataclass(slots=True)
+class _HandlerEntry:
+    skill: str
+    sig: Tuple[int, int]
+    module: ModuleType
+    handle: Callable[..., Any]
+
+
+# resolved handlers/main.py -> imported module; reused while (mtime_ns, size) is unchanged
+_HANDLERS: Dict[Path, _HandlerEntry] = {}
+_HANDLERS_LOCK = threading.Lock()
+
+
 def _load_handler(handler_file: Path):
     spec = importlib.util.spec_from_file_location("adaos_skill_handler", handler_file)
     if spec is None or spec.loader is None:
@@ -129,7 +161,47 @@ def _load_handler(handler_file: Path):
             "Handler module does not define handle(topic, payload)"
         )
 
-    return handle_fn
+    return module, handle_fn
+
+
+def _cached_handler(skill_name: str, handler_file: Path) -> Callable[..., Any]:
+    """Return ``handle`` from the warm cache, importing the module only when the file changed."""
+
+    try:
+        st = os.stat(handler_file)
+    except FileNotFoundError:
+        raise SkillHandlerNotFoundError(f"Handler file not found: {handler_file}") from None
+    sig = (st.st_mtime_ns, st.st_size)
+    key = handler_file.resolve()
+
+    entry = _HANDLERS.get(key)
+    if entry is not None and entry.sig == sig:
+        return entry.handle
+
+    with _HANDLERS_LOCK:
+        entry = _HANDLERS.get(key)
+        if entry is None or entry.sig != sig:
+            module, handle_fn = _load_handler(handler_file)
+            entry = _HANDLERS[key] = _HandlerEntry(skill=skill_name, sig=sig, module=module, handle=handle_fn)
+    return entry.handle
+
+
+def invalidate_handler_cache(skill_name: Optional[str] = None) -> int:
+    """Drop cached handler modules (all of them, or only those of ``skill_name``).
+
+    Called on skill install/uninstall/pull/sync so the next call re-imports the
+    handler. Returns the number of dropped entries.
+    """
+
+    with _HANDLERS_LOCK:
+        if skill_name is None:
+            count = len(_HANDLERS)
+            _HANDLERS.clear()
+            return count
+        doomed = [key for key, entry in _HANDLERS.items() if entry.skill == skill_name or key.parent.parent.name == skill_name]
+        for key in doomed:
+            del _HANDLERS[key]
+        return len(doomed)
 
 
 async def run_skill_handler(
@@ -154,16 +226,16 @@ async def run_skill_handler(
         SkillDirectoryNotFoundError: If the skill cannot be located.
         SkillDirectoryAmbiguousError: If multiple directories match the skill.
         SkillHandlerImportError: If the handler file is missing or invalid.
+
+    The imported handler module is cached per handler path and reused until the
+    file's mtime/size changes or :func:`invalidate_handler_cache` is called.
     """
 
     agent_ctx = ctx or get_ctx()
     skill_dir = find_skill_dir(skill_name, ctx=agent_ctx)
     handler_path = skill_dir / "handlers" / "main.py"
 
-    if not handler_path.is_file():
-        raise SkillHandlerNotFoundError(f"Handler file not found: {handler_path}")
-
-    handle_fn = _load_handler(handler_path)
+    handle_fn = _cached_handler(skill_name, handler_path)
 
     result = handle_fn(topic, payload)
     if isawaitable(result):
@@ -247,6 +319,8 @@ __all__ = [
     "SkillPrepImportError",
     "SkillPrepMissingFunctionError",
     "find_skill_dir",
+    "get_skill_index",
+    "invalidate_handler_cache",
     "run_skill_handler",
     "run_skill_handler_sync",
     "run_skill_prep",
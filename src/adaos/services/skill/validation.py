@@ -1,10 +1,11 @@
 # src/adaos/sdk/skill_validator.py
 
 from __future__ import annotations
-import os, sys, json, subprocess, importlib.util
-from dataclasses import dataclass
+import os, sys, json, hashlib, subprocess, importlib.util
+from dataclasses import asdict, dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import copy
 import yaml
 from jsonschema import Draft202012Validator, ValidationError
@@ -12,6 +13,7 @@ from jsonschema import Draft202012Validator, ValidationError
 from adaos.services.agent_context import AgentContext, get_ctx
 
 SCHEMA_PATH = Path(__file__).with_name("skill_schema.json")
+_DECORATORS_PATH = Path(__file__).resolve().parents[2] / "sdk" / "core" / "decorators.py"
 
 
 @dataclass
@@ -32,6 +34,12 @@ def _load_schema() -> Dict[str, Any]:
     return json.loads(SCHEMA_PATH.read_text(encoding="utf-8"))
 
 
+@lru_cache(maxsize=1)
+def _validator() -> Draft202012Validator:
+    """Схема читается и компилируется один раз на процесс."""
+    return Draft202012Validator(_load_schema())
+
+
 def _read_yaml(path: Path) -> Dict[str, Any]:
     try:
         return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
@@ -69,8 +77,7 @@ def _static_checks(skill_dir: Path, install_mode: bool) -> List[Issue]:
     raw = _read_yaml(sy)
     data = _normalize_spec(raw)
     try:
-        schema = _load_schema()
-        Draft202012Validator(schema).validate(data)
+        _validator().validate(data)
     except ValidationError as e:
         issues.append(Issue("error", "schema.invalid", f"skill.yaml schema violation: {e.message}", "skill.yaml"))
         return issues
@@ -104,48 +111,64 @@ def _static_checks(skill_dir: Path, install_mode: bool) -> List[Issue]:
     return issues
 
 
-def _dynamic_checks(skill_name: str, skill_dir: Path, install_mode: bool, probe_tools: bool) -> List[Issue]:
-    """
-    Импортируем handlers/main.py в ОТДЕЛЬНОМ процессе Python
-    и сверяем экспорт инструментов/подписок.
-    """
-    code = f"""
-import os, json, importlib.util
+_MARK = "@@adaos-introspect@@"
+
+# один интерпретатор на пачку навыков: импорт каждого handlers/main.py изолирован try/except,
+# подписки считаются по приросту общего реестра; ответы — строки с маркером (print навыка не мешает).
+# sys.modules/sys.path после каждого навыка возвращаются к снимку: одноимённые вспомогательные
+# модули (utils, helpers) разных навыков не должны подменять друг друга
+_INTROSPECT = r"""
+import os, sys, json, importlib.util, traceback
 os.environ['ADAOS_VALIDATE'] = '1'
-mod_name = 'adaos_skill_{skill_name}_handlers_main'
-handler_file = r'{(skill_dir / 'handlers' / 'main.py').as_posix()}'
-spec = importlib.util.spec_from_file_location(mod_name, handler_file)
-if spec is None or spec.loader is None:
-    print(json.dumps({{"ok": False, "error": "spec/load failure"}}))
-    raise SystemExit(0)
-module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(module)
-
-# попытка получить новые публичные реестры (с fallback на старые)
+MARK = %(mark)r
 try:
-    from adaos.sdk.decorators import tools_registry, subscriptions
-    mod_tools = (tools_registry.get(mod_name) or {{}})
-    subs = [t for (t, _fn) in subscriptions]
+    from adaos.sdk.decorators import tools_registry as TOOLS, subscriptions as SUBS
 except Exception:
     try:
-        from adaos.sdk.decorators import _TOOLS, _SUBSCRIPTIONS
-        mod_tools = (_TOOLS.get(mod_name) or {{}})
-        subs = [t for (t, _fn) in _SUBSCRIPTIONS]
+        from adaos.sdk.decorators import _TOOLS as TOOLS, _SUBSCRIPTIONS as SUBS
     except Exception:
-        mod_tools, subs = {{}}, []
-
-exports = list(mod_tools.keys())
-print(json.dumps({{"ok": True, "tools": exports, "subs": subs}}))
+        TOOLS, SUBS = {}, []
+for name, handler_file in json.loads(sys.argv[1]):
+    mod_name = 'adaos_skill_' + name + '_handlers_main'
+    before = len(SUBS)
+    saved_modules, saved_path = set(sys.modules), list(sys.path)
+    try:
+        spec = importlib.util.spec_from_file_location(mod_name, handler_file)
+        if spec is None or spec.loader is None:
+            out = {"name": name, "ok": False, "error": "spec/load failure"}
+        else:
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            out = {"name": name, "ok": True, "tools": list((TOOLS.get(mod_name) or {}).keys()), "subs": [t for (t, _fn) in SUBS[before:]]}
+    except BaseException:
+        out = {"name": name, "ok": False, "import_error": traceback.format_exc(limit=5).strip()}
+    finally:
+        sys.path[:] = saved_path
+        for mod in [m for m in sys.modules if m not in saved_modules]:
+            del sys.modules[mod]
+    print(MARK + json.dumps(out), flush=True)
 """
-    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+
+def _introspect(items: List[Tuple[str, Path]]) -> Tuple[Dict[str, Dict[str, Any]], str]:
+    """Импортировать handlers/main.py навыков в одном отдельном процессе. -> (ответы по имени, stderr)."""
+    arg = json.dumps([(name, (skill_dir / "handlers" / "main.py").as_posix()) for name, skill_dir in items])
+    proc = subprocess.run([sys.executable, "-c", _INTROSPECT % {"mark": _MARK}, arg], capture_output=True, text=True)
+    replies: Dict[str, Dict[str, Any]] = {}
+    for line in proc.stdout.splitlines():
+        if line.startswith(_MARK):
+            try:
+                payload = json.loads(line[len(_MARK) :])
+            except ValueError:
+                continue
+            replies[payload.get("name")] = payload
+    return replies, proc.stderr.strip() or proc.stdout.strip()
+
+
+def _issues_from_payload(skill_dir: Path, payload: Dict[str, Any]) -> List[Issue]:
     issues: List[Issue] = []
-    if proc.returncode != 0:
-        issues.append(Issue("error", "import.failed", f"handler import failed: {proc.stderr.strip() or proc.stdout.strip()}"))
-        return issues
-    try:
-        payload = json.loads(proc.stdout.strip().splitlines()[-1])
-    except Exception:
-        issues.append(Issue("error", "introspect.invalid_json", "introspection did not return valid JSON"))
+    if payload.get("import_error"):
+        issues.append(Issue("error", "import.failed", f"handler import failed: {payload['import_error']}"))
         return issues
     if not payload.get("ok"):
         issues.append(Issue("error", "introspect.failed", str(payload)))
@@ -168,9 +191,111 @@ print(json.dumps({{"ok": True, "tools": exports, "subs": subs}}))
     return issues
 
 
+def _dynamic_checks_many(items: List[Tuple[str, Path]]) -> Dict[str, List[Issue]]:
+    """
+    Импортируем handlers/main.py в ОТДЕЛЬНОМ процессе Python (один на пачку навыков)
+    и сверяем экспорт инструментов/подписок. Если общий процесс умер на каком-то навыке
+    (sys.exit, segfault), оставшиеся проверяются каждый в своём процессе.
+    """
+    out: Dict[str, List[Issue]] = {}
+    pending = list(items)
+    while pending:
+        replies, stderr = _introspect(pending)
+        for name, skill_dir in pending:
+            if name in replies:
+                out[name] = _issues_from_payload(skill_dir, replies[name])
+        rest = [(n, d) for n, d in pending if n not in out]
+        if not rest:
+            break
+        if len(pending) == 1 or not replies:
+            # процесс не ответил и по первому навыку — виноват он
+            name, _ = rest[0]
+            out[name] = [Issue("error", "import.failed", f"handler import failed: {stderr}")]
+            rest = rest[1:]
+        pending = rest
+    return out
+
+
+def _dynamic_checks(skill_name: str, skill_dir: Path, install_mode: bool, probe_tools: bool) -> List[Issue]:
+    return _dynamic_checks_many([(skill_name, skill_dir)])[skill_name]
+
+
+# ---------- кэш отчётов ----------
+
+REPORT_KEY_PREFIX = "skills:validation:"
+# исход импорта зависит от окружения (например, ещё не установленной pip-зависимости), а не только
+# от содержимого навыка — такие отчёты не кэшируем
+_ENV_DEPENDENT = frozenset({"import.failed", "introspect.failed"})
+_SKIP_DIRS = {"__pycache__", "node_modules", ".venv", "venv", ".git", ".pytest_cache", "state", "cache", "logs"}
+_FILE_HASHES: Dict[Tuple[str, int, int], str] = {}  # (path, size, mtime_ns) -> sha256
+
+
+@lru_cache(maxsize=1)
+def _engine_fingerprint() -> str:
+    """
+    Версия AdaOS + схема + исходники валидатора и декораторов SDK: смена любого из них
+    обесценивает кэш отчётов. Исходники учитываются отдельно — в editable-установке версия
+    пакета не меняется (или неизвестна), а правила проверки — меняются.
+    """
+    try:
+        from importlib.metadata import version
+
+        ver = version("adaos")
+    except Exception:
+        ver = "0+unknown"
+    h = hashlib.sha256(f"{ver}\0".encode())
+    for path in (SCHEMA_PATH, Path(__file__), _DECORATORS_PATH):
+        try:
+            h.update(path.read_bytes())
+        except OSError:
+            h.update(b"?")
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+def _file_hash(path: Path, st: os.stat_result) -> str:
+    key = (str(path), st.st_size, st.st_mtime_ns)
+    digest = _FILE_HASHES.get(key)
+    if digest is None:
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        _FILE_HASHES[key] = digest
+    return digest
+
+
+def skill_content_hash(skill_dir: Path) -> str:
+    """Хэш содержимого каталога навыка (пути + содержимое файлов; служебные каталоги пропускаются)."""
+    h = hashlib.sha256()
+    root = Path(skill_dir)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in _SKIP_DIRS and not d.startswith("."))
+        for fn in sorted(filenames):
+            if fn.endswith((".pyc", ".pyo")):
+                continue
+            path = Path(dirpath) / fn
+            try:
+                st = path.stat()
+                digest = _file_hash(path, st)
+            except OSError:
+                continue
+            h.update(path.relative_to(root).as_posix().encode("utf-8") + b"\0" + digest.encode() + b"\n")
+    return h.hexdigest()
+
+
+def _report_to_dict(report: ValidationReport) -> Dict[str, Any]:
+    return {"ok": report.ok, "issues": [asdict(i) for i in report.issues]}
+
+
+def _report_from_dict(data: Any) -> Optional[ValidationReport]:
+    try:
+        return ValidationReport(bool(data["ok"]), [Issue(**i) for i in data["issues"]])
+    except Exception:
+        return None
+
+
 @dataclass(slots=True)
 class SkillValidationService:
     ctx: AgentContext
+    use_cache: bool = True
 
     def validate(
         self,
@@ -184,6 +309,7 @@ class SkillValidationService:
         Валидация навыка:
         - статическая проверка skill.yaml и структуры
         - динамическая проверка экспортов/подписок через импорт handlers/main.py в отдельном процессе
+        Отчёт кэшируется в KV по хэшу содержимого каталога навыка и версии AdaOS.
         """
         ctx = self.ctx or get_ctx()
 
@@ -196,15 +322,80 @@ class SkillValidationService:
         if current is None or getattr(current, "path", None) is None:
             return ValidationReport(False, [Issue("error", "skill.context.missing", "current skill not set")])
 
-        skill_dir = Path(current.path)
-
-        issues: List[Issue] = []
-        issues += _static_checks(skill_dir, bool(install_mode))
-        # если уже есть фатальные ошибки структуры — не продолжаем
-        if any(i.level == "error" for i in issues):
-            ok = not any(i.level == "error" for i in issues)
-            return ValidationReport(ok, issues)
+        return self._validate_dirs([(current.name, Path(current.path))], strict=strict, install_mode=bool(install_mode), probe_tools=probe_tools)[current.name]
 
-        issues += _dynamic_checks(current.name, skill_dir, bool(install_mode), bool(probe_tools))
-        ok = not any(i.level == "error" for i in issues)
-        return ValidationReport(ok, issues)
+    def validate_many(
+        self,
+        skill_names: Iterable[str],
+        *,
+        strict: bool = False,
+        install_mode: Optional[bool] = False,
+        probe_tools: bool = False,
+    ) -> Dict[str, ValidationReport]:
+        """
+        Валидация пачки навыков: неизменённые берутся из кэша, остальные импортируются
+        в одном общем процессе вместо процесса на навык.
+        """
+        ctx = self.ctx or get_ctx()
+        root = Path(ctx.paths.skills_dir())
+        items: List[Tuple[str, Path]] = []
+        out: Dict[str, ValidationReport] = {}
+        for name in skill_names:
+            skill_dir = root / name
+            if skill_dir.is_dir():
+                items.append((name, skill_dir))
+            else:
+                out[name] = ValidationReport(False, [Issue("error", "skill.context.missing", f"skill '{name}' not found")])
+        out.update(self._validate_dirs(items, strict=strict, install_mode=bool(install_mode), probe_tools=probe_tools))
+        return out
+
+    # ---------- внутреннее ----------
+
+    def _validate_dirs(self, items: List[Tuple[str, Path]], *, strict: bool, install_mode: bool, probe_tools: bool) -> Dict[str, ValidationReport]:
+        kv = getattr(self.ctx, "kv", None) if self.use_cache else None
+        flags = f"install={int(install_mode)};probe={int(probe_tools)};strict={int(strict)}"
+        out: Dict[str, ValidationReport] = {}
+        keys: Dict[str, str] = {}
+        cached: Dict[str, Any] = {}
+        if kv is not None:
+            try:
+                cached = kv.get_many([REPORT_KEY_PREFIX + name for name, _ in items])
+            except Exception:
+                cached = {}
+
+        dynamic: List[Tuple[str, Path]] = []
+        static_issues: Dict[str, List[Issue]] = {}
+        for name, skill_dir in items:
+            key = keys[name] = hashlib.sha256(f"{_engine_fingerprint()};{flags};{skill_content_hash(skill_dir)}".encode()).hexdigest()
+            entry = cached.get(REPORT_KEY_PREFIX + name)
+            if isinstance(entry, dict) and entry.get("key") == key:
+                report = _report_from_dict(entry.get("report"))
+                if report is not None:
+                    out[name] = report
+                    continue
+            issues = _static_checks(skill_dir, install_mode)
+            # если уже есть фатальные ошибки структуры — не продолжаем
+            if any(i.level == "error" for i in issues):
+                out[name] = ValidationReport(False, issues)
+                continue
+            static_issues[name] = issues
+            dynamic.append((name, skill_dir))
+
+        if dynamic:
+            for name, issues in _dynamic_checks_many(dynamic).items():
+                all_issues = static_issues[name] + issues
+                out[name] = ValidationReport(not any(i.level == "error" for i in all_issues), all_issues)
+
+        if kv is not None:
+            fresh = {
+                REPORT_KEY_PREFIX + name: {"key": keys[name], "report": _report_to_dict(out[name])}
+                for name, _ in items
+                if not (isinstance(cached.get(REPORT_KEY_PREFIX + name), dict) and cached[REPORT_KEY_PREFIX + name].get("key") == keys[name])
+                and not any(i.code in _ENV_DEPENDENT for i in out[name].issues)
+            }
+            if fresh:
+                try:
+                    kv.set_many(fresh)
+                except Exception:
+                    pass
+        return out
@@ -1,18 +1,29 @@
 from __future__ import annotations
 import importlib.util
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
+from adaos.adapters.db.sqlite_skill_index import SqliteSkillIndex
+from adaos.ports import SQL
 from adaos.ports.skills_loader import SkillsLoaderPort
 
 
 class ImportlibSkillsLoader(SkillsLoaderPort):
+    def __init__(self, sql: Optional[SQL] = None):
+        # с sql список handler'ов берётся из индекса навыков (SqliteSkillIndex), без rglob по дереву
+        self.sql = sql
+
+    def _handlers(self, root: Path) -> list[Path]:
+        if self.sql is None:
+            return list(root.rglob("handlers/main.py"))
+        return SqliteSkillIndex(self.sql, root).handlers()
+
     async def import_all_handlers(self, skills_root: Any) -> None:
         # допускаем Path | str | callable (например, paths.skills_dir)
         if callable(skills_root):
             skills_root = skills_root()
         root = Path(skills_root)
-        for handler in root.rglob("handlers/main.py"):
+        for handler in self._handlers(root):
             # уникализируем имя модуля по пути скилла, чтобы не затирать предыдущие
             mod_name = "adaos_skill_" + handler.parent.as_posix().replace("/", "_")
             spec = importlib.util.spec_from_file_location(mod_name, handler)
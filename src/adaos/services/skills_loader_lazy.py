@@ -0,0 +1,255 @@
+# src/adaos/services/skills_loader_lazy.py
+# ленивая загрузка навыков при буте: подписки из манифеста, импорт handlers/main.py — по первому событию
+from __future__ import annotations
+import asyncio, importlib.util, inspect, logging, os, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+from adaos.adapters.db.sqlite_skill_index import MANIFEST_NAMES, SqliteSkillIndex
+from adaos.ports import SQL, EventBus
+from adaos.ports.skills_loader import SkillsLoaderPort
+from adaos.sdk.core import decorators as _decorators
+from adaos.services.eventbus import emit
+
+_log = logging.getLogger("adaos.skills.loader")
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@dataclass
+class LazySkill:
+    name: str
+    handler: Path
+    topics: Tuple[str, ...]  # events.subscribe из манифеста; пусто — подписки известны только после импорта
+    module: Optional[ModuleType] = None
+    handlers: Dict[str, List[Callable]] = field(default_factory=dict)  # topic -> обработчики модуля
+    error: Optional[str] = None
+    sig: Optional[Tuple[int, int]] = None  # (mtime_ns, size) handlers/main.py на момент импорта/ошибки
+    import_s: Optional[float] = None
+    direct: List[str] = field(default_factory=list)  # темы только из кода, ещё не подписанные напрямую
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def loaded(self) -> bool:
+        return self.module is not None
+
+
+def _file_sig(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _manifest_topics(manifest: Optional[Path]) -> Tuple[str, ...]:
+    if manifest is None:
+        return ()
+    try:
+        data = yaml.load(manifest.read_text(encoding="utf-8"), Loader=_YAML_LOADER) or {}
+        subs = (data.get("events") or {}).get("subscribe") or []
+    except Exception:
+        return ()
+    return tuple(dict.fromkeys(t for t in subs if isinstance(t, str) and t.strip()))
+
+
+class LazySkillsLoader(SkillsLoaderPort):
+    """
+    Загрузчик навыков для бута без импорта кода.
+
+    import_all_handlers() читает только манифесты (``events.subscribe``) и регистрирует на эти
+    темы заглушки в общем реестре ``subscriptions`` — register_subscriptions() подписывает их как
+    обычные обработчики. Модуль навыка импортируется при первом событии по его теме (или в
+    фоновом прогреве warmup() пулом потоков). Ошибка импорта одного навыка не мешает остальным:
+    события такого навыка отбрасываются до изменения handlers/main.py.
+
+    Каждый импорт публикует ``sys.boot.skill`` со временем импорта и ошибкой, если была
+    (из потока event loop — сам импорт идёт в пуле потоков).
+    Навыки без объявленных подписок импортируются прогревом всегда — их темы известны лишь из кода.
+    """
+
+    def __init__(self, sql: Optional[SQL] = None, *, bus: Optional[EventBus] = None, warmup_workers: int = 4):
+        self.sql = sql
+        self.bus = bus
+        self.warmup_workers = max(int(warmup_workers), 0)
+        self.skills: Dict[str, LazySkill] = {}
+        self._subs_lock = threading.Lock()
+
+    # ---------- бут ----------
+
+    def _entries(self, root: Path) -> List[Tuple[str, Optional[Path], Path]]:
+        if self.sql is not None:
+            return [(e.name, e.manifest, e.handler) for e in SqliteSkillIndex(self.sql, root).entries() if e.handler is not None]
+        out = []
+        for handler in root.rglob("handlers/main.py"):
+            skill_dir = handler.parent.parent
+            manifest = next((skill_dir / n for n in MANIFEST_NAMES if (skill_dir / n).is_file()), None)
+            out.append((skill_dir.name, manifest, handler))
+        return out
+
+    async def import_all_handlers(self, skills_root: Any) -> None:
+        # допускаем Path | str | callable (например, paths.skills_dir)
+        if callable(skills_root):
+            skills_root = skills_root()
+        entries = await asyncio.to_thread(self._entries, Path(skills_root))
+        for name, manifest, handler in entries:
+            if name in self.skills:
+                continue
+            skill = self.skills[name] = LazySkill(name=name, handler=Path(handler), topics=_manifest_topics(manifest))
+            for topic in skill.topics:
+                _decorators.subscriptions.append((topic, self._stub(skill, topic)))
+
+    def _stub(self, skill: LazySkill, topic: str) -> Callable:
+        async def _lazy_handler(evt: Any) -> None:
+            await self.dispatch(skill.name, topic, evt)
+
+        _lazy_handler.__qualname__ = f"lazy[{skill.name}:{topic}]"
+        return _lazy_handler
+
+    # ---------- импорт ----------
+
+    def _import(self, skill: LazySkill) -> Tuple[bool, bool]:
+        """
+        Импортировать модуль навыка (однократно; после ошибки — только если файл изменился).
+        Возвращает (импортирован, была ли попытка). Выполняется вне event loop (to_thread / пул
+        прогрева), поэтому ``sys.boot.skill`` публикует вызывающая корутина, а не этот поток.
+        """
+        with skill.lock:
+            if skill.loaded:
+                return True, False
+            sig = _file_sig(skill.handler)
+            if skill.error is not None and sig == skill.sig:
+                return False, False
+            mod_name = f"adaos_skill_{skill.name}_handlers_main"
+            started = time.perf_counter()
+            try:
+                spec = importlib.util.spec_from_file_location(mod_name, skill.handler)
+                if spec is None or spec.loader is None:
+                    raise ImportError(f"cannot import {skill.handler}")
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+            except BaseException as e:
+                skill.error, skill.sig = f"{type(e).__name__}: {e}", sig
+                skill.import_s = time.perf_counter() - started
+                self._forget_subscriptions(mod_name)
+                _log.warning("skill %s import failed: %s", skill.name, skill.error)
+                return False, True
+            skill.import_s = time.perf_counter() - started
+            skill.module, skill.error, skill.sig = module, None, sig
+            skill.direct = self._adopt_subscriptions(skill, mod_name)
+        return True, True
+
+    def _forget_subscriptions(self, mod_name: str) -> List[Tuple[str, Callable]]:
+        # подписки модуля забираем из общего реестра: их вызывает заглушка, а не register_subscriptions()
+        # @subscribe из других потоков прогрева дописывает в список без нашего lock —
+        # поэтому удаляем только свои элементы, а не пересобираем список целиком
+        with self._subs_lock:
+            subs = _decorators.subscriptions
+            mine = [item for item in list(subs) if getattr(item[1], "__module__", None) == mod_name]
+            for item in mine:
+                subs.remove(item)
+        return mine
+
+    def _adopt_subscriptions(self, skill: LazySkill, mod_name: str) -> List[str]:
+        """Разложить обработчики модуля по темам; вернуть темы, на которые заглушек нет."""
+        for topic, fn in self._forget_subscriptions(mod_name):
+            skill.handlers.setdefault(topic, []).append(fn)
+        return [t for t in skill.handlers if t not in skill.topics]
+
+    async def _subscribe_direct(self, skill: LazySkill) -> None:
+        # темы, объявленные только в коде (@subscribe без манифеста), подписываем напрямую — уже в event loop
+        from adaos.sdk.data.bus import on
+
+        topics, skill.direct = skill.direct, []
+        for topic in topics:
+
+            async def _direct(evt: Any, _topic: str = topic) -> None:
+                await self.dispatch(skill.name, _topic, evt)
+
+            try:
+                await on(topic, _direct)
+            except Exception as e:
+                _log.warning("skill %s: subscribe %s failed: %s", skill.name, topic, e)
+
+    def _report(self, skill: LazySkill, reason: str) -> None:
+        if self.bus is None:
+            return
+        payload = {
+            "skill": skill.name,
+            "ok": skill.error is None,
+            "import_ms": round((skill.import_s or 0.0) * 1000, 3),
+            "reason": reason,  # event | warmup | load
+            "subscriptions": sum(len(v) for v in skill.handlers.values()),
+        }
+        if skill.error is not None:
+            payload["error"] = skill.error
+        try:
+            emit(self.bus, "sys.boot.skill", payload, "skills.loader")
+        except Exception:
+            pass
+
+    # ---------- доставка ----------
+
+    async def ensure_loaded(self, name: str, *, reason: str = "load") -> bool:
+        skill = self.skills.get(name)
+        if skill is None:
+            return False
+        if skill.loaded:
+            return True
+        ok, attempted = await asyncio.to_thread(self._import, skill)
+        if attempted:
+            self._report(skill, reason)
+        if skill.direct:
+            await self._subscribe_direct(skill)
+        return ok
+
+    async def dispatch(self, name: str, topic: str, evt: Any) -> None:
+        """Передать событие обработчикам навыка (импортировав модуль при первом обращении)."""
+        skill = self.skills.get(name)
+        if skill is None:
+            return
+        if not skill.loaded and not await self.ensure_loaded(name, reason="event"):
+            return
+        for fn in skill.handlers.get(topic, ()):
+            res = fn(evt)
+            if inspect.isawaitable(res):
+                await res
+
+    async def warmup(self, names: Optional[List[str]] = None) -> Dict[str, bool]:
+        """
+        Фоновый импорт навыков пулом из ``warmup_workers`` потоков. При ``warmup_workers=0``
+        прогреваются только навыки без подписок в манифесте. Возвращает {навык: импортирован}.
+        """
+        pending = [s for n, s in self.skills.items() if (names is None or n in names) and not s.loaded]
+        if not self.warmup_workers:
+            pending = [s for s in pending if not s.topics]
+        if not pending:
+            return {}
+        loop = asyncio.get_running_loop()
+        pool = ThreadPoolExecutor(max(1, min(self.warmup_workers or 1, len(pending))), thread_name_prefix="adaos-skill-warmup")
+
+        async def _load(skill: LazySkill) -> bool:
+            ok, attempted = await loop.run_in_executor(pool, self._import, skill)
+            if attempted:
+                self._report(skill, "warmup")  # уже в потоке лупа: async-подписчики шины идут в нём же
+            return ok
+
+        try:
+            results = await asyncio.gather(*(_load(s) for s in pending))
+        finally:
+            # при отмене (shutdown) не ждём уже идущие импорты, ещё не начатые — снимаем
+            pool.shutdown(wait=False, cancel_futures=True)
+        for s in pending:
+            if s.direct:
+                await self._subscribe_direct(s)
+        return {s.name: ok for s, ok in zip(pending, results)}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            name: {"loaded": s.loaded, "error": s.error, "import_ms": None if s.import_s is None else round(s.import_s * 1000, 3), "topics": list(s.topics)}
+            for name, s in self.skills.items()
+        }
@@ -0,0 +1,186 @@
+# src/adaos/services/tests/parallel.py
+# параллельный прогон тестов: каталог tests/ — единица работы, длинные первыми (по истории из KV)
+from __future__ import annotations
+import os, statistics, tempfile, threading, time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+DURATION_PREFIX = "tests:duration:"
+_EMA_ALPHA = 0.5  # вес последнего прогона в сглаженной длительности
+
+# (пути шарда, путь для --junitxml) -> (exit_code, stdout, stderr)
+ShardRunner = Callable[[List[str], str], Tuple[int, str, str]]
+
+
+@dataclass
+class ShardResult:
+    paths: List[str]
+    exit_code: int
+    stdout: str
+    stderr: str
+    duration: float
+
+
+@dataclass
+class ParallelRunResult:
+    exit_code: int
+    wall_s: float
+    shards: List[ShardResult] = field(default_factory=list)
+    junit_xml: Optional[str] = None
+
+    @property
+    def busy_s(self) -> float:
+        """Сумма длительностей шардов (то, сколько занял бы последовательный прогон)."""
+        return sum(s.duration for s in self.shards)
+
+
+def collect_test_dirs(root: Path) -> List[str]:
+    """Каталоги ``tests`` под ``root``, в которых есть test_*.py."""
+    paths: List[str] = []
+    if root.is_dir():
+        for tdir in root.rglob("tests"):
+            if tdir.is_dir() and any(f.name.startswith("test_") and f.suffix == ".py" for f in tdir.rglob("test_*.py")):
+                paths.append(str(tdir))
+    return paths
+
+
+# ---------- история длительностей ----------
+
+
+def load_durations(kv, paths: Iterable[str]) -> Dict[str, float]:
+    if kv is None:
+        return {}
+    keys = {DURATION_PREFIX + p: p for p in paths}
+    try:
+        stored = kv.get_many(keys)
+    except Exception:
+        return {}
+    return {keys[k]: float(v) for k, v in stored.items() if isinstance(v, (int, float))}
+
+
+def save_durations(kv, measured: Mapping[str, float], previous: Mapping[str, float]) -> None:
+    if kv is None or not measured:
+        return
+    items = {}
+    for path, seconds in measured.items():
+        old = previous.get(path)
+        items[DURATION_PREFIX + path] = seconds if old is None else _EMA_ALPHA * seconds + (1 - _EMA_ALPHA) * old
+    try:
+        kv.set_many(items)
+    except Exception:
+        pass
+
+
+def order_by_duration(paths: Sequence[str], durations: Mapping[str, float]) -> List[str]:
+    """
+    Длинные первыми (LPT): так хвост прогона занимают короткие шарды. Каталоги без истории
+    оцениваются медианой известных — новый навык не встаёт ни первым, ни последним.
+    """
+    known = [durations[p] for p in paths if p in durations]
+    guess = statistics.median(known) if known else 0.0
+    return sorted(paths, key=lambda p: durations.get(p, guess), reverse=True)
+
+
+# ---------- слияние результатов ----------
+
+
+def merge_exit_codes(codes: Iterable[int]) -> int:
+    """
+    Коды pytest: 0 — ок, 1 — упавшие тесты, 2 — прерван, 3 — внутренняя ошибка, 4 — ошибка
+    использования, 5 — тестов нет. Пустые шарды (5) не портят общий итог; иначе — самый тяжёлый.
+    """
+    codes = list(codes)
+    real = [c for c in codes if c != 5]
+    if not real:
+        return 5 if codes else 0
+    severity = {0: 0, 1: 1, 4: 2, 2: 3, 3: 4}
+    return max(real, key=lambda c: severity.get(c, 5))
+
+
+def merge_junit(files: Iterable[str], out_path: str) -> str:
+    """Склеить JUnit XML шардов в один <testsuites> с суммарными счётчиками."""
+    merged = ET.Element("testsuites")
+    totals = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+    total_time = 0.0
+    for f in files:
+        try:
+            root = ET.parse(f).getroot()
+        except (OSError, ET.ParseError):
+            continue
+        suites = [root] if root.tag == "testsuite" else list(root.iter("testsuite"))
+        for suite in suites:
+            merged.append(suite)
+            for k in totals:
+                totals[k] += int(suite.get(k, 0) or 0)
+            total_time += float(suite.get("time", 0) or 0)
+    for k, v in totals.items():
+        merged.set(k, str(v))
+    merged.set("time", f"{total_time:.3f}")
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(merged).write(out_path, encoding="utf-8", xml_declaration=True)
+    return out_path
+
+
+# ---------- прогон ----------
+
+
+def run_parallel(
+    paths: Sequence[str],
+    run_shard: ShardRunner,
+    *,
+    jobs: int,
+    kv=None,
+    junit_xml: Optional[str] = None,
+    on_done: Optional[Callable[[ShardResult], None]] = None,
+) -> ParallelRunResult:
+    """
+    Прогнать каталоги тестов в ``jobs`` параллельных процессах (каждый каталог — отдельный
+    запуск ``run_shard``). Порядок — по истории длительностей из ``kv``, после прогона история
+    обновляется. JUnit XML шардов сливаются в ``junit_xml`` (если задан).
+    """
+    paths = list(dict.fromkeys(paths))
+    history = load_durations(kv, paths)
+    ordered = order_by_duration(paths, history)
+    results: List[ShardResult] = []
+    junit_files: List[str] = []
+    lock = threading.Lock()
+    started = time.perf_counter()
+
+    with tempfile.TemporaryDirectory(prefix="adaos_junit_") as tmp:
+
+        def _one(i: int, path: str) -> ShardResult:
+            junit = os.path.join(tmp, f"shard-{i}.xml")
+            t0 = time.perf_counter()
+            try:
+                code, out, err = run_shard([path], junit)
+            except Exception as e:
+                code, out, err = 3, "", f"shard failed to start: {e!r}"
+            res = ShardResult([path], code, out, err, time.perf_counter() - t0)
+            with lock:
+                if os.path.exists(junit):
+                    junit_files.append(junit)
+                if on_done is not None:
+                    on_done(res)
+            return res
+
+        with ThreadPoolExecutor(max(1, min(int(jobs), len(ordered) or 1)), thread_name_prefix="adaos-tests") as pool:
+            futures = [pool.submit(_one, i, p) for i, p in enumerate(ordered)]
+            for fut in as_completed(futures):
+                results.append(fut.result())
+
+        merged_junit = None
+        if junit_xml:
+            merged_junit = merge_junit(sorted(junit_files), junit_xml)
+
+    # шард, который не стартовал/был убит, — плохая оценка длительности; не сохраняем
+    save_durations(kv, {r.paths[0]: r.duration for r in results if r.exit_code in (0, 1, 5)}, history)
+    results.sort(key=lambda r: ordered.index(r.paths[0]))
+    return ParallelRunResult(
+        exit_code=merge_exit_codes(r.exit_code for r in results),
+        wall_s=time.perf_counter() - started,
+        shards=results,
+        junit_xml=merged_junit,
+    )
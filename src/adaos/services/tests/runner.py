@@ -1,10 +1,12 @@
 from __future__ import annotations
+import asyncio, os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Sequence
 
 from adaos.services.agent_context import get_ctx
 from adaos.ports.sandbox import ExecLimits
+from adaos.services.tests.parallel import ParallelRunResult, collect_test_dirs, run_parallel
 
 
 @dataclass
@@ -23,21 +25,14 @@ def _inside_base(p: Path, base: Path) -> bool:
         return False
 
 
-def run_pytest(
-    target: str | None = None,
-    *,
-    kexpr: Optional[str] = None,
-    markers: Optional[str] = None,
-    maxfail: Optional[int] = None,
-    junit_xml: Optional[str] = None,
-    use_sandbox: Optional[bool] = None,
-    profile: str = "tool",
-) -> TestRunResult:
-    """
-    target: путь к каталогу/файлу тестов. По умолчанию: {repo}/tests или {BASE_DIR}/tests (если существует).
-    use_sandbox: True — запуск через SandboxService (если cwd внутри BASE_DIR), False — прямой запуск pytest.
-                 None — автодетект: True, если target внутри BASE_DIR.
-    """
+def _pytest_invocation(
+    target: str | None,
+    kexpr: Optional[str],
+    markers: Optional[str],
+    maxfail: Optional[int],
+    junit_xml: Optional[str],
+    use_sandbox: Optional[bool],
+) -> tuple[Path, list[str], bool]:
     ctx = get_ctx()
     base = Path(ctx.paths.base)
     # разумный выбор директории по умолчанию:
@@ -63,16 +58,38 @@ def run_pytest(
     # sandbox или нет?
     if use_sandbox is None:
         use_sandbox = _inside_base(tpath, base)
+    return tpath, args, use_sandbox
+
+
+def _sandbox_kwargs(tpath: Path, profile: str) -> dict:
+    return dict(
+        cwd=str(tpath if tpath.is_dir() else tpath.parent),
+        profile=profile,
+        inherit_env=True,  # безопасный белый список + PYTHON*/ADAOS_*
+        extra_env={"PYTHONUNBUFFERED": "1"},  # приятный stdout
+        limits=ExecLimits(wall_time_sec=300, cpu_time_sec=None, max_rss_mb=None),
+    )
+
+
+def run_pytest(
+    target: str | None = None,
+    *,
+    kexpr: Optional[str] = None,
+    markers: Optional[str] = None,
+    maxfail: Optional[int] = None,
+    junit_xml: Optional[str] = None,
+    use_sandbox: Optional[bool] = None,
+    profile: str = "tool",
+) -> TestRunResult:
+    """
+    target: путь к каталогу/файлу тестов. По умолчанию: {repo}/tests или {BASE_DIR}/tests (если существует).
+    use_sandbox: True — запуск через SandboxService (если cwd внутри BASE_DIR), False — прямой запуск pytest.
+                 None — автодетект: True, если target внутри BASE_DIR.
+    """
+    tpath, args, use_sandbox = _pytest_invocation(target, kexpr, markers, maxfail, junit_xml, use_sandbox)
 
     if use_sandbox:
-        res = ctx.sandbox.run(
-            ["python", "-m", "pytest", *args],
-            cwd=str(tpath if tpath.is_dir() else tpath.parent),
-            profile=profile,
-            inherit_env=True,  # безопасный белый список + PYTHON*/ADAOS_*
-            extra_env={"PYTHONUNBUFFERED": "1"},  # приятный stdout
-            limits=ExecLimits(wall_time_sec=300, cpu_time_sec=None, max_rss_mb=None),
-        )
+        res = get_ctx().sandbox.run(["python", "-m", "pytest", *args], **_sandbox_kwargs(tpath, profile))
         return TestRunResult(res.exit_code, res.stdout, res.stderr, used_sandbox=True)
     else:
         # прямой запуск (для репозиторных тестов вне BASE_DIR)
@@ -80,3 +97,78 @@ def run_pytest(
 
         p = subprocess.run(["python", "-m", "pytest", *args], cwd=str(tpath if tpath.is_dir() else tpath.parent), capture_output=True, text=True)
         return TestRunResult(p.returncode, p.stdout, p.stderr, used_sandbox=False)
+
+
+async def arun_pytest(
+    target: str | None = None,
+    *,
+    kexpr: Optional[str] = None,
+    markers: Optional[str] = None,
+    maxfail: Optional[int] = None,
+    junit_xml: Optional[str] = None,
+    use_sandbox: Optional[bool] = None,
+    profile: str = "tool",
+) -> TestRunResult:
+    """То же, что run_pytest, но не блокирует event loop (SandboxService.arun / asyncio-подпроцесс)."""
+    tpath, args, use_sandbox = _pytest_invocation(target, kexpr, markers, maxfail, junit_xml, use_sandbox)
+
+    sandbox = get_ctx().sandbox
+    if use_sandbox and hasattr(sandbox, "arun"):
+        res = await sandbox.arun(["python", "-m", "pytest", *args], **_sandbox_kwargs(tpath, profile))
+        return TestRunResult(res.exit_code, res.stdout, res.stderr, used_sandbox=True)
+    if use_sandbox:
+        return await asyncio.to_thread(
+            run_pytest, target, kexpr=kexpr, markers=markers, maxfail=maxfail, junit_xml=junit_xml, use_sandbox=True, profile=profile
+        )
+    p = await asyncio.create_subprocess_exec(
+        "python",
+        "-m",
+        "pytest",
+        *args,
+        cwd=str(tpath if tpath.is_dir() else tpath.parent),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    out, err = await p.communicate()
+    return TestRunResult(p.returncode, out.decode("utf-8", errors="replace"), err.decode("utf-8", errors="replace"), used_sandbox=False)
+
+
+def run_pytest_parallel(
+    targets: Optional[Sequence[str]] = None,
+    *,
+    jobs: Optional[int] = None,
+    kexpr: Optional[str] = None,
+    markers: Optional[str] = None,
+    junit_xml: Optional[str] = None,
+    profile: str = "tool",
+) -> ParallelRunResult:
+    """
+    Прогнать каталоги тестов (по умолчанию — все tests/ навыков) параллельно: каждый каталог —
+    отдельный pytest в песочнице с CPU/RSS профиля ``profile`` и wall-time 600 с, не больше ``jobs`` одновременно
+    (по умолчанию — число ядер). Длинные каталоги стартуют первыми (история в KV), JUnit XML
+    шардов сливаются в ``junit_xml``.
+    """
+    ctx = get_ctx()
+    paths = list(targets) if targets else collect_test_dirs(Path(ctx.paths.skills_dir()))
+    opts: list[str] = ["-q"]
+    if kexpr:
+        opts += ["-k", kexpr]
+    if markers:
+        opts += ["-m", markers]
+    prof = getattr(ctx.sandbox, "profiles", {}).get(profile) or ExecLimits()
+    # wall-time как у обычного прогона из CLI: 15 с профиля tool рассчитаны на вызов инструмента, а не на набор тестов
+    shard_limits = ExecLimits(wall_time_sec=600, cpu_time_sec=prof.cpu_time_sec, max_rss_mb=prof.max_rss_mb)
+
+    def _shard(shard_paths: list[str], junit: str) -> tuple[int, str, str]:
+        cwd = Path(shard_paths[0])
+        res = ctx.sandbox.run(
+            ["python", "-m", "pytest", *opts, "--junitxml", junit, *shard_paths],
+            cwd=str(cwd if cwd.is_dir() else cwd.parent),
+            profile=profile,
+            limits=shard_limits,
+            inherit_env=True,
+            extra_env={"PYTHONUNBUFFERED": "1"},
+        )
+        return res.exit_code, res.stdout, res.stderr
+
+    return run_parallel(paths, _shard, jobs=jobs or os.cpu_count() or 1, kv=ctx.kv, junit_xml=junit_xml)
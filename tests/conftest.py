@@ -11,6 +11,8 @@ from adaos.services.settings import Settings
 from adaos.services.eventbus import LocalEventBus
 from adaos.adapters.db.sqlite_store import SQLite, SQLiteKV
 from adaos.domain.types import ProcessSpec
+from adaos.services.sandbox.runner import ProcSandbox
+from adaos.services.sandbox.service import SandboxService
 from adaos.services.logging import setup_logging, attach_event_logger  # важное: создаёт файл-лог
 
 _MIN_PY = tuple(map(int, os.getenv("ADAOS_MIN_PY", "3.11").split(".")))
@@ -253,6 +255,32 @@ def _autocontext(tmp_path, monkeypatch):
         clear_ctx()
 
 
+# ---------- SandboxService поверх настоящего ProcSandbox (тесты песочницы) ----------
+class _AllowAllCaps:
+    def require(self, *args, **kwargs):
+        return None
+
+
+@pytest.fixture
+def sandbox_service(_autocontext):
+    """Фабрика SandboxService: реальный ProcSandbox в BASE_DIR теста, capabilities не проверяются; воркеры закрываются."""
+    made: list[SandboxService] = []
+
+    def make(bus=None, **kwargs) -> SandboxService:
+        svc = SandboxService(
+            runner=ProcSandbox(fs_base=str(_autocontext.paths.base_dir())),
+            caps=_AllowAllCaps(),
+            bus=bus or _autocontext.bus,
+            **kwargs,
+        )
+        made.append(svc)
+        return svc
+
+    yield make
+    for svc in made:
+        svc.close_workers()
+
+
 def pytest_sessionstart(session):
     if sys.version_info < _MIN_PY:
         from _pytest.outcomes import Exit
@@ -0,0 +1,66 @@
+# tests/smoke/test_bus_adapter_cache.py
+"""Кэш адаптеров sdk.data.bus/sdk.data.events: конвенции вызова и однократная сборка адаптера на шину."""
+from __future__ import annotations
+
+import asyncio
+
+from adaos.sdk.data import bus as sdk_bus
+from adaos.sdk.data import events as sdk_events
+from adaos.services.agent_context import get_ctx
+
+
+class _TopicBus:
+    def __init__(self) -> None:
+        self.seen: list[tuple] = []
+
+    def publish(self, topic, payload, source=None):
+        self.seen.append((topic, payload, source))
+
+    def subscribe(self, topic, handler):
+        pass
+
+
+def _clear_caches() -> None:
+    sdk_bus._PUBLISH_ADAPTERS.clear()
+    sdk_bus._SUBSCRIBE_ADAPTERS.clear()
+    sdk_events._PUBLISHERS.clear()
+
+
+def test_adapter_resolved_once_per_bus(monkeypatch):
+    ctx = get_ctx()
+    _clear_caches()
+    got: list = []
+    ctx.bus.subscribe("cache.", lambda ev: got.append(ev.payload))
+
+    asyncio.run(sdk_bus.emit("cache.a", {"x": 1}, source="t", actor="me"))
+    sdk_events.publish("cache.b", {"y": 2}, source="t", trace="z")
+    assert got == [{"x": 1, "_meta": {"actor": "me"}}, {"y": 2, "_meta": {"trace": "z"}}]
+    assert len(sdk_bus._PUBLISH_ADAPTERS) == 1 and len(sdk_events._PUBLISHERS) == 1
+
+    # другой объект шины — другой адаптер и другая конвенция вызова
+    other = _TopicBus()
+    monkeypatch.setattr(ctx, "bus", other)
+    asyncio.run(sdk_bus.emit("cache.c", {"z": 3}, source="s"))
+    sdk_events.publish("cache.d", {}, source="s")
+    assert other.seen == [("cache.c", {"z": 3}, "s"), ("cache.d", {}, "s")]
+    assert len(sdk_bus._PUBLISH_ADAPTERS) == 2 and len(sdk_events._PUBLISHERS) == 2
+
+
+def test_adapter_built_once_for_many_events(monkeypatch):
+    ctx = get_ctx()
+    _clear_caches()
+    ctx.bus.subscribe("cache.", lambda ev: None)
+    built: list[str] = []
+    real_emit, real_pub = sdk_bus._build_publish_adapter, sdk_events._build_publisher
+    monkeypatch.setattr(sdk_bus, "_build_publish_adapter", lambda fn: built.append("emit") or real_emit(fn))
+    monkeypatch.setattr(sdk_events, "_build_publisher", lambda fn: built.append("events") or real_pub(fn))
+
+    async def run() -> None:
+        for i in range(200):
+            await sdk_bus.emit("cache.tick", {"i": i}, source="cache")
+
+    asyncio.run(run())
+    for i in range(200):
+        sdk_events.publish("cache.tick", {"i": i}, source="cache")
+    # рефлексия по сигнатуре publish — один раз на шину, а не на каждое событие
+    assert built == ["emit", "events"]
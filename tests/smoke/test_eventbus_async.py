@@ -0,0 +1,121 @@
+# tests/smoke/test_eventbus_async.py
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+from adaos.domain import Event
+from adaos.services.eventbus import AsyncEventBus, OverflowPolicy
+
+
+def _ev(topic: str, n: int = 0) -> Event:
+    return Event(type=topic, payload={"n": n}, source="test", ts=time.time())
+
+
+def test_async_bus_slow_handler_does_not_stall_publisher():
+    bus = AsyncEventBus(queue_size=100)
+    fast: list[int] = []
+    slow: list[int] = []
+
+    async def slow_handler(ev):
+        await asyncio.sleep(0.01)
+        slow.append(ev.payload["n"])
+
+    bus.subscribe("demo.", slow_handler)
+    bus.subscribe("demo.", lambda ev: fast.append(ev.payload["n"]))
+
+    async def main():
+        for i in range(20):
+            bus.publish(_ev("demo.x", i))
+        # publish только кладёт в очереди: обработчики издателя не касаются
+        assert slow == [] and fast == []
+        assert bus.stats()["depth"] > 0
+        assert await bus.drain(timeout=5.0)
+        await bus.aclose()
+
+    asyncio.run(main())
+    assert fast == list(range(20))
+    assert slow == list(range(20))
+
+
+def test_async_bus_overflow_policies():
+    async def run(policy: OverflowPolicy) -> tuple[list[int], dict]:
+        bus = AsyncEventBus(queue_size=3, overflow=policy)
+        seen: list[int] = []
+        bus.subscribe("t", lambda ev: seen.append(ev.payload["n"]))
+        bus.start()
+        for i in range(10):  # воркер не успевает: публикуем без передачи управления лупу
+            bus.publish(_ev("t", i))
+        await bus.drain(timeout=5.0)
+        stats = bus.stats()
+        await bus.aclose()
+        return seen, stats
+
+    seen, stats = asyncio.run(run(OverflowPolicy.DROP_NEWEST))
+    assert seen == [0, 1, 2] and stats["dropped"] == 7
+
+    seen, stats = asyncio.run(run(OverflowPolicy.DROP_OLDEST))
+    assert seen == [7, 8, 9] and stats["dropped"] == 7
+
+    # block: sync publish из лупа ждать не может — хвост ограничен queue_size, старые вытесняются
+    # (голова хвоста уже передаётся в очередь и не вытесняется)
+    seen, stats = asyncio.run(run(OverflowPolicy.BLOCK))
+    assert seen == [0, 1, 2, 3, 8, 9] and stats["dropped"] == 4
+    assert stats["subscribers"][0]["max_depth"] == 6
+
+
+def test_async_bus_block_backlog_overflow_is_logged_once(caplog):
+    async def main() -> dict:
+        bus = AsyncEventBus(queue_size=2, overflow="block")
+        bus.subscribe("t", lambda ev: None)
+        bus.start()
+        for i in range(50):
+            bus.publish(_ev("t", i))
+        await bus.drain(timeout=5.0)
+        stats = bus.stats()
+        await bus.aclose()
+        return stats
+
+    with caplog.at_level("WARNING", logger="adaos.eventbus"):
+        stats = asyncio.run(main())
+    assert stats["dropped"] == 50 - 4 and stats["delivered"] == 4
+    assert [r.message for r in caplog.records] == ["eventbus.backlog.overflow"]
+
+
+def test_async_bus_apublish_blocks_and_foreign_thread_publish():
+    bus = AsyncEventBus(queue_size=1, overflow="block")
+    seen: list[int] = []
+
+    async def handler(ev):
+        await asyncio.sleep(0.005)
+        seen.append(ev.payload["n"])
+
+    bus.subscribe("t.", handler)
+
+    async def main():
+        bus.start()
+        for i in range(5):
+            await bus.apublish(_ev("t.a", i))
+            assert bus.stats()["depth"] <= 2
+        th = threading.Thread(target=lambda: [bus.publish(_ev("t.b", 100 + i)) for i in range(3)])
+        th.start()
+        await asyncio.get_running_loop().run_in_executor(None, th.join)
+        await bus.drain(timeout=5.0)
+        await bus.aclose()
+
+    asyncio.run(main())
+    assert seen == [0, 1, 2, 3, 4, 100, 101, 102]
+
+
+def test_async_bus_without_loop_delivers_inline():
+    bus = AsyncEventBus()
+    seen: list[str] = []
+
+    async def coro_handler(ev):
+        seen.append("async:" + ev.type)
+
+    bus.subscribe("", lambda ev: seen.append(ev.type))
+    bus.subscribe("x", coro_handler)
+    bus.publish(_ev("x.y"))
+    assert seen == ["x.y", "async:x.y"]
@@ -0,0 +1,90 @@
+# tests/smoke/test_eventbus_trie.py
+"""Префиксное дерево LocalEventBus: эквивалентность прежней семантике."""
+from __future__ import annotations
+
+import random
+from collections import defaultdict
+
+from adaos.domain import Event
+from adaos.services.eventbus import LocalEventBus
+
+
+class _LinearBus:
+    """Прежняя реализация: линейный startswith по всем префиксам (эталон для сравнения)."""
+
+    def __init__(self) -> None:
+        self._subs = defaultdict(list)
+
+    def subscribe(self, type_prefix, handler) -> None:
+        self._subs[type_prefix].append(handler)
+
+    def publish(self, event: Event) -> None:
+        pairs = [(p, hs[:]) for p, hs in self._subs.items()]
+        for prefix, handlers in pairs:
+            if prefix == "*" or prefix == "" or event.type.startswith(prefix):
+                for h in handlers:
+                    h(event)
+
+
+def _ev(topic: str) -> Event:
+    return Event(type=topic, payload={}, source="test", ts=0.0)
+
+
+def _prefixes(n: int) -> list[str]:
+    rnd = random.Random(n)
+    roots = ["proc", "sandbox", "net.subnet", "skills", "sys", "ui", "obs.test"]
+    out = []
+    for i in range(n):
+        root = rnd.choice(roots)
+        out.append(f"{root}.s{i}." if i % 3 else f"{root}.s{i}")
+    return out
+
+
+def test_trie_matches_startswith_semantics():
+    prefixes = ["", "*", "a", "a.", "a.b", "a.bc", "a.b.", "a.b.c", "b", "ab", "a.b.c.d"]
+    topics = ["a", "a.b", "a.bc", "a.b.c", "a.b.cd", "a.b.c.d.e", "ab", "abc", "b.x", "c", ""]
+    trie, linear = LocalEventBus(), _LinearBus()
+    got: list[tuple[str, str]] = []
+    want: list[tuple[str, str]] = []
+    for p in prefixes:
+        trie.subscribe(p, lambda ev, p=p: got.append((ev.type, p)))
+        linear.subscribe(p, lambda ev, p=p: want.append((ev.type, p)))
+    for t in topics:
+        trie.publish(_ev(t))
+        linear.publish(_ev(t))
+    assert got == want
+
+
+def test_trie_keeps_subscription_order_and_snapshot():
+    bus = LocalEventBus()
+    seen: list[str] = []
+
+    def late(ev):
+        seen.append("late")
+
+    def first(ev):
+        seen.append("first")
+        # подписка во время publish не влияет на текущую доставку
+        bus.subscribe("x.", late)
+
+    bus.subscribe("x.", first)
+    bus.subscribe("", lambda ev: seen.append("all"))
+    bus.subscribe("x.", lambda ev: seen.append("second"))
+    bus.publish(_ev("x.y"))
+    assert seen == ["first", "second", "all"]
+
+
+def test_trie_matches_linear_on_many_prefixes():
+    prefixes = _prefixes(1000)
+    topics = ["proc.started", "sandbox.killed", "net.subnet.node.up", "skills.s5.done", "sys.ready"]
+    topics += [p + "x" for p in prefixes[::37]] + [p.rstrip(".") for p in prefixes[1::41]]
+    trie, linear = LocalEventBus(), _LinearBus()
+    got: list[tuple[str, str]] = []
+    want: list[tuple[str, str]] = []
+    for p in prefixes:
+        trie.subscribe(p, lambda ev, p=p: got.append((ev.type, p)))
+        linear.subscribe(p, lambda ev, p=p: want.append((ev.type, p)))
+    for t in topics:
+        trie.publish(_ev(t))
+        linear.publish(_ev(t))
+    assert got == want and len(want) > len(topics) // 2
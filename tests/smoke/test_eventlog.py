@@ -0,0 +1,121 @@
+# tests/smoke/test_eventlog.py
+"""Журнал событий: индекс блоков, запросы с seek в сжатые сегменты, восстановление индекса."""
+from __future__ import annotations
+
+import gzip
+import json
+
+from adaos.services.eventlog import EventLog
+
+
+def _line(i: int, topic: str, node: str = "n1") -> str:
+    return json.dumps({"ts": 1000.0 + i, "topic": topic, "payload": {"i": i}, "node_id": node}) + "\n"
+
+
+def _fill(log: EventLog, n: int) -> None:
+    for start in range(0, n, 50):
+        log.append([_line(i, "net.subnet.join" if i % 10 == 0 else "ui.tick", "n2" if i % 7 == 0 else "n1") for i in range(start, min(start + 50, n))])
+
+
+def _ids(lines) -> list[int]:
+    return [json.loads(ln)["payload"]["i"] for ln in lines]
+
+
+def test_queries_seek_across_rotated_segments(tmp_path, monkeypatch):
+    path = tmp_path / "events.log"
+    log = EventLog(path, max_bytes=30_000, keep=1, block_bytes=4096)
+    _fill(log, 1000)
+    assert (tmp_path / "events.log.1.gz").exists() and (tmp_path / "events.log.1.idx").exists()
+    assert not (tmp_path / "events.log.2.gz").exists()
+    # сжатый сегмент — обычный gzip, читается целиком как раньше
+    with gzip.open(tmp_path / "events.log.1.gz", "rt", encoding="utf-8") as gz:
+        rotated = _ids(gz.read().splitlines())
+    assert rotated == sorted(rotated)
+
+    all_ids = _ids(log.query())
+    oldest = all_ids[0]
+    assert all_ids == list(range(oldest, 1000)) and oldest > 0  # самое старое ушло ротацией
+
+    reads = []
+    real_read = log._read_block
+    monkeypatch.setattr(log, "_read_block", lambda seq, b: reads.append(b) or real_read(seq, b))
+
+    # since: читаются только блоки с подходящими ts
+    assert _ids(log.query(since=1990.0)) == list(range(990, 1000))
+    assert len(reads) == 1
+    reads.clear()
+    assert _ids(log.query(since=1000.0 + oldest + 5, until=1000.0 + oldest + 8)) == [oldest + k for k in range(5, 9)]
+    assert len(reads) <= 2 and all(b.zoff >= 0 for b in reads)  # seek в .gz, а не распаковка всего сегмента
+    reads.clear()
+
+    # topic_prefix / node_id + tail
+    assert _ids(log.tail(3, topic_prefix="net.")) == [970, 980, 990]
+    assert _ids(log.tail(2, node_id="n2", topic_prefix="net.subnet")) == [910, 980]
+    assert _ids(log.tail(5)) == [995, 996, 997, 998, 999]
+    reads.clear()
+    assert log.tail(5, topic_prefix="nothing.") == []
+    assert reads == []  # по индексу ни один блок не подходит
+
+
+def test_reopen_recovers_index_and_repacks_legacy_gz(tmp_path):
+    path = tmp_path / "events.log"
+    # старый формат: .gz одним членом и без индекса
+    with gzip.open(tmp_path / "events.log.1.gz", "wt", encoding="utf-8") as gz:
+        gz.write("".join(_line(i, "old.topic") for i in range(300)))
+    log = EventLog(path, max_bytes=10**9, block_bytes=2048)
+    assert (tmp_path / "events.log.1.idx").exists()
+    _fill(log, 120)
+    # индекс активного сегмента потерян/отстал: при открытии хвост доиндексируется
+    (tmp_path / "events.log.idx").unlink()
+    with path.open("a", encoding="utf-8") as f:
+        f.write("not json\n")
+
+    reopened = EventLog(path, max_bytes=10**9, block_bytes=2048)
+    assert _ids(reopened.tail(2, topic_prefix="old.")) == [298, 299]
+    assert _ids(reopened.query(since=1000.0 + 110, topic_prefix="ui.")) == [i for i in range(110, 120) if i % 10]
+    assert reopened.tail(1) == ["not json"]
+    stats = reopened.stats()["segments"]
+    assert [s["lines"] for s in stats] == [121, 300]
+
+
+def test_lines_split_only_on_newline(tmp_path):
+    log = EventLog(tmp_path / "events.log", max_bytes=10**9, block_bytes=4096)
+    odd = {"ts": 1001.0, "topic": "ui.text", "payload": {"i": 1, "s": "a\u2028b\u2029c\x85d"}, "node_id": "n1"}
+    log.append([_line(0, "ui.text"), json.dumps(odd, ensure_ascii=False) + "\n", _line(2, "ui.text")])
+    assert _ids(log.tail(2, topic_prefix="ui.")) == [1, 2]
+    assert json.loads(log.tail(2)[0])["payload"]["s"] == "a\u2028b\u2029c\x85d"
+    assert _ids(log.query()) == [0, 1, 2]
+
+
+def test_snapshot_survives_concurrent_rotation(tmp_path):
+    path = tmp_path / "events.log"
+    log = EventLog(path, max_bytes=10**9, block_bytes=500)
+    log.append([_line(i, "a.b") for i in range(12)])  # два закрытых блока и незакрытый хвост
+    blocks = log.blocks(topic_prefix="a.")
+    first = next(blocks)  # снимок сделан здесь
+    log.rotate()  # оставшиеся блоки снимка (и незакрытый) теперь лежат в events.log.1.gz
+    log.append([_line(i, "a.b") for i in range(12, 20)])
+    rest = [i for chunk in blocks for i in _ids(chunk)]
+    assert _ids(first) + rest == list(range(12))
+
+
+def test_sse_replay_since_and_tail_endpoint(tmp_path, monkeypatch):
+    import asyncio
+
+    from adaos.apps.api import observe_api
+    from adaos.services import observe
+
+    monkeypatch.setattr(observe, "_LOG_FILE", tmp_path / "events.log")
+    observe._write_batch([_line(i, "net.x" if i % 2 else "ui.y") for i in range(40)])
+
+    async def main():
+        stream = observe_api._sse_iter("net.", None, 1030.0, None)
+        frames = [await stream.__anext__() for _ in range(5)]
+        await stream.aclose()
+        tail = await observe_api.observe_tail(lines=2, topic_prefix="ui.", since=1000.0)
+        return frames, tail
+
+    frames, tail = asyncio.run(main())
+    assert _ids(f.split(b"data: ", 1)[1].decode() for f in frames) == [31, 33, 35, 37, 39]
+    assert _ids(tail["lines"]) == [36, 38]
+    assert len(observe.BROADCAST) == 0  # поток отписался при закрытии
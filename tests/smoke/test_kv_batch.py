@@ -0,0 +1,81 @@
+# tests/smoke/test_kv_batch.py
+from __future__ import annotations
+
+import time
+
+from adaos.adapters.db.sqlite_store import SQLiteKV
+from adaos.services.agent_context import get_ctx
+
+
+def test_kv_many_ops():
+    kv = get_ctx().kv
+    kv.set_many({"m/a": 1, "m/b": {"x": 2}, "m/c": [3]})
+    assert kv.get_many(["m/a", "m/b", "m/zz"]) == {"m/a": 1, "m/b": {"x": 2}}
+    kv.delete_many(["m/a", "m/c"])
+    assert kv.list("m/") == ["m/b"]
+    assert kv.get_many([]) == {}
+
+
+def test_kv_write_behind_coalesces_and_flushes():
+    sql = get_ctx().sql
+    kv = SQLiteKV(sql, namespace="wb", write_behind=True, flush_interval_ms=10_000, flush_ops=1000)
+    direct = SQLiteKV(sql, namespace="wb")
+    for i in range(100):
+        kv.set("counter", i)
+    kv.set("gone", 1)
+    kv.delete("gone")
+    kv.set_many({"s/a": 1, "s/b": 2})
+
+    # чтения видят буфер, на диске пока ничего
+    assert kv.get("counter") == 99 and kv.get("gone", "dflt") == "dflt"
+    assert kv.list("s/") == ["s/a", "s/b"]
+    assert direct.get("counter") is None
+
+    assert kv.flush() == 4  # 100 записей counter схлопнулись в одну
+    assert direct.get("counter") == 99
+    assert direct.get_many(["s/a", "s/b", "gone"]) == {"s/a": 1, "s/b": 2}
+    assert kv.flush() == 0
+
+
+def test_kv_write_behind_flushes_by_ops_and_time():
+    sql = get_ctx().sql
+    direct = SQLiteKV(sql, namespace="wb2")
+    kv = SQLiteKV(sql, namespace="wb2", write_behind=True, flush_interval_ms=20, flush_ops=3)
+    kv.set_many({"a": 1, "b": 2, "c": 3})  # порог по числу операций
+    kv.set("d", 4)  # сброс по таймеру
+    deadline = time.time() + 5
+    while time.time() < deadline and direct.get("d") is None:
+        time.sleep(0.01)
+    assert direct.get_many(["a", "b", "c", "d"]) == {"a": 1, "b": 2, "c": 3, "d": 4}
+    kv.close()
+
+
+def test_kv_list_range_scan_and_pages():
+    kv = SQLiteKV(get_ctx().sql, namespace="scan")
+    keys = [f"p/{i:03d}" for i in range(25)] + ["p%x", "p_x", "pa", "q/1", "p/\U0010ffff"]
+    kv.set_many({k: 1 for k in keys})
+    # % и _ в префиксе — обычные символы, а не шаблон LIKE
+    assert kv.list("p%") == ["p%x"]
+    assert kv.list("p_") == ["p_x"]
+    assert kv.list("p/") == sorted(k for k in keys if k.startswith("p/"))
+
+    first = kv.list("p/", limit=10)
+    second = kv.list("p/", limit=10, cursor=first[-1])
+    assert first == [f"p/{i:03d}" for i in range(10)]
+    assert second == [f"p/{i:03d}" for i in range(10, 20)]
+    assert list(kv.iter_keys("p/", batch=7)) == kv.list("p/")
+
+    with kv.sql.connect() as con:
+        plan = con.execute("EXPLAIN QUERY PLAN SELECT k FROM kv WHERE ns=? AND k >= ? AND k < ?", ("scan", "p/", "p0")).fetchone()[-1]
+    # диапазон по k обслуживается первичным ключом, а не фильтром по всему namespace
+    assert "k>?" in plan and "k<?" in plan
+
+
+def test_kv_list_pages_with_write_behind_overlay():
+    kv = SQLiteKV(get_ctx().sql, namespace="scan-wb", write_behind=True, flush_interval_ms=10_000)
+    kv.set_many({f"k/{i}": i for i in range(6)})
+    kv.flush()
+    kv.delete_many(["k/1", "k/2"])
+    kv.set("k/25", 1)
+    assert kv.list("k/", limit=3) == ["k/0", "k/25", "k/3"]
+    assert kv.list("k/", limit=3, cursor="k/3") == ["k/4", "k/5"]
@@ -0,0 +1,100 @@
+# tests/smoke/test_kv_cache.py
+from __future__ import annotations
+
+import threading
+import time
+
+from adaos.adapters.db import CachedKV, SQLite, SQLiteKV
+from adaos.services.agent_context import get_ctx
+
+
+class _CountingKV(SQLiteKV):
+    def __init__(self, sql, namespace):
+        super().__init__(sql, namespace)
+        self.reads = 0
+
+    def get_entries(self, keys):
+        self.reads += 1
+        return super().get_entries(keys)
+
+
+def test_cached_kv_hits_write_through_and_stats():
+    inner = _CountingKV(get_ctx().sql, "cache")
+    kv = CachedKV(inner, max_entries=3, bypass=["raw"])
+    kv.set("secrets:index:a", ["x"])
+    for _ in range(5):
+        assert kv.get("secrets:index:a") == ["x"]
+    assert inner.reads == 0  # запись уже положила значение в кэш
+
+    assert kv.get("skills/s/missing", "d") == "d" and kv.get("skills/s/missing", "d") == "d"
+    assert inner.reads == 1  # промах тоже кэшируется
+
+    # мутация полученного значения не портит кэш
+    kv.get("secrets:index:a").append("y")
+    assert kv.get("secrets:index:a") == ["x"]
+
+    kv.delete("secrets:index:a")
+    assert kv.get("secrets:index:a") is None
+
+    kv.set("raw:k", 1)
+    assert kv.get("raw:k") == 1 and "raw" not in kv.stats()["namespaces"]
+
+    kv.set_many({"m/1": 1, "m/2": 2, "m/3": 3, "m/4": 4})
+    stats = kv.stats()
+    assert stats["size"] == 3 and stats["evictions"] >= 1
+    assert stats["namespaces"]["secrets"]["hits"] >= 6
+    assert stats["namespaces"]["skills"] == {"hits": 1, "misses": 1}
+    assert kv.get_many(["m/1", "m/4", "m/none"]) == {"m/1": 1, "m/4": 4}
+
+
+def test_cached_kv_respects_ttl():
+    kv = CachedKV(SQLiteKV(get_ctx().sql, "cache-ttl"))
+    kv.set("t", 1, ttl=0.05)
+    assert kv.get("t") == 1
+    time.sleep(0.1)
+    assert kv.get("t") is None
+
+
+def test_cached_kv_returns_stored_json_form():
+    inner = SQLiteKV(get_ctx().sql, "cache-json")
+    kv = CachedKV(inner)
+    kv.set("k", {1: "a", "t": (1, 2)})
+    kv.set_many({"m": (3, [4, (5,)])})
+    # из кэша — то же, что из базы: ключи-строки, кортежи как списки
+    assert kv.get("k") == inner.get("k") == {"1": "a", "t": [1, 2]}
+    assert kv.get_many(["m"]) == inner.get_many(["m"]) == {"m": [3, [4, [5]]]}
+
+
+def test_cached_kv_sees_writes_from_another_process():
+    paths = get_ctx().paths
+    server_sql = SQLite(paths)
+    server = CachedKV(SQLiteKV(server_sql, "cache-ext"), probe_interval=0)
+    cli = SQLiteKV(SQLite(paths), "cache-ext")  # другой экземпляр пула — как CLI в другом процессе
+    server.set("secrets:index:x", ["a"])
+    assert server.get("secrets:index:x") == ["a"]
+
+    # записи этого процесса из других потоков (write-behind, to_thread) — не чужие
+    own = SQLiteKV(server_sql, "cache-ext", write_behind=True)
+    worker = threading.Thread(target=lambda: (own.set("other", 1), own.flush(), SQLiteKV(server_sql, "cache-ext").set("x", 2)))
+    worker.start()
+    worker.join()
+    hits = server.stats()["namespaces"]["secrets"]["hits"]
+    assert server.get("secrets:index:x") == ["a"]
+    assert server.stats()["namespaces"]["secrets"]["hits"] == hits + 1 and server.stats()["external_resets"] == 0
+
+    cli.set("secrets:index:x", ["a", "b"])
+    index = server.get("secrets:index:x")
+    assert index == ["a", "b"] and server.stats()["external_resets"] == 1
+    # read-modify-write сервера не затирает запись CLI
+    server.set("secrets:index:x", index + ["c"])
+    assert cli.get("secrets:index:x") == ["a", "b", "c"]
+
+
+def test_cached_kv_probes_at_most_once_per_interval():
+    probes: list[int] = []
+    kv = CachedKV(SQLiteKV(get_ctx().sql, "cache-probe"), change_token=lambda: probes.append(1) or 0, probe_interval=60)
+    kv.set("a", 1)
+    for _ in range(100):
+        assert kv.get("a") == 1
+    assert kv.get_many(["a", "b"]) == {"a": 1}
+    assert len(probes) == 1  # попадание в кэш не ходит в базу
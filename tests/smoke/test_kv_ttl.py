@@ -0,0 +1,68 @@
+# tests/smoke/test_kv_ttl.py
+from __future__ import annotations
+
+import sqlite3
+import time
+
+from adaos.adapters.db.sqlite_store import SQLiteKV, sweep_expired
+from adaos.services.agent_context import get_ctx
+
+
+def _count(sql, ns: str) -> int:
+    with sql.connect() as con:
+        return con.execute("SELECT COUNT(*) FROM kv WHERE ns=?", (ns,)).fetchone()[0]
+
+
+def test_kv_ttl_hides_and_sweeps_expired():
+    sql = get_ctx().sql
+    kv = SQLiteKV(sql, namespace="ttl")
+    kv.set("short", 1, ttl=0.05)
+    kv.set_many({"b/1": 1, "b/2": 2}, ttl=0.05)
+    kv.set("forever", 2)
+    kv.set("renewed", 3, ttl=0.05)
+    kv.set("renewed", 4)  # перезапись без ttl снимает срок
+    assert kv.get("short") == 1 and kv.list("b/") == ["b/1", "b/2"]
+
+    time.sleep(0.1)
+    assert kv.get("short", "gone") == "gone"
+    assert kv.get_many(["b/1", "b/2", "forever"]) == {"forever": 2}
+    assert sorted(kv.list()) == ["forever", "renewed"]
+    assert _count(sql, "ttl") == 5  # строки ещё на диске до sweep
+
+    assert sweep_expired(sql, batch=2) >= 3
+    assert _count(sql, "ttl") == 2
+
+
+def test_kv_ttl_write_behind_buffer_respects_expiry():
+    sql = get_ctx().sql
+    kv = SQLiteKV(sql, namespace="ttl-wb", write_behind=True, flush_interval_ms=10_000)
+    kv.set("k", 1, ttl=0.05)
+    assert kv.get("k") == 1 and kv.list() == ["k"]
+    time.sleep(0.1)
+    assert kv.get("k") is None and kv.list() == [] and kv.get_many(["k"]) == {}
+    kv.flush()
+    assert kv.get("k") is None
+
+
+def test_kv_migrates_table_without_expires_at(tmp_path):
+    from adaos.adapters.db.sqlite_store import SQLite
+
+    class _Paths:
+        def state_dir(self):
+            return tmp_path
+
+    db = tmp_path / "adaos.db"
+    con = sqlite3.connect(db)
+    con.execute("CREATE TABLE kv (ns TEXT NOT NULL, k TEXT NOT NULL, v BLOB, PRIMARY KEY (ns, k))")
+    con.execute("INSERT INTO kv VALUES('kv','old','1')")
+    con.commit()
+    con.close()
+
+    sql = SQLite(_Paths())
+    try:
+        kv = SQLiteKV(sql)
+        assert kv.get("old") == 1
+        kv.set("new", 2, ttl=60)
+        assert kv.get_many(["old", "new"]) == {"old": 1, "new": 2}
+    finally:
+        sql.close()
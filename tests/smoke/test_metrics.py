@@ -0,0 +1,90 @@
+# tests/smoke/test_metrics.py
+"""Метрики: формат экспозиции Prometheus, замеры шины и задержки event loop."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from adaos.domain import Event
+from adaos.services.eventbus import AsyncEventBus, LocalEventBus
+from adaos.services.metrics import LoopLagSampler, MetricsRegistry, filter_exposition
+
+
+def test_prometheus_exposition():
+    reg = MetricsRegistry()
+    c = reg.counter("t_calls_total", "Calls", ("tool", "status"))
+    c.labels("a:b", "ok").inc()
+    c.labels(tool="a:b", status="ok").inc(2)
+    c.labels('q"x', "error").inc()
+    g = reg.gauge("t_depth", "Depth")
+    g.set(5)
+    g.dec()
+    h = reg.histogram("t_seconds", "Latency", buckets=(0.1, 1.0))
+    for v in (0.05, 0.1, 0.5, 3.0):
+        h.observe(v)
+
+    assert reg.counter("t_calls_total", "Calls", ("tool", "status")) is c
+    with pytest.raises(ValueError):
+        reg.gauge("t_calls_total", "Calls")
+    with pytest.raises(ValueError):
+        c.inc()
+
+    text = reg.render()
+    assert "# TYPE t_calls_total counter" in text
+    assert 't_calls_total{tool="a:b",status="ok"} 3' in text
+    assert 't_calls_total{tool="q\\"x",status="error"} 1' in text
+    assert "t_depth 4" in text
+    # корзины накопительные, граница включается в корзину (le)
+    assert 't_seconds_bucket{le="0.1"} 2' in text
+    assert 't_seconds_bucket{le="1"} 3' in text
+    assert 't_seconds_bucket{le="+Inf"} 4' in text
+    assert "t_seconds_count 4" in text
+    assert "t_seconds_sum 3.65" in text
+
+    only = filter_exposition(text, "t_seconds")
+    assert only.startswith("# HELP t_seconds Latency") and "t_calls_total" not in only
+    assert reg.snapshot()["t_seconds"]["series"][0]["count"] == 4
+
+
+def test_bus_dispatch_time_by_prefix():
+    reg = MetricsRegistry()
+    bus = LocalEventBus(metrics=reg)
+    bus.subscribe("sys.", lambda e: time.sleep(0.002))
+    bus.subscribe("skill", lambda e: None)
+    for topic in ("sys.boot.start", "sys.ready", "skill.weather.ok", "nobody.listens"):
+        bus.publish(Event(type=topic, payload={}, source="t", ts=time.time()))
+
+    series = {s["labels"]["prefix"]: s for s in reg.snapshot()["adaos_bus_dispatch_seconds"]["series"]}
+    assert {k: v["count"] for k, v in series.items()} == {"sys": 2, "skill": 1, "nobody": 1}
+    assert series["sys"]["sum"] >= 0.004
+    # без реестра шина ничего не замеряет
+    assert LocalEventBus()._dispatch_seconds is None
+
+
+def test_async_bus_handler_time_and_loop_lag():
+    reg = MetricsRegistry()
+
+    async def main():
+        bus = AsyncEventBus(metrics=reg)
+        bus.subscribe("work.", lambda e: None)
+        bus.start()
+        sampler = LoopLagSampler(reg, interval=0.01)
+        sampler.start()
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)  # блокируем луп — сэмплер должен это увидеть
+        await asyncio.sleep(0.03)
+        await sampler.stop()
+        for _ in range(3):
+            bus.publish(Event(type="work.item", payload={}, source="t", ts=time.time()))
+        await bus.aclose()
+
+    asyncio.run(main())
+    snap = reg.snapshot()
+    handler = snap["adaos_bus_handler_seconds"]["series"]
+    assert [(s["labels"]["prefix"], s["count"]) for s in handler] == [("work.", 3)]
+    lag = snap["adaos_event_loop_lag_seconds"]["series"][0]
+    assert lag["count"] >= 2
+    assert snap["adaos_event_loop_lag_last_seconds"]["series"][0]["value"] >= 0
+    assert lag["sum"] >= 0.05
@@ -0,0 +1,85 @@
+# tests/smoke/test_observe_broadcast.py
+"""EventBroadcaster: маршрутизация по фильтру при публикации, общий кадр, учёт сбросов."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+from adaos.services.observe import EventBroadcaster
+
+
+def _evt(topic: str, node: str = "n1", ts: float = 100.0) -> dict:
+    return {"ts": ts, "topic": topic, "payload": {"t": topic}, "node_id": node}
+
+
+def _drain(sub) -> list[bytes]:
+    out = []
+    while not sub.queue.empty():
+        out.append(sub.queue.get_nowait())
+    return out
+
+
+def _topics(frames: list[bytes]) -> list[str]:
+    return [json.loads(f.split(b"data: ", 1)[1])["topic"] for f in frames]
+
+
+def test_routes_by_prefix_node_and_since():
+    async def main():
+        b = EventBroadcaster()
+        everything = b.subscribe(topic_prefix=None, node_id=None, since_ts=None)
+        net = b.subscribe(topic_prefix="net.", node_id=None, since_ts=None)
+        subnet = b.subscribe(topic_prefix="net.subnet", node_id="n2", since_ts=None)
+        late = b.subscribe(topic_prefix="ui", node_id=None, since_ts=150.0)
+        for e in (_evt("net.subnet.join"), _evt("net.subnet.join", node="n2"), _evt("network.x"), _evt("ui.click"), _evt("ui.click", ts=200.0)):
+            await b.publish(e)
+
+        frames = {name: _drain(s) for name, s in (("all", everything), ("net", net), ("subnet", subnet), ("late", late))}
+        assert _topics(frames["all"]) == ["net.subnet.join", "net.subnet.join", "network.x", "ui.click", "ui.click"]
+        assert _topics(frames["net"]) == ["net.subnet.join", "net.subnet.join"]
+        assert _topics(frames["subnet"]) == ["net.subnet.join"]
+        assert [json.loads(f.split(b"data: ", 1)[1])["ts"] for f in frames["late"]] == [200.0]
+        # кадр собирается один раз и делится между подписчиками
+        assert frames["all"][1] is frames["net"][1] is frames["subnet"][0]
+        assert frames["all"][0].startswith(b"event: adaos\ndata: ") and frames["all"][0].endswith(b"\n\n")
+
+        # готовая JSON-строка используется как есть
+        await b.publish(_evt("net.pre"), line='{"topic": "net.pre"}')
+        assert _drain(net) == [b'event: adaos\ndata: {"topic": "net.pre"}\n\n']
+
+        b.unsubscribe(subnet)
+        b.unsubscribe(net)
+        b.unsubscribe(net)  # повторная отписка безопасна
+        assert len(b) == 2 and "n" not in b._root.children and "u" in b._root.children  # пустые ветви подрезаны
+        await b.publish(_evt("net.subnet.join", node="n2"))
+        assert len(_drain(everything)) == 2 and not _drain(subnet)
+
+    asyncio.run(main())
+
+
+def test_slow_subscriber_drops_oldest_and_counts():
+    async def main():
+        b = EventBroadcaster(queue_size=3)
+        slow = b.subscribe(topic_prefix="obs.", node_id=None, since_ts=None)
+        other = b.subscribe(topic_prefix="ui.", node_id=None, since_ts=None)
+        for i in range(5):
+            await b.publish(_evt(f"obs.e{i}"))
+        assert _topics(_drain(slow)) == ["obs.e2", "obs.e3", "obs.e4"]
+        stats = {s["id"]: s for s in b.stats()}
+        assert stats[slow.id]["delivered"] == 5 and stats[slow.id]["dropped"] == 2
+        assert stats[other.id]["delivered"] == 0 and stats[other.id]["dropped"] == 0
+
+    asyncio.run(main())
+
+
+def test_bad_ts_does_not_break_delivery():
+    async def main():
+        b = EventBroadcaster()
+        plain = b.subscribe(topic_prefix="ui.", node_id=None, since_ts=None)
+        late = b.subscribe(topic_prefix="ui.", node_id=None, since_ts=150.0)
+        for ts in ("soon", None, {"x": 1}, "300"):
+            await b.publish({"ts": ts, "topic": "ui.click", "payload": {}, "node_id": "n1"})
+        assert len(_drain(plain)) == 4
+        # нечисловой ts считается 0: для подписки со since такие события в прошлом
+        assert [json.loads(f.split(b"data: ", 1)[1])["ts"] for f in _drain(late)] == ["300"]
+
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+# tests/smoke/test_observe_writer.py
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+
+from adaos.sdk import bus
+from adaos.services import observe
+from adaos.services import node_config
+
+
+def test_observer_batches_events_log(tmp_path, monkeypatch):
+    monkeypatch.setattr(observe, "BASE_DIR", tmp_path)
+    monkeypatch.setattr(observe, "_LOG_FILE", None)
+    writes: list[int] = []
+    orig_write = observe._write_batch
+    monkeypatch.setattr(observe, "_write_batch", lambda lines: (writes.append(len(lines)), orig_write(lines)))
+    calls = {"n": 0}
+    orig_parse = node_config._parse_config
+
+    def counting_parse(path):
+        calls["n"] += 1
+        return orig_parse(path)
+
+    monkeypatch.setattr(node_config, "_parse_config", counting_parse)
+    node_config.load_config()  # node.yaml создан и закэширован
+    log = tmp_path / "logs" / "events.log"
+
+    async def main():
+        await observe.start_observer()
+        try:
+            for i in range(50):
+                await bus.emit("obs.test.batch", {"i": i}, source="test")
+            # горячий путь диск не трогает
+            assert not log.exists() or log.read_text(encoding="utf-8") == ""
+            assert observe.writer_stats()["buffered"] == 50
+        finally:
+            await observe.stop_observer()
+
+    asyncio.run(main())
+    lines = [json.loads(ln) for ln in log.read_text(encoding="utf-8").splitlines()]
+    assert [e["payload"]["i"] for e in lines] == list(range(50))
+    assert sum(writes) == 50 and len(writes) <= 2  # одна запись на пачку
+    assert calls["n"] == 0  # node.yaml не перечитывается на каждое событие
+
+
+def test_rotation_compresses_off_loop(tmp_path, monkeypatch):
+    monkeypatch.setattr(observe, "_LOG_FILE", tmp_path / "events.log")
+    monkeypatch.setattr(observe, "_MAX_BYTES", 100)
+    observe._write_batch(["x" * 80 + "\n"])
+    observe._write_batch(["y" * 80 + "\n"])
+    assert not (tmp_path / "events.log").exists()
+    with gzip.open(tmp_path / "events.log.1.gz", "rt", encoding="utf-8") as gz:
+        assert gz.read().splitlines() == ["x" * 80, "y" * 80]
@@ -0,0 +1,74 @@
+# tests/smoke/test_proc_streaming.py
+"""Потоковый вывод: болтливый процесс не встаёт на полном pipe, захват ограничен, события ограничены по частоте."""
+from __future__ import annotations
+
+import asyncio
+import sys
+
+from adaos.domain import ProcessSpec
+from adaos.services.eventbus import LocalEventBus
+from adaos.services.runtime.manager import AsyncProcessManager
+
+# ~4 МБ в каждый поток: больше любого pipe-буфера
+_CHATTY = (
+    "import sys\n"
+    "for i in range(40000):\n"
+    "    sys.stdout.write(f'out {i:06d} ' + 'x' * 90 + '\\n')\n"
+    "    sys.stderr.write(f'err {i:06d} ' + 'y' * 90 + '\\n')\n"
+)
+
+
+def _collect(bus: LocalEventBus, prefix: str) -> list:
+    seen: list = []
+    bus.subscribe(prefix, seen.append)
+    return seen
+
+
+def test_async_manager_drains_and_truncates():
+    bus = LocalEventBus()
+    events = _collect(bus, "proc.std")
+    pm = AsyncProcessManager(bus, restart_on_crash=False, max_capture=4096, output_rate=100.0, output_burst=50)
+
+    async def main():
+        h = await pm.start(ProcessSpec(name="chatty", cmd=[sys.executable, "-c", _CHATTY]))
+        for _ in range(200):
+            await asyncio.sleep(0.05)
+            if await pm.status(h) in ("stopped", "error"):
+                break
+        return h, await pm.status(h)
+
+    h, state = asyncio.run(main())
+    assert state == "stopped"
+    tail = pm.output_tail(h)
+    assert tail["truncated"] == {"stdout": True, "stderr": True}
+    assert tail["stdout"].rstrip().endswith("out 039999 " + "x" * 90)
+    assert len(tail["stdout"]) < 4096 + 100
+    # 80k строк, но событий — не больше всплеска + rate * время (+ итоговые счётчики пропусков)
+    assert 50 <= len(events) < 2000
+    assert sum(e.payload["dropped"] for e in events) + sum(1 for e in events if e.payload["line"] is not None) == 80000
+
+
+def test_async_manager_output_iterator():
+    pm = AsyncProcessManager(LocalEventBus(), restart_on_crash=False, publish_output=False)
+    code = "import time\nfor i in range(3):\n    print(i, flush=True); time.sleep(0.05)"
+
+    async def main():
+        h = await pm.start(ProcessSpec(name="lines", cmd=[sys.executable, "-c", code]))
+        return [(item.stream, item.line.strip()) async for item in pm.output(h)]
+
+    assert asyncio.run(main()) == [("stdout", "0"), ("stdout", "1"), ("stdout", "2")]
+
+
+def test_sandbox_stream_and_publish(sandbox_service):
+    bus = LocalEventBus()
+    events = _collect(bus, "proc.std")
+    svc = sandbox_service(bus)
+
+    stream = svc.stream([sys.executable, "-c", "import sys\nprint('a')\nprint('b', file=sys.stderr)\nprint('c')"])
+    assert sorted((i.stream, i.line.strip()) for i in stream) == [("stderr", "b"), ("stdout", "a"), ("stdout", "c")]
+    assert stream.result.exit_code == 0 and stream.result.stdout == "a\nc\n"
+
+    res = svc.run([sys.executable, "-c", _CHATTY], max_capture=1000, publish_output=True, output_rate=10.0)
+    assert res.exit_code == 0 and res.stdout_truncated and res.stderr_truncated
+    assert res.stdout.startswith("[... truncated") and len(res.stdout) < 1100
+    assert 0 < len(events) < 1000
@@ -0,0 +1,95 @@
+# tests/smoke/test_sandbox_arun.py
+"""SandboxService.arun: event loop не блокируется, лимиты и события как у run(), параллелизм ограничен."""
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+import psutil
+
+from adaos.ports.sandbox import ExecLimits
+from adaos.services.eventbus import LocalEventBus
+
+_SLEEP = [sys.executable, "-c", "import time; time.sleep(0.3)"]
+
+
+def _events(bus: LocalEventBus) -> list:
+    events: list = []
+    bus.subscribe("sandbox.", events.append)
+    return events
+
+
+def test_arun_does_not_block_loop(sandbox_service):
+    bus = LocalEventBus()
+    events = _events(bus)
+    svc = sandbox_service(bus)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        t = asyncio.create_task(ticker())
+        res = await svc.arun([sys.executable, "-c", "import time; time.sleep(0.3); print('done')"], profile="tool")
+        t.cancel()
+        return res, ticks
+
+    res, ticks = asyncio.run(main())
+    assert res.exit_code == 0 and res.stdout.strip() == "done"
+    assert ticks >= 10
+    assert [e.type for e in events] == ["sandbox.start", "sandbox.end"]
+    assert events[0].payload["profile"] == "tool" and "queued_s" in events[0].payload
+
+
+def test_arun_limits_and_cancellation(sandbox_service):
+    bus = LocalEventBus()
+    events = _events(bus)
+    svc = sandbox_service(bus)
+
+    async def main():
+        killed = await svc.arun([sys.executable, "-c", "import time; time.sleep(10)"], limits=ExecLimits(wall_time_sec=0.3))
+        task = asyncio.create_task(svc.arun([sys.executable, "-c", "import os, time; print(os.getpid(), flush=True); time.sleep(10)"]))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return killed
+
+    t0 = time.monotonic()
+    killed = asyncio.run(main())
+    assert killed.timed_out and killed.killed_reason == "wall_time_exceeded"
+    assert time.monotonic() - t0 < 5
+    assert "sandbox.killed" in [e.type for e in events]
+    # отменённый запуск не оставил процессов
+    assert not [p for p in psutil.Process().children(recursive=True) if "time.sleep(10)" in " ".join(p.cmdline())]
+
+
+def test_arun_global_limit_and_profile_quota(sandbox_service):
+    svc = sandbox_service(max_concurrency=3, quotas={"tool": 1})
+    peak = {"all": 0, "tool": 0}
+
+    async def watch():
+        while True:
+            active = svc.concurrency()["active"]
+            peak["all"] = max(peak["all"], sum(active.values()))
+            peak["tool"] = max(peak["tool"], active.get("tool", 0))
+            await asyncio.sleep(0.01)
+
+    async def main():
+        w = asyncio.create_task(watch())
+        jobs = [svc.arun(_SLEEP, profile="tool") for _ in range(3)] + [svc.arun(_SLEEP) for _ in range(3)]
+        results = await asyncio.gather(*jobs)
+        w.cancel()
+        return results
+
+    results = asyncio.run(main())
+    assert all(r.exit_code == 0 for r in results)
+    # общий предел 3, а три tool-запуска идут строго по одному
+    assert peak["all"] <= 3 and peak["tool"] == 1
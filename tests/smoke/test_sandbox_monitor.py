@@ -0,0 +1,57 @@
+# tests/smoke/test_sandbox_monitor.py
+"""Общий монитор песочницы: лимиты и один поток наблюдения на одновременные запуски."""
+from __future__ import annotations
+
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from adaos.ports.sandbox import ExecLimits
+from adaos.services.sandbox.monitor import SandboxMonitor
+from adaos.services.sandbox.runner import ProcSandbox
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="POSIX-only: pidfd/psutil process tree")
+
+_LIMITS = ExecLimits(wall_time_sec=30, cpu_time_sec=20, max_rss_mb=512)
+_SLEEP = 1.0
+
+
+def _sleep_cmd() -> list[str]:
+    exe = shutil.which("sleep")
+    return [exe, str(_SLEEP)] if exe else [sys.executable, "-c", f"import time; time.sleep({_SLEEP})"]
+
+
+def test_monitor_shared_by_concurrent_runs(tmp_path):
+    n = 10
+    monitor = SandboxMonitor()
+    sandbox = ProcSandbox(fs_base=str(tmp_path), monitor=monitor, use_cgroups=False)
+    with ThreadPoolExecutor(n) as pool:
+        results = list(pool.map(lambda _: sandbox.run(_sleep_cmd(), limits=_LIMITS), range(n)))
+    assert all(r.exit_code == 0 and not r.timed_out and r.killed_reason is None for r in results)
+    # один поток на все процессы, и замеры реже фиксированных 50 мс: далеко от лимитов интервал растёт
+    assert monitor._thread is not None and monitor._thread.name == "adaos-sandbox-monitor"
+    assert 0 < monitor.samples < n * _SLEEP / 0.05 / 2
+    assert not monitor._watches
+
+
+def test_monitor_enforces_limits(tmp_path):
+    sandbox = ProcSandbox(fs_base=str(tmp_path), monitor=SandboxMonitor())
+
+    t0 = time.monotonic()
+    res = sandbox.run([sys.executable, "-c", "import time; time.sleep(10)"], limits=ExecLimits(wall_time_sec=0.3))
+    assert res.killed_reason == "wall_time_exceeded" and time.monotonic() - t0 < 3
+
+    # CPU жгут два потомка: каждый ниже RLIMIT_CPU, но по дереву лимит превышен
+    code = (
+        "import subprocess, sys\n"
+        "ps = [subprocess.Popen([sys.executable, '-c', 'while True: pass']) for _ in range(2)]\n"
+        "[p.wait() for p in ps]"
+    )
+    res = sandbox.run([sys.executable, "-c", code], limits=ExecLimits(wall_time_sec=20, cpu_time_sec=2))
+    assert res.timed_out and res.killed_reason == "cpu_time_exceeded"
+
+    res = sandbox.run([sys.executable, "-c", "print('ok')"], limits=ExecLimits(wall_time_sec=20, cpu_time_sec=5, max_rss_mb=256))
+    assert res.exit_code == 0 and res.stdout.strip() == "ok" and res.killed_reason is None
@@ -0,0 +1,64 @@
+# tests/smoke/test_sandbox_workers.py
+"""Тёплые воркеры песочницы: повторное использование процесса, recycle, лимиты."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from adaos.services.agent_context import get_ctx
+
+_HANDLER = """
+import json, time
+
+def handle(topic, payload):
+    print("noise on stdout must not break the protocol")
+    if topic == "spin":
+        while True:
+            pass
+    if topic == "sleep":
+        time.sleep(payload["s"])
+    return {"topic": topic, "n": payload.get("n")}
+"""
+
+
+@pytest.fixture
+def service_and_skill(sandbox_service):
+    skill_dir = Path(get_ctx().paths.skills_dir()) / "worker_skill"
+    (skill_dir / "handlers").mkdir(parents=True, exist_ok=True)
+    (skill_dir / "handlers" / "main.py").write_text(_HANDLER, encoding="utf-8")
+    return sandbox_service(), skill_dir
+
+
+def test_warm_worker_serves_calls_in_one_process(service_and_skill):
+    svc, skill_dir = service_and_skill
+    pool = svc.worker_pool("handler")
+    pool.warm(skill_dir / "handlers" / "main.py", 1)
+    pids = set()
+    for i in range(50):
+        res = svc.call_handler(skill_dir, "t", {"n": i})
+        assert res.ok and res.result == {"topic": "t", "n": i}
+        pids.add(res.worker_pid)
+    # прогретый воркер обслуживает все вызовы: ни запуска интерпретатора, ни импорта на вызов
+    assert len(pids) == 1 and pool.stats()["spawned"] == 1
+
+
+def test_worker_recycling_and_limits(service_and_skill):
+    svc, skill_dir = service_and_skill
+    pool = svc.worker_pool("handler", size=1, max_calls=2)
+    pids = [svc.call_handler(skill_dir, "t", {}).worker_pid for _ in range(4)]
+    assert pids[0] == pids[1] and pids[1] != pids[2] and pids[2] == pids[3]
+    assert pool.stats()["recycled"] >= 1
+
+    from adaos.ports.sandbox import ExecLimits
+
+    res = svc.call_handler(skill_dir, "sleep", {"s": 5}, limits=ExecLimits(wall_time_sec=0.3))
+    assert res.timed_out and res.killed_reason == "wall_time_exceeded"
+
+    if os.name == "posix":
+        res = svc.call_handler(skill_dir, "spin", {}, limits=ExecLimits(wall_time_sec=10, cpu_time_sec=1))
+        assert res.killed_reason == "cpu_time_exceeded"
+
+    # после убийства пул поднимает новый воркер
+    assert svc.call_handler(skill_dir, "t", {"n": 7}).result == {"topic": "t", "n": 7}
@@ -0,0 +1,39 @@
+# tests/smoke/test_skill_handler_cache.py
+"""Прогретый вызов run_skill_handler: импорт handlers/main.py только при изменении файла."""
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+
+from adaos.services.agent_context import get_ctx
+from adaos.services.skill import runtime
+from adaos.services.skill.runtime import invalidate_handler_cache, run_skill_handler
+
+_HANDLER = "def handle(topic, payload):\n    return payload['n'] + {delta}\n"
+
+
+def test_handler_imported_only_when_file_changes(monkeypatch):
+    handler = Path(get_ctx().paths.skills_dir()) / "bench_skill" / "handlers" / "main.py"
+    handler.parent.mkdir(parents=True, exist_ok=True)
+    handler.write_text(_HANDLER.format(delta=1), encoding="utf-8")
+    loads: list[Path] = []
+    real_load = runtime._load_handler
+    monkeypatch.setattr(runtime, "_load_handler", lambda f: loads.append(f) or real_load(f))
+
+    async def _calls(n: int) -> list:
+        return [await run_skill_handler("bench_skill", "bench", {"n": i}) for i in range(n)]
+
+    assert asyncio.run(_calls(20)) == [i + 1 for i in range(20)]
+    assert len(loads) == 1
+
+    # правка файла (другой размер/mtime) — модуль перечитывается один раз
+    handler.write_text(_HANDLER.format(delta=100), encoding="utf-8")
+    st = handler.stat()
+    os.utime(handler, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert asyncio.run(_calls(5)) == [i + 100 for i in range(5)]
+    assert len(loads) == 2
+
+    assert invalidate_handler_cache("bench_skill") == 1
+    assert asyncio.run(_calls(1)) == [100]
+    assert len(loads) == 3
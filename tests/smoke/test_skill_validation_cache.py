@@ -0,0 +1,96 @@
+# tests/smoke/test_skill_validation_cache.py
+"""Валидация навыков: пачка — в одном интерпретаторе, повтор без изменений — из кэша по хэшу содержимого."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from adaos.services.agent_context import get_ctx
+from adaos.services.skill import validation
+from adaos.services.skill.validation import SkillValidationService
+
+_YAML = "name: {name}\nversion: '1.0'\nevents:\n  subscribe: ['{name}.ping']\n"
+_HANDLER = "from adaos.sdk.decorators import subscribe\n\n@subscribe('{name}.ping')\ndef on_ping(evt):\n    return evt\n"
+
+
+def _make_skill(root: Path, name: str, handler: str = _HANDLER) -> Path:
+    skill_dir = root / name
+    (skill_dir / "handlers").mkdir(parents=True, exist_ok=True)
+    (skill_dir / "skill.yaml").write_text(_YAML.format(name=name), encoding="utf-8")
+    (skill_dir / "handlers" / "main.py").write_text(handler.format(name=name), encoding="utf-8")
+    return skill_dir
+
+
+def test_validate_many_batches_and_caches(monkeypatch):
+    ctx = get_ctx()
+    root = Path(ctx.paths.skills_dir())
+    names = [f"vcache_{i}" for i in range(6)]
+    for n in names:
+        _make_skill(root, n)
+    _make_skill(root, "vcache_broken", "raise RuntimeError('boom')\n")
+    _make_skill(root, "vcache_exit", "import sys\nsys.exit(3)\n")
+
+    spawned = []
+    real_run = validation.subprocess.run
+    monkeypatch.setattr(validation.subprocess, "run", lambda *a, **kw: spawned.append(a) or real_run(*a, **kw))
+
+    real_dynamic = validation._dynamic_checks_many
+    svc = SkillValidationService(ctx)
+    all_names = names + ["vcache_broken", "vcache_exit"]
+    reports = svc.validate_many(all_names)
+    assert all(reports[n].ok for n in names), {n: reports[n].issues for n in names}
+    assert [i.code for i in reports["vcache_broken"].issues] == ["import.failed"]
+    assert "boom" in reports["vcache_broken"].issues[0].message
+    assert [i.code for i in reports["vcache_exit"].issues] == ["import.failed"]
+    # общий процесс умер на vcache_exit: он и оставшиеся перепроверены отдельно, но не по процессу на каждый навык
+    assert len(spawned) <= 3
+
+    spawned.clear()
+    again = svc.validate_many(all_names)
+    # из кэша — все, кроме упавших на импорте: их исход зависит от окружения
+    assert [json.loads(a[0][-1]) for a in spawned][0] == [[n, (root / n / "handlers" / "main.py").as_posix()] for n in ("vcache_broken", "vcache_exit")]
+    assert {n: r.ok for n, r in again.items()} == {n: r.ok for n, r in reports.items()}
+
+    # «зависимость доустановили» — без правки навыка следующая проверка уже успешна
+    (root / "vcache_broken" / "handlers" / "main.py").write_text("raise RuntimeError('boom')\n", encoding="utf-8")
+    monkeypatch.setattr(validation, "_dynamic_checks_many", lambda items: {n: [] for n, _ in items})
+    assert svc.validate_many(["vcache_broken"])["vcache_broken"].ok
+    monkeypatch.setattr(validation, "_dynamic_checks_many", real_dynamic)
+    spawned.clear()
+
+    # правка файла навыка обесценивает только его запись
+    (root / "vcache_0" / "handlers" / "main.py").write_text("def handle(topic, payload):\n    return None\n", encoding="utf-8")
+    report = svc.validate("vcache_0")
+    assert len(spawned) == 1
+    assert not report.ok and [i.code for i in report.issues] == ["events.missing_sub"]
+    assert svc.validate("vcache_1").ok and len(spawned) == 1
+
+
+def test_engine_fingerprint_tracks_validator_sources(tmp_path, monkeypatch):
+    validation._engine_fingerprint.cache_clear()
+    before = validation._engine_fingerprint()
+    fake = tmp_path / "decorators.py"
+    fake.write_text("# другие правила @subscribe\n", encoding="utf-8")
+    monkeypatch.setattr(validation, "_DECORATORS_PATH", fake)
+    validation._engine_fingerprint.cache_clear()
+    try:
+        assert validation._engine_fingerprint() != before
+    finally:
+        monkeypatch.undo()
+        validation._engine_fingerprint.cache_clear()
+    assert validation._engine_fingerprint() == before
+
+
+def test_same_named_helper_modules_do_not_leak_between_skills():
+    ctx = get_ctx()
+    root = Path(ctx.paths.skills_dir())
+    handler = (
+        "import sys\nfrom pathlib import Path\nsys.path.insert(0, str(Path(__file__).parent))\n"
+        "import utils\nfrom adaos.sdk.decorators import subscribe\n\n"
+        "@subscribe(utils.TOPIC)\ndef on_ping(evt):\n    return evt\n"
+    )
+    for name in ("vhelper_a", "vhelper_b"):
+        skill_dir = _make_skill(root, name, handler)
+        (skill_dir / "handlers" / "utils.py").write_text(f"TOPIC = '{name}.ping'\n", encoding="utf-8")
+    reports = SkillValidationService(ctx).validate_many(["vhelper_a", "vhelper_b"])
+    assert all(r.ok for r in reports.values()), {n: r.issues for n, r in reports.items()}
@@ -0,0 +1,44 @@
+# tests/smoke/test_sqlite_pool.py
+"""Пул соединений SQLite: переиспользование по потокам, прагмы, одно соединение на поток для KV get/set."""
+from __future__ import annotations
+
+import threading
+
+from adaos.adapters.db.sqlite_store import SQLite, SQLiteKV
+from adaos.services.agent_context import get_ctx
+
+
+def test_connection_reused_per_thread():
+    sql = get_ctx().sql
+    con = sql.connect()
+    assert sql.connect() is con
+    assert con.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert con.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    assert con.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+    other: list = []
+    th = threading.Thread(target=lambda: other.append(sql.connect()))
+    th.start()
+    th.join()
+    assert other[0] is not con
+    # соединение завершившегося потока закрывается при следующем открытии
+    th = threading.Thread(target=sql.connect)
+    th.start()
+    th.join()
+    assert sql.pool_size() <= 2
+
+    sql.close()
+    assert sql.connect() is not con
+
+
+def test_kv_ops_share_one_connection(monkeypatch):
+    sql = SQLite(get_ctx().paths)
+    opened: list = []
+    real_open = sql._open
+    monkeypatch.setattr(sql, "_open", lambda: opened.append(1) or real_open())
+    kv = SQLiteKV(sql, namespace="pool")
+    for i in range(50):
+        kv.set(f"k{i}", {"i": i})
+    assert [kv.get(f"k{i}") for i in range(50)] == [{"i": i} for i in range(50)]
+    # соединение и прагмы — один раз на поток, а не на каждую операцию
+    assert len(opened) == 1 and sql.pool_size() == 1
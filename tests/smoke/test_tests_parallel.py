@@ -0,0 +1,65 @@
+# tests/smoke/test_tests_parallel.py
+"""Параллельный прогон каталогов tests/: слияние JUnit и кодов выхода, порядок по истории из KV."""
+from __future__ import annotations
+
+import subprocess
+import sys
+import threading
+import xml.etree.ElementTree as ET
+
+from adaos.services.agent_context import get_ctx
+from adaos.services.tests.parallel import DURATION_PREFIX, merge_exit_codes, order_by_duration, run_parallel
+
+
+def _make_suite(root, name: str, sleep: float, fail: bool = False) -> str:
+    tdir = root / name / "tests"
+    tdir.mkdir(parents=True)
+    body = f"import time\n\ndef test_{name}():\n    time.sleep({sleep})\n    assert {not fail}\n"
+    (tdir / f"test_{name}.py").write_text(body, encoding="utf-8")
+    return str(tdir)
+
+
+def _shard(paths, junit):
+    p = subprocess.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "--junitxml", junit, *paths], capture_output=True, text=True)
+    return p.returncode, p.stdout, p.stderr
+
+
+def test_parallel_run_merges_and_learns_order(tmp_path):
+    kv = get_ctx().kv
+    paths = [_make_suite(tmp_path, f"s{i}", 0.8 if i == 0 else 0.2) for i in range(4)]
+    paths.append(_make_suite(tmp_path, "broken", 0.1, fail=True))
+    junit = tmp_path / "report.xml"
+
+    lock, active, peak = threading.Lock(), [0], [0]
+
+    def counting_shard(shard_paths, junit_path):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        try:
+            return _shard(shard_paths, junit_path)
+        finally:
+            with lock:
+                active[0] -= 1
+
+    res = run_parallel(paths, counting_shard, jobs=4, kv=kv, junit_xml=str(junit))
+    assert res.exit_code == 1
+    assert 1 < peak[0] <= 4  # шарды шли одновременно, но не больше jobs
+    root = ET.parse(junit).getroot()
+    assert root.tag == "testsuites" and root.get("tests") == "5" and root.get("failures") == "1"
+
+    # история записана; следующий прогон ставит самый долгий каталог первым
+    durations = {p: kv.get(DURATION_PREFIX + p) for p in paths}
+    assert all(isinstance(v, float) for v in durations.values())
+    assert order_by_duration(paths, durations)[0] == paths[0]
+    res2 = run_parallel(paths, _shard, jobs=4, kv=kv)
+    assert res2.shards[0].paths == [paths[0]]
+
+
+def test_merge_exit_codes():
+    assert merge_exit_codes([]) == 0
+    assert merge_exit_codes([5, 5]) == 5
+    assert merge_exit_codes([0, 5]) == 0
+    assert merge_exit_codes([0, 1, 5]) == 1
+    assert merge_exit_codes([1, 2]) == 2
+    assert merge_exit_codes([3, 1, 4]) == 3
@@ -0,0 +1,68 @@
+# tests/smoke/test_tool_bridge_dispatch_cache.py
+"""POST /api/tools/call: таблица инструментов строится один раз и перестраивается при правке файла."""
+from __future__ import annotations
+
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from adaos.apps.api import tool_bridge
+from adaos.apps.api.auth import require_token
+from adaos.services.agent_context import get_ctx
+
+_HANDLER = "\n".join(
+    ["from adaos.sdk.decorators import tool"]
+    + ['@tool("add", input_schema={"type": "object"})\ndef add(a: int, b: int) -> int:\n    return a + b\n']
+)
+
+
+def _client(ctx) -> TestClient:
+    app = FastAPI()
+    app.include_router(tool_bridge.router, prefix="/api")
+    app.dependency_overrides[require_token] = lambda: None
+    app.dependency_overrides[get_ctx] = lambda: ctx
+    return TestClient(app)
+
+
+def test_tools_call_uses_cached_dispatch_table(monkeypatch):
+    ctx = get_ctx()
+    handler = Path(ctx.paths.skills_dir()) / "bench_tools" / "handlers" / "main.py"
+    handler.parent.mkdir(parents=True, exist_ok=True)
+    handler.write_text(_HANDLER, encoding="utf-8")
+    client = _client(ctx)
+    imports: list[str] = []
+    real_import = tool_bridge._import_tools
+    monkeypatch.setattr(tool_bridge, "_import_tools", lambda *a: imports.append(a[0]) or real_import(*a))
+
+    for i in range(100):
+        r = client.post("/api/tools/call", json={"tool": "bench_tools:add", "arguments": {"a": i, "b": 1}})
+        assert r.status_code == 200 and r.json()["result"] == i + 1
+    assert imports == ["bench_tools"]  # модуль навыка импортирован один раз, а не на каждый запрос
+
+    table = tool_bridge.dispatch_table("bench_tools", handler)
+    assert tool_bridge.dispatch_table("bench_tools", handler) is table
+    assert table.tools["add"].input_schema == {"type": "object"}
+
+    # горячая перезагрузка: изменённый файл подхватывается, старые инструменты не остаются
+    handler.write_text(_HANDLER.replace('@tool("add"', '@tool("plus"'), encoding="utf-8")
+    r = client.post("/api/tools/call", json={"tool": "bench_tools:add", "arguments": {"a": 1, "b": 1}})
+    assert r.status_code == 404
+    r = client.post("/api/tools/call", json={"tool": "bench_tools:plus", "arguments": {"a": 1, "b": 1}})
+    assert r.json()["result"] == 2
+    assert imports == ["bench_tools", "bench_tools"]
+
+
+def test_skill_manager_drops_dispatch_tables():
+    from adaos.services.skill.manager import SkillManager
+
+    ctx = get_ctx()
+    handler = Path(ctx.paths.skills_dir()) / "mgr_tools" / "handlers" / "main.py"
+    handler.parent.mkdir(parents=True, exist_ok=True)
+    handler.write_text(_HANDLER, encoding="utf-8")
+    table = tool_bridge.dispatch_table("mgr_tools", handler)
+    assert tool_bridge.dispatch_table("mgr_tools", handler) is table
+
+    # install/uninstall/pull сбрасывают прогретые модули навыка, включая таблицы моста
+    SkillManager._drop_warm_modules("mgr_tools")
+    assert tool_bridge.dispatch_table("mgr_tools", handler) is not table
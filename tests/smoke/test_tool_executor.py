@@ -0,0 +1,160 @@
+# tests/smoke/test_tool_executor.py
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import os
+import threading
+import time
+
+import pytest
+
+from adaos.sdk.decorators import tool, tools_meta
+from adaos.services.runtime.tool_executor import ExecPolicy, ToolExecutor, resolve_policy
+
+
+def _meta(fn):
+    return tools_meta[f"{fn.__module__}.{fn.__name__}"]
+
+
+def test_policy_defaults_and_validation():
+    @tool("exec.sync")
+    def sync_tool():
+        return 1
+
+    @tool("exec.async")
+    async def async_tool():
+        return 1
+
+    @tool("exec.forced", execution="inline", max_concurrency=2)
+    def forced():
+        return 1
+
+    assert resolve_policy(sync_tool, _meta(sync_tool)) is ExecPolicy.THREAD
+    assert resolve_policy(async_tool, _meta(async_tool)) is ExecPolicy.INLINE
+    assert resolve_policy(forced, _meta(forced)) is ExecPolicy.INLINE
+    with pytest.raises(ValueError):
+        tool("exec.bad", execution="gpu")
+
+
+def test_blocking_tools_do_not_freeze_loop():
+    ex = ToolExecutor(thread_workers=4)
+    loop_thread = threading.get_ident()
+    started = threading.Semaphore(0)
+    ticked = threading.Event()
+
+    def blocking() -> tuple[int, bool]:
+        started.release()
+        # вызов не вернётся, пока event loop не сделает хотя бы один тик после старта всех трёх
+        return threading.get_ident(), ticked.wait(5)
+
+    async def main():
+        async def ticker():
+            for _ in range(3):
+                while not started.acquire(blocking=False):
+                    await asyncio.sleep(0.001)
+            await asyncio.sleep(0)
+            ticked.set()
+
+        t = asyncio.create_task(ticker())
+        results = await asyncio.gather(*(ex.run("s:block", blocking, {}) for _ in range(3)))
+        t.cancel()
+        return results
+
+    results = asyncio.run(main())
+    ex.shutdown()
+    idents = [ident for ident, _ in results]
+    assert loop_thread not in idents
+    assert len(set(idents)) == 3  # три вызова шли параллельно в разных потоках пула
+    assert all(seen for _, seen in results)  # event loop тикал, пока вызовы были в полёте
+    assert ex.stats()["s:block"]["calls"] == 3
+
+
+def test_max_concurrency_serialises_and_reports_queue_time():
+    ex = ToolExecutor(thread_workers=4)
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    async def main():
+        await asyncio.gather(*(ex.run("s:one", work, {}, meta={"max_concurrency": 1}) for _ in range(4)))
+
+    asyncio.run(main())
+    ex.shutdown()
+    stats = ex.stats()["s:one"]
+    assert peak == 1
+    assert stats["queue_ms_max"] >= 100  # последний ждал ~3 предыдущих вызова
+
+
+def test_process_policy_runs_in_worker(tmp_path):
+    module_file = tmp_path / "cpu_tool.py"
+    module_file.write_text("import os\n\ndef crunch(n):\n    return os.getpid(), sum(i * i for i in range(n))\n", encoding="utf-8")
+    spec = importlib.util.spec_from_file_location("adaos_test_cpu_tool", module_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    ex = ToolExecutor(process_workers=1)
+    try:
+        pid, total = asyncio.run(ex.run("s:cpu", module.crunch, {"n": 1000}, meta={"execution": "process"}, module_file=module_file))
+    finally:
+        ex.shutdown()
+    assert total == sum(i * i for i in range(1000))
+    assert pid != os.getpid()
+
+
+def _load(module_file, name):
+    spec = importlib.util.spec_from_file_location(name, module_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_process_worker_reimports_changed_module(tmp_path):
+    module_file = tmp_path / "versioned_tool.py"
+    module_file.write_text("def version():\n    return 1\n", encoding="utf-8")
+    module = _load(module_file, "adaos_test_versioned_tool")
+
+    ex = ToolExecutor(process_workers=1)
+    try:
+        call = lambda: asyncio.run(ex.run("s:ver", module.version, {}, meta={"execution": "process"}, module_file=module_file))
+        assert call() == 1
+        module_file.write_text("def version():\n    return 22\n", encoding="utf-8")
+        assert call() == 22
+    finally:
+        ex.shutdown()
+
+
+def test_process_worker_gets_context_and_current_skill(tmp_path):
+    from adaos.apps.api.tool_bridge import _init_tool_process
+    from adaos.services.agent_context import get_ctx
+
+    ctx = get_ctx()
+    handlers = ctx.paths.skills_dir() / "proc_skill" / "handlers"
+    handlers.mkdir(parents=True)
+    module_file = handlers / "main.py"
+    module_file.write_text(
+        "from adaos.services.agent_context import get_ctx\n\n"
+        "def whoami():\n"
+        "    ctx = get_ctx()\n"
+        "    return ctx.skill_ctx.get().name, str(ctx.paths.base_dir())\n",
+        encoding="utf-8",
+    )
+    module = _load(module_file, "adaos_test_proc_skill_main")
+    settings = ctx.settings.with_overrides(base_dir=ctx.paths.base_dir())  # conftest кладёт str
+
+    ex = ToolExecutor(process_workers=1, process_initializer=_init_tool_process, process_initargs=(settings,))
+    try:
+        name, base_dir = asyncio.run(ex.run("proc_skill:whoami", module.whoami, {}, meta={"execution": "process"}, module_file=module_file))
+    finally:
+        ex.shutdown()
+    assert name == "proc_skill"
+    assert base_dir == str(ctx.paths.base_dir())
@@ -0,0 +1,88 @@
+# tests/test_cli_lazy.py
+import json
+import os
+import subprocess
+import sys
+
+from typer.testing import CliRunner
+
+from adaos.services.importtime import parse_importtime
+
+_PROBE = """
+import json, sys
+from adaos.apps.cli.app import app
+try:
+    app(sys.argv[1:], standalone_mode=False)
+except SystemExit:
+    pass
+heavy = ["adaos.apps.cli.commands.skill", "adaos.apps.cli.commands.native", "keyring", "cryptography", "psutil", "jsonschema"]
+print("@@" + json.dumps({m: m in sys.modules for m in heavy}))
+"""
+
+
+def _loaded(tmp_path, *args):
+    env = {**os.environ, "ADAOS_BASE_DIR": str(tmp_path / "base"), "ADAOS_TESTING": "1"}
+    r = subprocess.run([sys.executable, "-c", _PROBE, *args], capture_output=True, text=True, env=env)
+    line = [ln for ln in r.stdout.splitlines() if ln.startswith("@@")]
+    assert line, r.stderr
+    return json.loads(line[-1][2:])
+
+
+def test_cli_commands_and_adapters_are_lazy(tmp_path):
+    # справка и команды, которым не нужны секреты/песочница, не тянут тяжёлые модули
+    assert not any(_loaded(tmp_path, "--help").values())
+    assert not any(_loaded(tmp_path, "where").values())
+    loaded = _loaded(tmp_path, "skill", "list")
+    assert loaded["adaos.apps.cli.commands.skill"]
+    assert not loaded["adaos.apps.cli.commands.native"] and not loaded["keyring"]
+
+
+def test_cli_help_lists_lazy_commands(cli_app):
+    r = CliRunner().invoke(cli_app, ["--help"])
+    assert r.exit_code == 0
+    for name in ("skill", "tests", "sandbox", "debug"):
+        assert name in r.stdout
+
+
+def test_parse_importtime():
+    text = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     _io",
+            "import time:       300 |        900 |   json",
+            "some program output",
+            "import time:      1500 |       2400 | adaos.apps.cli.app",
+        ]
+    )
+    timings = parse_importtime(text)
+    assert [(t.module, t.self_us, t.cumulative_us, t.depth) for t in timings] == [
+        ("_io", 120, 120, 2),
+        ("json", 300, 900, 1),
+        ("adaos.apps.cli.app", 1500, 2400, 0),
+    ]
+
+
+def test_shutdown_does_not_build_lazy_sandbox():
+    import asyncio
+    from dataclasses import replace
+
+    from adaos.apps.bootstrap import _LazyAdapter
+    from adaos.services.agent_context import get_ctx
+    from adaos.services.bootstrap import BootstrapService
+
+    built: list[str] = []
+
+    class _Sandbox:
+        def close_workers(self) -> None:
+            built.append("closed")
+
+    sandbox = _LazyAdapter(lambda: built.append("built") or _Sandbox())
+    ctx = replace(get_ctx(), sandbox=sandbox)
+    svc = BootstrapService(ctx, heartbeat=None, skills_loader=None, subnet_registry=None)
+
+    asyncio.run(svc.shutdown())
+    assert built == [] and not sandbox.built
+
+    sandbox.close_workers  # первое обращение собирает адаптер
+    asyncio.run(svc.shutdown())
+    assert built == ["built", "closed"] and sandbox.built
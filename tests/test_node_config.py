@@ -0,0 +1,46 @@
+# tests/test_node_config.py
+from __future__ import annotations
+
+import os
+
+from adaos.services import node_config
+from adaos.services.node_config import load_config, set_role
+
+
+def test_load_config_is_memoized(monkeypatch):
+    first = load_config()
+    calls = {"n": 0}
+    orig_parse = node_config._parse_config
+
+    def counting_parse(path):
+        calls["n"] += 1
+        return orig_parse(path)
+
+    monkeypatch.setattr(node_config, "_parse_config", counting_parse)
+    for _ in range(100):
+        assert load_config().node_id == first.node_id
+    assert calls["n"] == 0
+
+    # копия: правки вызывающего кода не попадают в кэш
+    conf = load_config()
+    conf.role = "member"
+    assert load_config().role == "hub"
+
+
+def test_set_role_updates_cache_in_place(monkeypatch):
+    load_config()
+    monkeypatch.setattr(node_config, "_parse_config", lambda path: (_ for _ in ()).throw(AssertionError("reparsed")))
+    set_role("member", hub_url="http://hub:8777")
+    conf = load_config()
+    assert conf.role == "member" and conf.hub_url == "http://hub:8777"
+
+
+def test_external_edit_is_picked_up(monkeypatch):
+    conf = load_config()
+    path = node_config._config_path()
+    path.write_text(path.read_text(encoding="utf-8").replace("role: hub", "role: member") + "\n", encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    monkeypatch.setattr(node_config, "_STAT_INTERVAL", 0.0)
+    again = load_config()
+    assert again.role == "member" and again.node_id == conf.node_id
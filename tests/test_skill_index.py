@@ -0,0 +1,62 @@
+"""Persisted skill directory index used by find_skill_dir and the handlers loader."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from adaos.adapters.db import SqliteSkillIndex
+from adaos.services.agent_context import get_ctx
+from adaos.services.skill.runtime import SkillDirectoryAmbiguousError, find_skill_dir, get_skill_index
+
+
+def _skill(root: Path, rel: str, *, handler: bool = True, manifest: str = "skill.yaml") -> Path:
+    path = root / rel
+    path.mkdir(parents=True, exist_ok=True)
+    (path / manifest).write_text(f"id: {path.name}\n", encoding="utf-8")
+    if handler:
+        (path / "handlers").mkdir(exist_ok=True)
+        (path / "handlers" / "main.py").write_text("def handle(topic, payload):\n    return None\n", encoding="utf-8")
+    return path
+
+
+def test_index_refresh_is_incremental(tmp_path):
+    root = tmp_path / "skills"
+    _skill(root, "group/a_skill")
+    _skill(root, "group/b_skill", handler=False)
+    (root / ".git" / "objects").mkdir(parents=True)
+    index = SqliteSkillIndex(get_ctx().sql, root)
+
+    first = index.refresh()
+    assert first["skills"] == 2 and first["hashed"] == 2
+    assert [e.name for e in index.find("a_skill")] == ["a_skill"]
+    assert index.handlers(refresh=False) == [root / "group" / "a_skill" / "handlers" / "main.py"]
+
+    again = index.refresh()
+    assert again["scanned"] == 0 and again["hashed"] == 0
+
+    # новый навык меняет mtime только родительского каталога: перечитываются он и сам навык
+    _skill(root, "group/c_skill")
+    third = index.refresh()
+    assert third["scanned"] == 2 and third["skills"] == 3
+
+    manifest = root / "group" / "b_skill" / "skill.yaml"
+    old_hash = index.find("b_skill")[0].manifest_hash
+    manifest.write_text("id: b_skill\nversion: 2\n", encoding="utf-8")
+    st = manifest.stat()
+    os.utime(manifest, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert index.refresh()["hashed"] == 1
+    assert index.find("b_skill")[0].manifest_hash != old_hash
+
+
+def test_find_skill_dir_uses_index_for_nested_skills():
+    root = Path(get_ctx().paths.skills_dir())
+    nested = _skill(root, "vendor/nested_skill")
+    assert find_skill_dir("nested_skill") == nested
+
+    _skill(root, "other/nested_skill")
+    get_skill_index().refresh()  # как после skill sync/install
+    with pytest.raises(SkillDirectoryAmbiguousError):
+        find_skill_dir("nested_skill")
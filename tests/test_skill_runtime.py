@@ -13,6 +13,7 @@ from adaos.services.skill.runtime import (
     SkillDirectoryNotFoundError,
     SkillPrepScriptNotFoundError,
     find_skill_dir,
+    invalidate_handler_cache,
     run_skill_handler_sync,
     run_skill_prep,
 )
@@ -94,6 +95,30 @@ def test_run_skill_handler_sync_handles_coroutines(skill_factory):
     assert result == {"topic": "demo.topic", "payload": {"foo": "bar"}, "status": "ok"}
 
 
+def test_run_skill_handler_reuses_module_until_file_changes(skill_factory):
+    handler_source = textwrap.dedent(
+        """
+        IMPORTS = [0]
+        IMPORTS[0] += 1
+
+        def handle(topic, payload):
+            return IMPORTS
+        """
+    )
+    skill_dir = skill_factory("warm_skill", handler_source=handler_source, prep_source=None)
+
+    first = run_skill_handler_sync("warm_skill", "t", {})
+    assert run_skill_handler_sync("warm_skill", "t", {}) is first  # тот же модуль, без повторного импорта
+
+    handler = skill_dir / "handlers" / "main.py"
+    handler.write_text(handler_source.replace("return IMPORTS", "return ['changed']"), encoding="utf-8")
+    assert run_skill_handler_sync("warm_skill", "t", {}) == ["changed"]
+
+    warm = run_skill_handler_sync("warm_skill", "t", {})
+    assert invalidate_handler_cache("warm_skill") == 1
+    assert run_skill_handler_sync("warm_skill", "t", {}) is not warm
+
+
 def test_run_skill_prep_executes_script(skill_factory):
     prep_source = textwrap.dedent(
         """
@@ -0,0 +1,128 @@
+"""Lazy boot loader: subscriptions come from skill.yaml, handler modules are imported on first event."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+
+from adaos.sdk.core import decorators
+from adaos.services.agent_context import get_ctx
+from adaos.services.skills_loader_lazy import LazySkillsLoader
+
+
+def _skill(root: Path, name: str, handler: str, topics: list[str]) -> None:
+    path = root / name
+    (path / "handlers").mkdir(parents=True, exist_ok=True)
+    subs = "".join(f"\n    - {t}" for t in topics)
+    (path / "skill.yaml").write_text(f"name: {name}\nversion: '1.0'\nevents:\n  subscribe:{subs or ' []'}\n", encoding="utf-8")
+    (path / "handlers" / "main.py").write_text(handler, encoding="utf-8")
+
+
+_WRITER = """
+import time
+from pathlib import Path
+from adaos.sdk.decorators import subscribe
+time.sleep(0.2)  # тяжёлый импорт
+
+@subscribe("{topic}")
+async def on_event(evt):
+    Path(evt["out"]).write_text("{topic}", encoding="utf-8")
+"""
+
+
+def test_lazy_loader_imports_on_first_event(tmp_path):
+    ctx = get_ctx()
+    root = tmp_path / "skills"
+    _skill(root, "slow_a", _WRITER.format(topic="demo.a"), ["demo.a"])
+    _skill(root, "slow_b", _WRITER.format(topic="demo.b"), ["demo.b"])
+    _skill(root, "broken", "raise RuntimeError('boom')\n", ["demo.broken"])
+    _skill(root, "code_only", _WRITER.format(topic="demo.code"), [])
+
+    seen: list = []
+    ctx.bus.subscribe("sys.boot.skill", lambda ev: seen.append(ev.payload))
+    loader = LazySkillsLoader(sql=ctx.sql, bus=ctx.bus, warmup_workers=0)
+    before = list(decorators.subscriptions)
+
+    async def _run() -> None:
+        await loader.import_all_handlers(root)
+        stubs = {t: fn for t, fn in decorators.subscriptions[len(before) :]}
+        assert set(stubs) == {"demo.a", "demo.b", "demo.broken"}
+        assert not any(s.loaded for s in loader.skills.values())
+
+        out = tmp_path / "a.txt"
+        await stubs["demo.a"]({"out": str(out)})
+        assert out.read_text(encoding="utf-8") == "demo.a"
+        assert loader.skills["slow_a"].loaded and not loader.skills["slow_b"].loaded
+
+        # сломанный навык: событие отбрасывается, повторный импорт не делается
+        await stubs["demo.broken"]({})
+        await stubs["demo.broken"]({})
+        assert "boom" in loader.skills["broken"].error
+
+        # без прогрева импортируются только навыки, чьи темы известны лишь из кода
+        assert await loader.warmup() == {"code_only": True}
+        assert list(loader.skills["code_only"].handlers) == ["demo.code"]
+
+    try:
+        asyncio.run(_run())
+    finally:
+        decorators.subscriptions[:] = before
+
+    assert [(p["skill"], p["ok"], p["reason"]) for p in seen] == [("slow_a", True, "event"), ("broken", False, "event"), ("code_only", True, "warmup")]
+    assert seen[0]["import_ms"] >= 200
+
+
+def test_lazy_loader_parallel_warmup(tmp_path):
+    ctx = get_ctx()
+    root = tmp_path / "skills"
+    for i in range(4):
+        _skill(root, f"warm_{i}", _WRITER.format(topic=f"demo.w{i}"), [f"demo.w{i}"])
+    loader = LazySkillsLoader(sql=ctx.sql, warmup_workers=4)
+    before = list(decorators.subscriptions)
+    threads: list[str] = []
+    real_import = loader._import
+    loader._import = lambda skill: threads.append(threading.current_thread().name) or real_import(skill)
+
+    async def _run() -> None:
+        await loader.import_all_handlers(root)
+        assert await loader.warmup() == {f"warm_{i}": True for i in range(4)}
+
+    try:
+        asyncio.run(_run())
+    finally:
+        decorators.subscriptions[:] = before
+    # четыре тяжёлых импорта шли одновременно в разных потоках пула
+    assert len(set(threads)) == 4 and all(t.startswith("adaos-skill-warmup") for t in threads)
+    assert all(len(loader.skills[f"warm_{i}"].handlers[f"demo.w{i}"]) == 1 for i in range(4))
+
+
+def test_boot_report_is_published_from_the_loop_thread(tmp_path):
+    from adaos.services.eventbus import LocalEventBus
+
+    root = tmp_path / "skills"
+    _skill(root, "rep_a", _WRITER.format(topic="demo.ra"), ["demo.ra"])
+    _skill(root, "rep_b", _WRITER.format(topic="demo.rb"), ["demo.rb"])
+    bus = LocalEventBus()
+    loader = LazySkillsLoader(sql=get_ctx().sql, bus=bus, warmup_workers=2)
+    before = list(decorators.subscriptions)
+    seen: list = []
+
+    async def on_report(ev):
+        seen.append((ev.payload["skill"], ev.payload["reason"], asyncio.get_running_loop(), threading.current_thread()))
+
+    bus.subscribe("sys.boot.skill", on_report)
+
+    async def _run():
+        await loader.import_all_handlers(root)
+        await loader.ensure_loaded("rep_a")
+        await loader.warmup()
+        await asyncio.sleep(0)  # LocalEventBus ставит async-подписчика задачей в текущий луп
+        return asyncio.get_running_loop()
+
+    try:
+        loop = asyncio.run(_run())
+    finally:
+        decorators.subscriptions[:] = before
+    assert sorted((name, reason) for name, reason, _, _ in seen) == [("rep_a", "load"), ("rep_b", "warmup")]
+    assert all(lp is loop and th is threading.main_thread() for _, _, lp, th in seen)
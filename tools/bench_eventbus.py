@@ -0,0 +1,70 @@
+# tools/bench_eventbus.py
+"""Микробенчмарк LocalEventBus: префиксное дерево против прежнего линейного startswith.
+
+Запуск:  PYTHONPATH=src python tools/bench_eventbus.py [--events N] [--prefixes 10,100,1000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections import defaultdict
+
+from adaos.domain import Event
+from adaos.services.eventbus import LocalEventBus
+
+TOPICS = ["proc.started", "sandbox.killed", "net.subnet.node.up", "skills.s5.done", "sys.ready"]
+
+
+class LinearBus:
+    """Прежняя реализация: линейный startswith по всем префиксам."""
+
+    def __init__(self) -> None:
+        self._subs = defaultdict(list)
+
+    def subscribe(self, type_prefix, handler) -> None:
+        self._subs[type_prefix].append(handler)
+
+    def publish(self, event: Event) -> None:
+        pairs = [(p, hs[:]) for p, hs in self._subs.items()]
+        for prefix, handlers in pairs:
+            if prefix == "*" or prefix == "" or event.type.startswith(prefix):
+                for h in handlers:
+                    h(event)
+
+
+def prefixes(n: int) -> list[str]:
+    rnd = random.Random(n)
+    roots = ["proc", "sandbox", "net.subnet", "skills", "sys", "ui", "obs.test"]
+    out = []
+    for i in range(n):
+        root = rnd.choice(roots)
+        out.append(f"{root}.s{i}." if i % 3 else f"{root}.s{i}")
+    return out
+
+
+def bench(bus, n_prefixes: int, events: list[Event]) -> float:
+    """Среднее время publish одного события, мкс."""
+    for p in prefixes(n_prefixes):
+        bus.subscribe(p, lambda ev: None)
+    t0 = time.perf_counter()
+    for ev in events:
+        bus.publish(ev)
+    return (time.perf_counter() - t0) * 1e6 / len(events)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--events", type=int, default=1000, help="событий на прогон")
+    ap.add_argument("--prefixes", default="10,100,1000", help="число префиксов через запятую")
+    args = ap.parse_args()
+
+    events = [Event(type=TOPICS[i % len(TOPICS)], payload={}, source="bench", ts=0.0) for i in range(args.events)]
+    for n in (int(x) for x in args.prefixes.split(",")):
+        linear = bench(LinearBus(), n, events)
+        trie = bench(LocalEventBus(), n, events)
+        print(f"prefixes={n:5d} linear={linear:8.2f}us/ev trie={trie:8.2f}us/ev x{linear / trie:5.1f}")
+
+
+if __name__ == "__main__":
+    main()